@@ -0,0 +1,171 @@
+"""
+Headless self-play arena: plays games between two engine configurations in parallel worker processes and
+reports the score of the first engine as wins, draws, losses and an Elo difference, optionally stopping
+early with a sequential probability ratio test (SPRT).
+
+Example, from the src directory:
+    python arena.py hard impossible --games 2000 --workers 8 --nodes 20000 --sprt 0 10
+    python arena.py hard@mcts hard --games 200 --workers 8 --time 2
+"""
+import argparse
+import math
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from engine.match import EngineConfig, play_game
+from engine.search import DIFFICULTY_SETTINGS, ENGINES
+
+
+def play_arena_game(game_index, first_engine, second_engine, opening_plies, seed):
+    """
+    Play one game of the arena. Games go by pairs that share a random opening, with the engines swapping
+    colors, so that neither engine gets the better openings.
+    Returns (game_index, score of the first engine, plies, CPU seconds of the first engine, of the second one).
+    """
+    first_color = 'blue' if game_index % 2 == 0 else 'red'
+    second_color = 'red' if first_color == 'blue' else 'blue'
+    winner, plies, cpu_times = play_game({first_color: first_engine, second_color: second_engine},
+                                         opening_plies=opening_plies, seed=f"{seed}-{game_index // 2}")
+    if winner is None:
+        score = 0.5
+    else:
+        score = 1.0 if winner == first_color else 0.0
+    return game_index, score, plies, cpu_times[first_color], cpu_times[second_color]
+
+
+# === Statistics ===
+
+# Pseudo wins and losses each added to the results of the SPRT
+SPRT_PRIOR_GAMES = 1
+
+
+def expected_score(elo):
+    """Return the expected score of a player rated elo points above its opponent."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_difference(score):
+    """Return the Elo difference matching an expected score, clamped for scores of 0 or 1."""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def elo_estimate(wins, draws, losses):
+    """Return the Elo difference of the first engine and the half width of its 95% confidence interval."""
+    games = wins + draws + losses
+    score = (wins + draws / 2) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.96 * math.sqrt(variance / games)
+    return elo_difference(score), (elo_difference(score + margin) - elo_difference(score - margin)) / 2
+
+
+def sprt_llr(wins, draws, losses, elo0, elo1):
+    """
+    Return the log-likelihood ratio of the hypothesis that the first engine is elo1 stronger against the
+    hypothesis that it is elo0 stronger, using the normal approximation of the game scores.
+    SPRT_PRIOR_GAMES pseudo wins and losses are added to the results, so that the variance is never zero and
+    the test can stop when every game has the same result.
+    """
+    if not wins + draws + losses:
+        return 0.0
+    wins, losses = wins + SPRT_PRIOR_GAMES, losses + SPRT_PRIOR_GAMES
+    games = wins + draws + losses
+    score = (wins + draws / 2) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    score0, score1 = expected_score(elo0), expected_score(elo1)
+    return games * (score1 - score0) * (2 * score - score0 - score1) / (2 * variance)
+
+
+def sprt_bounds(alpha, beta):
+    """Return the (lower, upper) log-likelihood ratio bounds of an SPRT with the given error rates."""
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+# === Command Line ===
+
+def parse_engine(argument, time_budget, node_budget):
+    """Parse an engine given as difficulty, difficulty:depth, difficulty@engine or difficulty:depth@engine."""
+    argument, _, engine = argument.partition('@')
+    difficulty, _, depth = argument.partition(':')
+    if difficulty not in DIFFICULTY_SETTINGS:
+        raise argparse.ArgumentTypeError(f"unknown difficulty {difficulty!r}")
+    if engine and engine not in ENGINES:
+        raise argparse.ArgumentTypeError(f"unknown engine {engine!r}")
+    return EngineConfig(difficulty, search_depth=int(depth) if depth else None,
+                        time_budget=time_budget, node_budget=node_budget, engine=engine or None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play games between two engine configurations.")
+    parser.add_argument('first', help="first engine, as difficulty or difficulty:depth, with @mcts or @alphabeta "
+                                      "to override the difficulty's search")
+    parser.add_argument('second', help="second engine, as difficulty or difficulty:depth, with @mcts or @alphabeta "
+                                       "to override the difficulty's search")
+    parser.add_argument('--games', type=int, default=100, help="maximum number of games, rounded up to pairs")
+    parser.add_argument('--workers', type=int, default=1, help="number of games played at once")
+    parser.add_argument('--time', type=float, help="seconds per move, default the difficulty's time budget")
+    parser.add_argument('--nodes', type=int, help="nodes per move, playouts for mcts")
+    parser.add_argument('--opening-plies', type=int, default=4, help="random pawn moves opening each game pair")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the random openings")
+    parser.add_argument('--sprt', type=float, nargs=2, metavar=('ELO0', 'ELO1'),
+                        help="stop once an SPRT accepts elo0 or elo1 for the first engine")
+    parser.add_argument('--alpha', type=float, default=0.05, help="SPRT false positive rate")
+    parser.add_argument('--beta', type=float, default=0.05, help="SPRT false negative rate")
+    args = parser.parse_args()
+
+    try:
+        first_engine = parse_engine(args.first, args.time, args.nodes)
+        second_engine = parse_engine(args.second, args.time, args.nodes)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+    games = args.games + args.games % 2
+    print(f"{first_engine} vs {second_engine}, {games} games on {args.workers} workers")
+
+    wins = draws = losses = 0
+    plies = 0
+    cpu_times = [0.0, 0.0]
+    result = None
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        pending = {executor.submit(play_arena_game, game_index, first_engine, second_engine,
+                                   args.opening_plies, args.seed)
+                   for game_index in range(games)}
+        while pending and result is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                _, score, game_plies, first_cpu, second_cpu = future.result()
+                if score == 1.0:
+                    wins += 1
+                elif score == 0.0:
+                    losses += 1
+                else:
+                    draws += 1
+                plies += game_plies
+                cpu_times[0] += first_cpu
+                cpu_times[1] += second_cpu
+
+            played = wins + draws + losses
+            elo, margin = elo_estimate(wins, draws, losses)
+            line = f"{played} games: +{wins} ={draws} -{losses}, Elo {elo:+.1f} +/- {margin:.1f}"
+            if args.sprt:
+                llr = sprt_llr(wins, draws, losses, *args.sprt)
+                lower, upper = sprt_bounds(args.alpha, args.beta)
+                line += f", LLR {llr:.2f} ({lower:.2f}, {upper:.2f})"
+                if llr >= upper:
+                    result = f"H1 accepted: the first engine is at least {args.sprt[1]:+g} Elo"
+                elif llr <= lower:
+                    result = f"H0 accepted: the first engine is at most {args.sprt[0]:+g} Elo"
+            print(line)
+
+        # Stop the games left once the SPRT has decided
+        for future in pending:
+            future.cancel()
+
+    played = wins + draws + losses
+    if result:
+        print(result)
+    if played:
+        print(f"Average game length {plies / played:.1f} plies, CPU seconds per game: "
+              f"{cpu_times[0] / played:.2f} for {first_engine}, {cpu_times[1] / played:.2f} for {second_engine}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Search benchmark: searches every fixed position at every difficulty to a fixed depth and reports the time,
+the nodes searched, the nodes per second and the chosen move, optionally as JSON to track regressions.
+
+Example, from the src directory:
+    python benchmark.py --json bench.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+
+from engine import profiler
+from engine.positions import POSITIONS, get_position
+from engine.search import search_move
+from engine.search_limits import SearchLimits
+from engine.transposition_table import TranspositionTable
+from helpers import path_helper, wall_helpers
+
+# Depth searched at each difficulty, shallower than in game so that the whole suite runs in a few seconds
+BENCHMARK_DEPTHS = {'easy': 5, 'medium': 5, 'hard': 5, 'impossible': 3}
+
+
+def clear_caches():
+    """Empty the path and forbidden wall caches so every search starts cold."""
+    path_helper.cache.clear()
+    wall_helpers.find_forbidden_walls_cache.clear()
+
+
+def run_benchmark(difficulties, position_names, depths, node_budget=None):
+    """Search each position at each difficulty and return the list of results."""
+    results = []
+    for difficulty in difficulties:
+        for name in position_names:
+            clear_caches()
+            game_state = get_position(name)
+            player = game_state.red_player
+            limits = SearchLimits(node_budget=node_budget)
+            start = time.perf_counter()
+            value, action_type, action_value, completed_depth = search_move(
+                game_state, player, difficulty, depths[difficulty], limits, tt=TranspositionTable())
+            elapsed = time.perf_counter() - start
+            results.append({
+                'difficulty': difficulty,
+                'position': name,
+                'depth': completed_depth,
+                'nodes': limits.nodes,
+                'seconds': elapsed,
+                'nodes_per_second': limits.nodes / elapsed if elapsed else 0.0,
+                'value': value,
+                'move': [action_type, action_value],
+            })
+    return results
+
+
+def git_commit():
+    """Return the current commit hash, or None outside of a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search on fixed positions.")
+    parser.add_argument('--difficulties', nargs='+', default=list(BENCHMARK_DEPTHS), choices=list(BENCHMARK_DEPTHS))
+    parser.add_argument('--positions', nargs='+', default=list(POSITIONS), choices=list(POSITIONS))
+    parser.add_argument('--depth', type=int, help="depth of every search instead of the benchmark depths")
+    parser.add_argument('--nodes', type=int, help="node budget of every search")
+    parser.add_argument('--json', metavar='PATH', help="also write the results as JSON to this file")
+    parser.add_argument('--profile', action='store_true', help="time the phases of the search, slowing it down")
+    args = parser.parse_args()
+
+    if args.profile:
+        profiler.enable()
+
+    depths = {difficulty: args.depth or depth for difficulty, depth in BENCHMARK_DEPTHS.items()}
+    results = run_benchmark(args.difficulties, args.positions, depths, node_budget=args.nodes)
+
+    print(f"{'difficulty':<11} {'position':<9} {'depth':>5} {'nodes':>8} {'seconds':>8} {'nodes/s':>9}  move")
+    for result in results:
+        action_type, action_value = result['move']
+        print(f"{result['difficulty']:<11} {result['position']:<9} {result['depth']:>5} {result['nodes']:>8} "
+              f"{result['seconds']:>8.3f} {result['nodes_per_second']:>9.0f}  {action_type} {action_value}")
+    total_nodes = sum(result['nodes'] for result in results)
+    total_seconds = sum(result['seconds'] for result in results)
+    print(f"Total: {total_nodes} nodes in {total_seconds:.2f} seconds, "
+          f"{total_nodes / total_seconds if total_seconds else 0:.0f} nodes/s")
+    profile = None
+    if args.profile:
+        profile = profiler.report()
+        print(profiler.format_report(profile))
+
+    if args.json:
+        report = {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'total_nodes': total_nodes,
+            'total_seconds': total_seconds,
+            'results': results,
+            'profile': profile,
+        }
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
-from bot.bot_worker import BotWorker
 from classes.player import Player
+from engine.search import DIFFICULTY_SETTINGS
 
 class Bot(Player):
     def __init__(self, player_settings,game,difficulty):
@@ -8,6 +8,8 @@ class Bot(Player):
         self.difficulty = difficulty
         self.grid_size = game.grid_size
         self.scene=game.scene
+        # Long-lived search thread of the window, shared by the bots
+        self.bot_worker = game.bot_worker
         self.difficulty_setup()
 
     def on_turn(self):
@@ -15,16 +17,14 @@ class Bot(Player):
         self.valid_moves = self.scene_ref.get_valid_moves(self)
         self.scene.disable_mouse_events()
         self.current_game_state = self.turn_manager.game_state
-        self.blocked_roads = self.current_game_state.current_blocked_roads
+        self.board = self.current_game_state.board
         self.bot_move()
 
     def bot_move(self):
-        # Create the worker and connect the signal to handle the computed move
-        self.bot_worker = BotWorker(self.current_game_state, self, self.blocked_roads, self.search_depth,available_walls=self.available_walls,difficulty=self.difficulty)
-        self.bot_worker.move_computed.connect(self.handle_computed_move)
-
-        # Start the worker (it will run the bot in a separate thread)
-        self.bot_worker.start()
+        # Queue the search, the window hands the computed move back to handle_computed_move
+        self.bot_worker.request_move(self.current_game_state, self, self.search_depth, self.difficulty,
+                                     time_budget=self.time_budget, node_budget=self.node_budget,
+                                     search_workers=self.search_workers, engine=self.engine)
 
     def handle_computed_move(self, best_type, best_move):
         """Handle the move once it is computed by the worker."""
@@ -44,11 +44,11 @@ class Bot(Player):
                 self.move_player(new_row, new_col)
 
     def difficulty_setup(self):
-        if self.difficulty == 'easy':
-            self.search_depth = 5
-        elif self.difficulty == 'medium':
-            self.search_depth = 7
-        elif self.difficulty == 'hard':
-            self.search_depth = 7
-        elif self.difficulty == 'impossible':
-            self.search_depth = 7
\ No newline at end of file
+        # search_depth is the deepest iteration, time_budget (seconds) and node_budget cap each move,
+        # search_workers is the number of processes searching, engine is 'alphabeta' or 'mcts'
+        settings = DIFFICULTY_SETTINGS[self.difficulty]
+        self.search_depth = settings['search_depth']
+        self.time_budget = settings['time_budget']
+        self.node_budget = settings['node_budget']
+        self.search_workers = settings['search_workers']
+        self.engine = settings['engine']
@@ -1,124 +1,141 @@
+import queue
+import threading
+
 from PyQt6.QtCore import QThread, pyqtSignal
-from bot.bot_helper import get_intelligent_moves, minimax
-import time
+from engine import profiler
+from engine.search import PARALLEL_SEARCH, SearchMemory, get_search_pool, search_move
+from engine.search_limits import SearchLimits
 
-from helpers.valid_moves_helper import get_valid_moves_helper
+from helpers import path_helper, wall_helpers
 
-last_position = {}
-last_eval = float('-inf')
+# Print the evaluation, time, depth and cache statistics of every bot move
+LOG_SEARCH = False
+# Time the phases of the search and print the profile after every bot move
+PROFILE_SEARCH = False
 
 class BotWorker(QThread):
-    move_computed = pyqtSignal(str, tuple)
-
-    def __init__(self, game_state, player, blocked_roads, search_depth, available_walls, difficulty, parent=None):
+    # Bot the move was searched for, move type and move
+    move_computed = pyqtSignal(object, str, tuple)
+
+    def __init__(self, parent=None):
+        """
+        Long-lived thread searching the bots' moves, one request at a time from a queue. The search memory of
+        each bot and the positions the bots come from are kept from one turn to the next and cleared by new_game.
+        The worker processes of the parallel searches live as long as the thread.
+        """
         super().__init__(parent)
-        self.game_state = game_state
-        self.difficulty = difficulty
-        self.player = player
-        self.blocked_roads = blocked_roads
-        self.search_depth = search_depth
-        self.available_walls = available_walls
-        self.best_move = None
-        self._is_running = True
+        self.requests = queue.Queue()
+        # SearchMemory of each bot color
+        self.memories = {}
+        self.last_positions = {}
+        # SearchPool of the parallel searches, started by the first one
+        self.pool = None
+        self.profile = None
+        # Requests made before the last cancel belong to an old game and are dropped
+        self.generation = 0
+        self.limits = None
+        self.lock = threading.Lock()
+
+    def request_move(self, game_state, bot, search_depth, difficulty, time_budget=None, node_budget=None,
+                     search_workers=1, parallel_search=PARALLEL_SEARCH, engine='alphabeta'):
+        """
+        Queue the search of the bot's move, move_computed is emitted with the result.
+        Args:
+            search_workers: Number of processes searching, 1 searches in this thread only. With 'root', the root
+                moves are spread over the processes, with 'lazy_smp' helper processes share a transposition table
+                with this thread.
+            engine: 'alphabeta' or 'mcts', see search_move.
+        """
+        with self.lock:
+            generation = self.generation
+        self.requests.put(('search', generation, game_state, bot, search_depth, difficulty, time_budget,
+                           node_budget, search_workers, parallel_search, engine))
+
+    def new_game(self):
+        """Abort the current search and forget the state of the previous game."""
+        self.cancel()
+        self.requests.put(('new_game',))
+
+    def stop(self):
+        """Abort the current search and end the thread, wait() returns once the search has unwound."""
+        self.cancel()
+        self.requests.put(None)
+
+    def cancel(self):
+        """Abort the current search at its next node and drop the queued requests."""
+        with self.lock:
+            self.generation += 1
+            if self.limits is not None:
+                self.limits.stop()
 
     def run(self):
-        global last_position
-        global last_eval
-        start_time = time.time()
-
-        best_move = None
-        best_type= None
-        best_move_sequence = []
-        best_value = float('-inf')
-        maximizing_player_color = self.player.color
-        opponent_color = self.game_state.get_opponent_color(maximizing_player_color)
-        opponent_player = self.game_state.get_player_by_color(opponent_color)
-
-        ordered_moves = self.moves_on_difficulty()
-        if not ordered_moves:
-            valid_moves = get_valid_moves_helper(self.player, opponent_player, self.player.grid_size, self.blocked_roads)
-            ordered_moves= list(valid_moves.items())
-
-        alpha = float('-inf')
-        beta = float('inf')
-
-        #region MINIMAX ALGORITHM
-
-        for type, move in ordered_moves:
-            if not self._is_running:
-                print("Bot worker stopped.")
+        while True:
+            request = self.requests.get()
+            if request is None:
+                if self.pool is not None:
+                    self.pool.shutdown()
+                    self.pool = None
+                return
+            if request[0] == 'new_game':
+                self.memories = {}
+                self.last_positions = {}
+                if self.pool is not None:
+                    self.pool.new_game()
+                continue
+            self.search(*request[1:])
+
+    def search(self, generation, game_state, bot, search_depth, difficulty, time_budget, node_budget, search_workers,
+               parallel_search, engine):
+        limits = SearchLimits(time_budget=time_budget, node_budget=node_budget)
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.limits = limits
+
+        if PROFILE_SEARCH:
+            profiler.enable()
+            profiler.reset()
+
+        player = game_state.get_player_by_color(bot.color)
+        self.pool = get_search_pool(self.pool, search_workers, parallel_search)
+        best_value, best_type, best_move, completed_depth = search_move(
+            game_state,
+            player,
+            difficulty,
+            search_depth,
+            limits,
+            last_position=self.last_positions.get(bot.color),
+            memory=self.memories.setdefault(bot.color, SearchMemory()),
+            search_workers=search_workers,
+            parallel_search=parallel_search,
+            engine=engine,
+            pool=self.pool,
+        )
+
+        with self.lock:
+            self.limits = None
+            if generation != self.generation:
+                if LOG_SEARCH:
+                    print("Bot search cancelled.")
                 return
-
-            game_state_copy = self.game_state.simulate_move_or_wall(type, move, self.player)
-            nodes_examined = {'count': 0}
-
-            move_value, move_sequence = minimax(
-                game_state_copy,
-                self.search_depth - 1,
-                alpha,
-                beta,
-                maximizing_player_color,
-                opponent_color,
-                nodes_examined,
-                difficulty=self.difficulty,
-                move_sequence=[],
-            )
-
-            # Penalize the bot for moving back and forth
-            if type in ['left', 'right', 'up', 'down']:
-                # Check if there is a valid last position and if the current move is the same as the last move
-                if last_position.get(self.difficulty) is not None and move == last_position[self.difficulty]:
-                    move_value -= 5
-
-            if move_value > best_value:
-                best_value = move_value
-                best_type = type
-                best_move = move
-                best_move_sequence = move_sequence
-                alpha = max(alpha, move_value)
-
-            if beta <= alpha:
-                break
-        #endregion
-
-        if best_move:
-            print(f"Evaluation: {best_value:.2f}")
-            #print("Best move sequence:", best_type, best_move, best_move_sequence)
-            self.best_type = best_type
-            self.best_move = best_move
 
         # Convert best_move to tuple if it's a list (mainly for wall moves)
         if isinstance(best_move, list):
             best_move = tuple(best_move)
 
-        # End the timer and calculate elapsed time
-        end_time = time.time()
-        elapsed_time = end_time - start_time
-        print(f"Bot thought for {elapsed_time:.2f} seconds.")
-        last_position = {self.difficulty:(self.player.row, self.player.col)}
-
-        # Force move if no best move was found
-        if not best_move:
-            if not ordered_moves and self.available_walls == 0:
-                self.move_computed.emit('skip', ())
-            else:
-                best_type, best_move = ordered_moves[0]
-                self.move_computed.emit(best_type, best_move)
-        else:
-            self.move_computed.emit(best_type, best_move)
-
-    def moves_on_difficulty(self):
-        intelligent_moves, other_moves = get_intelligent_moves(self.game_state, self.player, self.player.grid_size,
-                                                               self.blocked_roads, self.available_walls)
-        if self.difficulty == 'easy':
-            return intelligent_moves[:5]
-        elif self.difficulty == 'medium':
-            return intelligent_moves
-        else:
-            return intelligent_moves + other_moves
-
-    def stop(self):
-        """Stop the thread gracefully by setting the running flag to False."""
-        global last_position
-        last_position = None
-        self._is_running = False
\ No newline at end of file
+        if LOG_SEARCH:
+            print(f"Evaluation: {best_value:.2f}")
+            print(f"Bot thought for {limits.elapsed():.2f} seconds, reaching depth {completed_depth}.")
+        if PROFILE_SEARCH:
+            # Per-phase calls and time of this move, with the cache statistics
+            self.profile = profiler.report()
+            print(profiler.format_report(self.profile))
+        elif LOG_SEARCH:
+            for name, cache in (('Path', path_helper.cache),
+                                ('Forbidden walls', wall_helpers.find_forbidden_walls_cache)):
+                stats = cache.stats()
+                print(f"{name} cache: {stats['entries']}/{stats['max_entries']} entries, "
+                      f"hit rate {stats['hit_rate']:.1%}, {stats['evictions']} evictions.")
+        self.last_positions[bot.color] = (player.row, player.col)
+
+        self.move_computed.emit(bot, best_type, best_move)
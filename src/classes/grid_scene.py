@@ -2,8 +2,9 @@ from PyQt6.QtWidgets import QGraphicsScene, QGraphicsEllipseItem, QGraphicsRectI
     QVBoxLayout, QWidget
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPen, QColor, QFont
+from helpers.board_helper import Board
 from helpers.grid_helpers import grid_to_scene, scene_to_grid
-from helpers.wall_helpers import order_walls, get_blocked_roads, is_valid_wall
+from helpers.wall_helpers import order_walls, is_valid_wall
 
 class GridScene(QGraphicsScene):
     def __init__(self, game):
@@ -40,7 +41,7 @@ class GridScene(QGraphicsScene):
         self.possible_wall_destinations = None
         self.forbidden_walls = []
         self.placed_walls = []
-        self.current_blocked_roads = []
+        self.board = Board(self.grid_size)
 
         # Create and set up rules container overlay
         self.rules_container = self.create_rules_overlay()
@@ -202,13 +203,13 @@ class GridScene(QGraphicsScene):
 
         # Validate and check each possible wall position
         self.possible_wall_destinations = []
-        if is_valid_wall((start_row, start_col), up_pos, self.grid_size, self.placed_walls,forbidden_walls=self.forbidden_walls):
+        if is_valid_wall((start_row, start_col), up_pos, self.board, forbidden_walls=self.forbidden_walls):
             self.possible_wall_destinations.append(up_pos)
-        if is_valid_wall((start_row, start_col), down_pos, self.grid_size, self.placed_walls,forbidden_walls=self.forbidden_walls):
+        if is_valid_wall((start_row, start_col), down_pos, self.board, forbidden_walls=self.forbidden_walls):
             self.possible_wall_destinations.append(down_pos)
-        if is_valid_wall((start_row, start_col), left_pos, self.grid_size, self.placed_walls,forbidden_walls=self.forbidden_walls):
+        if is_valid_wall((start_row, start_col), left_pos, self.board, forbidden_walls=self.forbidden_walls):
             self.possible_wall_destinations.append(left_pos)
-        if is_valid_wall((start_row, start_col), right_pos, self.grid_size, self.placed_walls,forbidden_walls=self.forbidden_walls):
+        if is_valid_wall((start_row, start_col), right_pos, self.board, forbidden_walls=self.forbidden_walls):
             self.possible_wall_destinations.append(right_pos)
 
     def add_wall(self, custom_start=None, custom_end=None):
@@ -224,7 +225,7 @@ class GridScene(QGraphicsScene):
             # Logic for placing the wall
             wall = order_walls([(start_row, start_col), (end_row, end_col)])
             self.placed_walls.append(wall)
-            self.current_blocked_roads.extend(get_blocked_roads(wall))
+            self.board.add_wall(wall)
             self.turn_manager.get_current_player().available_walls -= 1
             self.game.update_wall_count()
             move = ('wall',wall)
@@ -1,4 +1,5 @@
-from classes.game_state import GameState
+from engine.game_state import GameState
+from engine.match import is_repetition_draw
 
 class TurnManager:
     def __init__(self,game,color):
@@ -35,12 +36,16 @@ class TurnManager:
             self.current_turn = 'blue'
         else:
             self.current_turn = 'red'
-        self.start_turn()
+        self.start_turn(move)
 
-    def start_turn(self):
+    def start_turn(self,move=None):
         """Start the turn of the player."""
         #UPDATE GAME STATE
-        self.game_state=GameState(self.game)
+        if move and move[0] == 'wall':
+            # Only the walls affected by the new wall need to be checked again
+            self.game_state=self.create_game_state(previous_state=self.game_state, new_wall=move[1])
+        else:
+            self.game_state=self.create_game_state()
         if not (hasattr(self.get_current_player(),'bot') and self.get_current_player().bot):
             self.scene.keyPressed=False
 
@@ -53,6 +58,12 @@ class TurnManager:
             self.red_player.on_turn()
             self.game.change_turn('red')
 
+    def create_game_state(self, previous_state=None, new_wall=None):
+        """Return the engine's game state of the position shown in the scene."""
+        scene = self.game.scene
+        return GameState(scene.grid_size, scene.board, scene.placed_walls, self.game.red_player,
+                         self.game.blue_player, self.current_turn, previous_state=previous_state, new_wall=new_wall)
+
     def reset_turn(self):
         self.current_turn = 'blue'
 
@@ -63,22 +74,10 @@ class TurnManager:
         return self.red_player if self.current_turn == 'red' else self.blue_player
 
     def draw_check(self):
-        if len(self.move_history) >= 12:
-            # Get the last 12 moves (6 moves per player, 3 pairs)
-            last_six_moves = self.move_history[-12:]
-
-            # Check if the last three pairs of moves are identical
-            first_pair = last_six_moves[0:2]
-            second_pair = last_six_moves[2:4]
-            third_pair = last_six_moves[4:6]
-            fourth_pair = last_six_moves[6:8]
-            fifth_pair = last_six_moves[8:10]
-            sixth_pair = last_six_moves[10:12]
-
-            # Compare if the last three pairs are identical
-            if first_pair == third_pair == fifth_pair and second_pair == fourth_pair == sixth_pair:
-                self.game.draw_game()
-                return True
+        # The last three pairs of moves are identical
+        if is_repetition_draw(self.move_history):
+            self.game.draw_game()
+            return True
         return False
 
     def draw_game(self):
@@ -0,0 +1,402 @@
+from helpers.path_helper import bfs_pathfinder, goal_distances
+from helpers.valid_moves_helper import get_valid_moves_helper
+from engine.move_ordering import MoveOrdering
+from engine.pv_table import PVTable
+from engine.reduction_policy import REDUCTION_POLICIES
+from engine.search_limits import SearchTimeout
+from engine.transposition_table import EXACT, LOWER_BOUND, UPPER_BOUND
+from helpers.zobrist_helper import PLY_KEYS
+
+# Deepest ply from the root where select_moves selects moves differently from the plies below
+SELECTIVE_PLIES = {difficulty: policy.selective_plies for difficulty, policy in REDUCTION_POLICIES.items()}
+# Width of the null windows of the principal variation search, the values being floats
+NULL_WINDOW = 1e-6
+# Half width of the aspiration window around the value of the previous iteration. Consecutive iterations often
+# differ by one step of path length, odd and even depths ending on different players, so the window is wider
+ASPIRATION_WINDOW = 1.5
+# Value a wall costs the player placing it in evaluate, through the wall advantage
+WALL_VALUE = 1
+# Value deducted from a pawn move back to the cell the bot comes from, to stop it from moving back and forth
+BACK_MOVE_PENALTY = 5
+
+def position_key(game_state, difficulty, ply):
+    """
+    Return the transposition table key of a position at the given ply. Near the root the searched moves depend on
+    the ply, so these plies get keys of their own and a score is only reused where the same moves were searched.
+    """
+    if ply <= SELECTIVE_PLIES[difficulty]:
+        return game_state.hash ^ PLY_KEYS[ply]
+    return game_state.hash
+
+def negamax(game_state, depth, alpha, beta, root_color, current_player_color, limits, difficulty, ply=1, tt=None,
+            ordering=None, pv=None):
+    """
+    Return the value of the position for the player to move, searched depth plies deep.
+    Principal variation search: the first move is searched with the (alpha, beta) window and the other moves with a
+    null window, searched again with the full window only if they beat alpha. Values outside the window are bounds.
+    The difficulty's ReductionPolicy searches late wall moves shallower first and prunes futile walls.
+    """
+    # Count the node, aborting the search if the time or node budget is exhausted
+    limits.count_node()
+    if pv is not None:
+        pv.clear(ply)
+    # evaluate scores positions for the root player
+    sign = 1 if current_player_color == root_color else -1
+
+    # Terminal condition: if max depth is reached or the game is over
+    if depth == 0 or game_over(game_state):
+        return sign * evaluate(game_state, root_color, depth)
+
+    # Transposition table lookup: reuse the score if it was searched at least as deep
+    tt_move = None
+    original_alpha, original_beta = alpha, beta
+    if tt is not None:
+        key = position_key(game_state, difficulty, ply)
+        entry = tt.probe(key)
+        if entry is not None:
+            entry_depth, entry_flag, entry_score, tt_move = entry[1], entry[2], entry[3], entry[4]
+            if entry_depth >= depth:
+                if entry_flag == EXACT:
+                    return entry_score
+                elif entry_flag == LOWER_BOUND:
+                    alpha = max(alpha, entry_score)
+                else:
+                    beta = min(beta, entry_score)
+                if beta <= alpha:
+                    return entry_score
+
+    opponent_color = game_state.get_opponent_color(current_player_color)
+    current_player = game_state.get_player_by_color(current_player_color)
+    opponent_player = game_state.get_player_by_color(opponent_color)
+
+    policy = REDUCTION_POLICIES[difficulty]
+    ordered_moves, quiet_walls = select_moves(game_state, current_player, opponent_player, ply, policy)
+
+    #INVALID LINE: lost for the root player
+    if not ordered_moves:
+        return sign * float('-inf')
+
+    if ordering is not None:
+        # Transposition table move, killer moves, then the history scores
+        ordered_moves = ordering.order(ordered_moves, ply, current_player_color, tt_move)
+    elif tt_move is not None:
+        # Search the best move stored for this position first
+        ordered_moves = list(ordered_moves)
+        if tt_move in ordered_moves:
+            ordered_moves.remove(tt_move)
+            ordered_moves.insert(0, tt_move)
+
+    best_value = float('-inf')
+    best_action = None
+    # Highest value a futile wall can reach: a wall off the opponent's path leaves its distance unchanged and
+    # costs the wall, so within futility_depth plies it cannot get far above the current position
+    futile_value = None
+    if quiet_walls and depth <= policy.futility_depth:
+        futile_value = (sign * evaluate(game_state, root_color, depth) - WALL_VALUE
+                        + policy.futility_margin * (depth - 1))
+
+    for index, (type, move) in enumerate(ordered_moves):
+        if (futile_value is not None and futile_value <= alpha and type == 'wall'
+                and (move[0], move[1]) in quiet_walls):
+            # The value of the position stays an upper bound of the pruned wall's value
+            best_value = max(best_value, futile_value)
+            continue
+
+        undo = game_state.apply_move_or_wall(type, move, current_player)
+        try:
+            if best_action is None or alpha == float('-inf'):
+                value = -negamax(game_state, depth - 1, -beta, -alpha, root_color, opponent_color, limits,
+                                 difficulty, ply + 1, tt, ordering, pv)
+            else:
+                reduced = policy.should_reduce(type, index, depth)
+                if reduced:
+                    # Late wall moves are rarely good, prove it with a shallower search
+                    value = -negamax(game_state, depth - 1 - policy.lmr_reduction, -alpha - NULL_WINDOW, -alpha,
+                                     root_color, opponent_color, limits, difficulty, ply + 1, tt, ordering, pv)
+                if not reduced or value > alpha:
+                    # Prove the move no better than alpha with a null window, search it fully if it is better
+                    value = -negamax(game_state, depth - 1, -alpha - NULL_WINDOW, -alpha, root_color,
+                                     opponent_color, limits, difficulty, ply + 1, tt, ordering, pv)
+                if alpha < value < beta:
+                    value = -negamax(game_state, depth - 1, -beta, -alpha, root_color, opponent_color, limits,
+                                     difficulty, ply + 1, tt, ordering, pv)
+        finally:
+            game_state.undo_move_or_wall(undo)
+
+        if value > best_value or best_action is None:
+            best_value = max(best_value, value)
+            best_action = (type, move)
+        if value > alpha:
+            alpha = value
+            if pv is not None:
+                pv.update(ply, best_action)
+
+        if beta <= alpha:
+            if ordering is not None:
+                ordering.record_cutoff(current_player_color, type, move, ply, depth)
+            break  # The opponent will not allow this position
+
+    if tt is not None:
+        if best_value <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_value >= original_beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        tt.store(key, depth, flag, best_value, best_action)
+
+    return best_value
+
+def search_root(game_state, root_moves, depth, player, difficulty, limits, last_position=None, tt=None,
+                ordering=None, pv=None, alpha=float('-inf'), beta=float('inf')):
+    """
+    Search the root moves to the given depth within the (alpha, beta) window and return
+    (best_value, best_type, best_move). The first move is searched with the window and the other moves with a
+    null window first, like in negamax. A best_value outside the window is only a bound.
+    Pawn moves back to last_position are penalized to stop the bot from moving back and forth.
+    """
+    best_value = float('-inf')
+    best_type = None
+    best_move = None
+    if pv is not None:
+        pv.clear(0)
+
+    # The search makes and unmakes moves on this single copy instead of copying at every node
+    search_state = game_state.copy_for_search()
+
+    for type, move in root_moves:
+        if best_type is None or alpha == float('-inf'):
+            move_value = search_root_move(search_state, type, move, depth, player, alpha, beta, difficulty, limits,
+                                          last_position, tt, ordering, pv)
+        else:
+            move_value = search_root_move(search_state, type, move, depth, player, alpha, alpha + NULL_WINDOW,
+                                          difficulty, limits, last_position, tt, ordering, pv)
+            if alpha < move_value < beta:
+                move_value = search_root_move(search_state, type, move, depth, player, alpha, beta, difficulty,
+                                              limits, last_position, tt, ordering, pv)
+
+        if move_value > best_value:
+            best_value = move_value
+            best_type = type
+            best_move = move
+            if pv is not None:
+                pv.update(0, (type, move))
+            alpha = max(alpha, move_value)
+
+        if beta <= alpha:
+            break
+
+    return best_value, best_type, best_move
+
+def search_root_move(search_state, type, move, depth, player, alpha, beta, difficulty, limits, last_position=None,
+                     tt=None, ordering=None, pv=None):
+    """
+    Search a single root move to the given depth on a search copy of the game state and return its value for the
+    player, searched within the (alpha, beta) window.
+    Pawn moves back to last_position are penalized to stop the bot from moving back and forth.
+    """
+    root_color = player.color
+    opponent_color = search_state.get_opponent_color(root_color)
+
+    # Penalize the bot for moving back and forth, searching with the window the penalty shifts
+    penalty = 0
+    if type in ['left', 'right', 'up', 'down']:
+        if last_position is not None and move == last_position:
+            penalty = BACK_MOVE_PENALTY
+
+    undo = search_state.apply_move_or_wall(type, move, player)
+    try:
+        move_value = -negamax(search_state, depth - 1, -(beta + penalty), -(alpha + penalty), root_color,
+                              opponent_color, limits, difficulty, tt=tt, ordering=ordering, pv=pv)
+    finally:
+        search_state.undo_move_or_wall(undo)
+
+    return move_value - penalty
+
+def iterative_deepening(game_state, root_moves, max_depth, player, difficulty, limits, last_position=None, tt=None,
+                        on_iteration=None, start_depth=1, ordering=None, pv=None):
+    """
+    Search depth start_depth, start_depth + 1... up to max_depth until the limits run out.
+    Each iteration first searches an aspiration window around the value of the previous one, searching again
+    with the window opened on the side the value fell out of.
+    Returns (best_value, best_type, best_move, completed_depth) from the last completed iteration.
+    on_iteration, if given, is called with the same tuple after every completed iteration.
+    ordering is the MoveOrdering shared by the iterations, a new one if not given. pv is the PVTable whose
+    best_line is the principal variation of the last completed iteration.
+    """
+    if ordering is None:
+        ordering = MoveOrdering()
+    if pv is None:
+        pv = PVTable()
+    best_value = float('-inf')
+    best_type = None
+    best_move = None
+    completed_depth = 0
+
+    for depth in range(start_depth, max_depth + 1):
+        alpha, beta = float('-inf'), float('inf')
+        if best_move is not None and abs(best_value) != float('inf'):
+            alpha, beta = best_value - ASPIRATION_WINDOW, best_value + ASPIRATION_WINDOW
+        try:
+            while True:
+                value, type, move = search_root(game_state, root_moves, depth, player, difficulty, limits,
+                                                last_position, tt, ordering, pv, alpha, beta)
+                if value <= alpha != float('-inf'):
+                    alpha = float('-inf')
+                elif value >= beta != float('inf'):
+                    beta = float('inf')
+                else:
+                    break
+        except SearchTimeout:
+            break
+
+        completed_depth = depth
+        pv.complete_iteration()
+        # Root moves keep their static order so that ties go to the moves on the shortest path,
+        # the transposition table carries the ordering learnt by earlier iterations below the root
+        if move is not None:
+            best_value, best_type, best_move = value, type, move
+        if on_iteration is not None:
+            on_iteration(best_value, best_type, best_move, completed_depth)
+
+        # A forced win has been found, searching deeper cannot improve on it
+        if best_value == float('inf'):
+            break
+
+    return best_value, best_type, best_move, completed_depth
+
+def game_over(game_state):
+    red_player = game_state.red_player
+    blue_player = game_state.blue_player
+    return (red_player.col == red_player.goal_col) or (blue_player.col == blue_player.goal_col)
+
+# === Heuristic Function ===
+
+def evaluate(game_state, maximizing_player_color,depth=0):
+    maximizing_player = game_state.get_player_by_color(maximizing_player_color)
+    minimizing_player = game_state.get_player_by_color(game_state.get_opponent_color(maximizing_player_color))
+
+    # Look the distances up in the goal distance fields, shared by every position with the same walls
+    grid_size = game_state.grid_size
+    max_distance = goal_distances(maximizing_player.goal_col, grid_size, game_state.board)[
+        maximizing_player.row * grid_size + maximizing_player.col]
+    min_distance = goal_distances(minimizing_player.goal_col, grid_size, game_state.board)[
+        minimizing_player.row * grid_size + minimizing_player.col]
+
+    # INVALID LINE:
+    if max_distance is None or min_distance is None:
+        return float('-inf')
+
+    # Count the cells of the path, start and goal included
+    max_distance += 1
+    min_distance += 1
+
+    # Check for terminal states
+    if maximizing_player.col == maximizing_player.goal_col:
+        return float('inf')  # Maximizing player wins
+
+    # Heuristic value is the difference in path lengths
+    advantage_on_wall = (maximizing_player.available_walls-minimizing_player.available_walls)*1
+    proximity_weight = 0.3 * 1/(max_distance)
+    # proximity_weight = 0
+
+    if minimizing_player.col == minimizing_player.goal_col:
+        # The opponent has won, but the bot should still strive to minimize its distance to the goal
+        # Or surviving as long as possible
+        # Return a negative value proportional to the bot's distance, with an added penalty
+        penalty = 1000  # A large penalty to prioritize winning states over losing
+        depth_penalty = 50 * depth
+        return min_distance - max_distance + advantage_on_wall + proximity_weight - penalty - depth_penalty
+
+
+    evaluation = min_distance - max_distance + advantage_on_wall + proximity_weight
+    return evaluation
+
+def get_intelligent_moves(game_state, player, grid_size, board,available_walls):
+    """Return intelligent moves and other moves for the bot."""
+    opponent_color = game_state.get_opponent_color(player.color)
+    opponent_player = game_state.get_player_by_color(opponent_color)
+
+    # Dictionary to store intelligent moves and other moves
+    intelligent_moves = []
+    other_moves = []
+
+    # PLAYER MOVES
+    valid_moves = get_valid_moves_helper(player, opponent_player, grid_size, board)
+    if not valid_moves and available_walls<=0:
+        intelligent_moves.append(('skip', (player.row, player.col)))
+        return intelligent_moves, other_moves
+
+    shortest_path = bfs_pathfinder(
+        start=(player.row, player.col),
+        goal_col=player.goal_col,
+        grid_size=grid_size,
+        board=board
+    )
+
+    opponent_shortest_path = bfs_pathfinder(
+        start=(opponent_player.row, opponent_player.col),
+        goal_col=opponent_player.goal_col,
+        grid_size=grid_size,
+        board=board
+    )
+
+    # If no path exists for the maximizing player, assign a high penalty
+    if opponent_shortest_path is None:
+        return None, None
+    if shortest_path is None:
+        return None, None
+
+    for direction, move in valid_moves.items():
+        if move in shortest_path:
+            intelligent_moves.append((direction,move))
+        else:
+            other_moves.append((direction,move))
+    if available_walls<=0:
+        return intelligent_moves, other_moves
+
+    #WALL MOVES
+
+    # Roads of the opponent's shortest path as (lower cell index, higher cell index), like the wall slot roads
+    path_cells = [row * grid_size + col for row, col in opponent_shortest_path]
+    opponent_path_roads = {(min(cell, next_cell), max(cell, next_cell))
+                           for cell, next_cell in zip(path_cells, path_cells[1:])}
+
+    slots = board.slots
+    for wall in game_state.valid_walls:
+        # Check if the wall blocks the opponent's shortest path
+        blocks_path = any((cell, neighbour_cell) in opponent_path_roads
+                          for cell, _, neighbour_cell, _ in slots.roads[slots.slot_of(wall)])
+
+        if blocks_path:
+            # Add to intelligent wall moves
+            intelligent_moves.append(('wall', wall))
+        else:
+            # Wall is not an intelligent move, add to other moves
+            other_moves.append(('wall', wall))
+
+    return intelligent_moves, other_moves
+
+def select_moves(game_state, player, opponent_player, ply, policy):
+    """
+    Return the moves to search at the given ply (distance from the root) under the reduction policy, as
+    (ordered_moves, quiet_walls): quiet_walls holds the (start, end) of the walls searched that are off the
+    opponent's shortest path, which futility pruning may skip.
+    """
+    move_limits = policy.wall_plies.get(ply)
+    if move_limits is None:
+        # BOT: Doesn't consider wall placements
+        valid_moves = get_valid_moves_helper(player, opponent_player, game_state.grid_size, game_state.board)
+        return valid_moves.items(), ()
+
+    # BOT: Considers wall placements
+    intelligent_moves, other_moves = get_intelligent_moves(game_state, player, game_state.grid_size,
+                                                           game_state.board, player.available_walls)
+    # INVALID LINE:
+    if not intelligent_moves and not other_moves:
+        return None, ()
+
+    intelligent_limit, other_limit = move_limits
+    other_moves = other_moves[:other_limit]
+    quiet_walls = {(move[0], move[1]) for type, move in other_moves if type == 'wall'}
+    return intelligent_moves[:intelligent_limit] + other_moves, quiet_walls
@@ -0,0 +1,234 @@
+from helpers.board_helper import Board
+from helpers.path_helper import bfs_pathfinder, carry_goal_distances
+from helpers.valid_moves_helper import get_valid_moves_helper
+from helpers.wall_helpers import find_forbidden_walls_new, find_valid_walls, order_walls, update_forbidden_walls
+from helpers.zobrist_helper import PAWN_KEYS, SIDE_KEY, WALLS_LEFT_KEYS, compute_hash, wall_key
+
+
+class GameState:
+    def __init__(self, grid_size, board, placed_walls, red_player, blue_player, current_turn,
+                 previous_state=None, new_wall=None):
+        """
+        Initialize the game state at each turn.
+        When the turn was a wall placement, passing the previous state and the new wall lets the
+        forbidden walls be updated incrementally instead of recomputed.
+        Args:
+            grid_size: Number of cells per side.
+            board: Board holding the placed walls.
+            placed_walls: Walls placed on the board, as [(row, col), (row, col)].
+            red_player, blue_player: Players, any object with row, col, goal_col, color and available_walls.
+            current_turn: Color of the player to move.
+        """
+        self.grid_size=grid_size
+
+        self.red_player=red_player
+        self.blue_player=blue_player
+
+        self.board=board
+        self.placed_walls=placed_walls
+
+        if previous_state is not None and new_wall is not None:
+            self.forbidden_walls = previous_state.forbidden_walls
+            self.wall_states_positions = previous_state.wall_states_positions
+            self.update_wall_states(new_wall)
+        else:
+            self.wall_states_positions = None
+            self.update_wall_states()
+
+        # Zobrist hash of the position, updated incrementally by apply_move_or_wall
+        self.hash = compute_hash(self.red_player, self.blue_player, self.placed_walls, current_turn)
+
+        if self.red_player:
+            start_position = (self.red_player.row, self.red_player.col)
+            self.red_player_shortest_path = bfs_pathfinder(start_position, self.red_player.goal_col,
+                                                              self.grid_size, self.board)
+
+        if self.blue_player:
+            start_position = (self.blue_player.row, self.blue_player.col)
+            self.blue_player_shortest_path = bfs_pathfinder(start_position, self.blue_player.goal_col,
+                                                               self.grid_size, self.board)
+
+    @classmethod
+    def new_game(cls, grid_size=9, available_walls=10, current_turn='blue'):
+        """
+        Return the state of a new game with no interface: the blue player starts in the middle of the first
+        column and goes to the last one, the red player the other way round.
+        """
+        middle_row = grid_size // 2
+        return cls.from_position((middle_row, grid_size - 1), (middle_row, 0), red_walls=available_walls,
+                                 blue_walls=available_walls, current_turn=current_turn, grid_size=grid_size)
+
+    @classmethod
+    def from_position(cls, red_pos, blue_pos, walls=(), red_walls=10, blue_walls=10, current_turn='blue',
+                      grid_size=9):
+        """
+        Return the state of a position with no interface, the red player going to the first column and the
+        blue player to the last one.
+        Args:
+            red_pos, blue_pos: (row, col) of the players.
+            walls: Placed walls, as [(row, col), (row, col)].
+            red_walls, blue_walls: Walls left to each player.
+            current_turn: Color of the player to move.
+        """
+        placed_walls = [order_walls(wall) for wall in walls]
+        red_player = SimplePlayer(red_pos[0], red_pos[1], 0, red_walls)
+        blue_player = SimplePlayer(blue_pos[0], blue_pos[1], grid_size - 1, blue_walls)
+        return cls(grid_size, Board(grid_size, placed_walls), placed_walls, red_player, blue_player, current_turn)
+
+    # === Movement Management ===
+
+    def get_valid_moves(self, player):
+        """Return valid moves by calling the helper function."""
+        other_player = self.red_player if player == self.blue_player else self.blue_player
+        return get_valid_moves_helper(player, other_player, self.grid_size, self.board)
+
+    def get_legal_moves(self, player):
+        """
+        Return every legal (action_type, action_value) of the player: the pawn moves, then the valid walls if
+        the player has walls left, or a single ('skip', ()) if there is none like in the game.
+        """
+        legal_moves = list(self.get_valid_moves(player).items())
+        if player.available_walls > 0:
+            legal_moves += [('wall', wall) for wall in self.valid_walls]
+        if not legal_moves:
+            legal_moves.append(('skip', ()))
+        return legal_moves
+
+    # === Wall Management ===
+
+    def update_wall_states(self, new_wall=None):
+        """
+        Update the forbidden and valid walls. When new_wall has just been placed and the players have not
+        moved since the last update, only the walls it can affect are checked again.
+        """
+        # Get the red and blue player positions and goals
+        red_player_pos = (self.red_player.row, self.red_player.col)
+        blue_player_pos = (self.blue_player.row, self.blue_player.col)
+
+        # Update forbidden walls
+        if new_wall is not None and self.wall_states_positions == (red_player_pos, blue_player_pos):
+            self.forbidden_walls = update_forbidden_walls(
+                self.grid_size, self.board, self.forbidden_walls, new_wall,
+                red_player_pos, blue_player_pos, self.red_player.goal_col, self.blue_player.goal_col
+            )
+        else:
+            self.forbidden_walls = find_forbidden_walls_new(
+                self.grid_size, self.board,
+                red_player_pos, blue_player_pos, self.red_player.goal_col, self.blue_player.goal_col
+            )
+        self.wall_states_positions = (red_player_pos, blue_player_pos)
+
+        # Update valid walls based on the current state
+        self.valid_walls = find_valid_walls(self.board, self.forbidden_walls)
+
+    # === Bot Functions ===
+
+    def copy_for_search(self):
+        """
+        Return a copy of the game state that the search can modify in place with
+        apply_move_or_wall and undo_move_or_wall without touching the scene or the players.
+        """
+        # Create a new GameState instance
+        game_state_copy = GameState.__new__(GameState)
+
+        # Copy game state attributes
+        game_state_copy.grid_size = self.grid_size
+        game_state_copy.board = self.board.copy()
+        game_state_copy.placed_walls = self.placed_walls.copy()
+        game_state_copy.forbidden_walls = self.forbidden_walls
+        game_state_copy.valid_walls = self.valid_walls
+        game_state_copy.wall_states_positions = self.wall_states_positions
+        game_state_copy.hash = self.hash
+
+        # Copy player states
+        game_state_copy.red_player = self.copy_player(self.red_player)
+        game_state_copy.blue_player = self.copy_player(self.blue_player)
+
+        return game_state_copy
+
+    def apply_move_or_wall(self, action_type, action_value, player):
+        """
+        Apply either a move or a wall placement to this game state in place.
+        Returns the undo record to pass to undo_move_or_wall.
+        """
+        moved_player = self.get_player_by_color(player.color)
+        undo = (action_type, self.hash, moved_player, moved_player.row, moved_player.col,
+                self.forbidden_walls, self.valid_walls, self.wall_states_positions)
+
+        # Every action passes the turn to the other player
+        self.hash ^= SIDE_KEY
+
+        if action_type == 'wall':
+            # Simulate wall placement
+            wall = action_value  # The wall coordinates
+
+            # Add the wall and the roads it blocks
+            previous_walls_key = self.board.walls_key()
+            self.placed_walls.append(wall)
+            self.board.add_wall(wall)
+
+            # Repair the goal distances of both players instead of searching them again
+            for goal_col in (self.red_player.goal_col, self.blue_player.goal_col):
+                carry_goal_distances(goal_col, self.grid_size, self.board, wall, previous_walls_key)
+
+            # Deduct available walls from the player
+            walls_left_keys = WALLS_LEFT_KEYS[moved_player.color]
+            self.hash ^= wall_key(wall) ^ walls_left_keys[moved_player.available_walls]
+            moved_player.available_walls -= 1
+            self.hash ^= walls_left_keys[moved_player.available_walls]
+
+            self.update_wall_states(wall)
+        elif action_type == 'skip':
+            # Skip the player's turn
+            pass
+        else:
+            # Unpack move coordinates
+            new_row, new_col = action_value
+
+            pawn_keys = PAWN_KEYS[moved_player.color]
+            self.hash ^= pawn_keys[moved_player.row][moved_player.col] ^ pawn_keys[new_row][new_col]
+            moved_player.row = new_row
+            moved_player.col = new_col
+
+        return undo
+
+    def undo_move_or_wall(self, undo):
+        """Revert the action applied by apply_move_or_wall."""
+        (action_type, self.hash, moved_player, row, col,
+         self.forbidden_walls, self.valid_walls, self.wall_states_positions) = undo
+        moved_player.row, moved_player.col = row, col
+
+        if action_type == 'wall':
+            self.board.remove_wall(self.placed_walls.pop())
+            moved_player.available_walls += 1
+
+    def copy_player(self, player):
+        """
+        Helper method to copy a player object, preserving its state.
+        """
+        return SimplePlayer(
+            player.row, player.col, player.goal_col, player.available_walls
+        )
+
+    def move_player(self, player, new_row, new_col):
+        """Move the player to the new row and column."""
+        player.row, player.col = new_row, new_col
+
+    def get_player_by_color(self, color):
+        if color == 'red':
+            return self.red_player
+        else:
+            return self.blue_player
+
+    def get_opponent_color(self, color):
+        return 'blue' if color == 'red' else 'red'
+
+class SimplePlayer:
+    def __init__(self, row, col,goal_col,available_walls):
+        self.row = row
+        self.col = col
+        self.goal_col = goal_col
+        self.color = 'red' if goal_col == 0 else 'blue'
+        self.available_walls = available_walls
+
+
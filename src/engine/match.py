@@ -0,0 +1,114 @@
+import random
+import time
+
+from engine.game_state import GameState
+from engine.search import DIFFICULTY_SETTINGS, SearchMemory, search_move
+from engine.search_limits import SearchLimits
+
+# Plies after which a game is scored as a draw
+MAX_PLIES = 300
+
+
+class EngineConfig:
+    def __init__(self, difficulty, search_depth=None, time_budget=None, node_budget=None, engine=None):
+        """
+        Settings of an engine playing headless games, the difficulty's settings unless overridden.
+        Args:
+            difficulty: Difficulty whose move selection the engine uses.
+            search_depth: Deepest iteration.
+            time_budget: Seconds per move, or None for no limit.
+            node_budget: Nodes per move, or None for no limit.
+            engine: 'alphabeta' or 'mcts', the difficulty's engine if None.
+        """
+        settings = DIFFICULTY_SETTINGS[difficulty]
+        self.difficulty = difficulty
+        self.search_depth = search_depth if search_depth is not None else settings['search_depth']
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.engine = engine if engine is not None else settings['engine']
+        if time_budget is None and node_budget is None:
+            self.time_budget = settings['time_budget']
+
+    def __str__(self):
+        controls = [f"depth {self.search_depth}"]
+        if self.time_budget is not None:
+            controls.append(f"{self.time_budget}s/move")
+        if self.node_budget is not None:
+            controls.append(f"{self.node_budget} nodes/move")
+        return f"{self.difficulty}@{self.engine} ({', '.join(controls)})"
+
+
+def is_repetition_draw(move_history):
+    """Check if the last 12 moves are the same two pairs of moves played three times in a row."""
+    if len(move_history) >= 12:
+        # Get the last 12 moves (6 moves per player, 3 pairs)
+        last_six_moves = move_history[-12:]
+
+        # Check if the last three pairs of moves are identical
+        first_pair = last_six_moves[0:2]
+        second_pair = last_six_moves[2:4]
+        third_pair = last_six_moves[4:6]
+        fourth_pair = last_six_moves[6:8]
+        fifth_pair = last_six_moves[8:10]
+        sixth_pair = last_six_moves[10:12]
+
+        # Compare if the last three pairs are identical
+        if first_pair == third_pair == fifth_pair and second_pair == fourth_pair == sixth_pair:
+            return True
+    return False
+
+
+def play_move(game_state, action_type, action_value, player):
+    """Play a move on the game state in place, keeping its wall states up to date like a new turn would."""
+    game_state.apply_move_or_wall(action_type, action_value, player)
+    if action_type != 'wall':
+        # Pawn moves leave the forbidden walls of the previous positions
+        game_state.update_wall_states()
+
+
+def play_game(engines, opening_plies=0, seed=None, grid_size=9, max_plies=MAX_PLIES):
+    """
+    Play a game between two engines with no interface, blue moving first like in the game window.
+    The first opening_plies plies are random pawn moves, so that games from the same seed are identical
+    and games from different seeds start differently.
+    Args:
+        engines: EngineConfig of each color, as {'blue': ..., 'red': ...}.
+    Returns:
+        (winner, plies, cpu_times): the winning color or None for a draw, the number of plies played and the
+        CPU seconds each color spent searching.
+    """
+    rng = random.Random(seed)
+    game_state = GameState.new_game(grid_size)
+    turn = 'blue'
+    move_history = []
+    last_positions = {}
+    # Each engine keeps its transposition table and principal variation for the whole game, like the bot
+    memories = {'blue': SearchMemory(), 'red': SearchMemory()}
+    cpu_times = {'blue': 0.0, 'red': 0.0}
+
+    for ply in range(max_plies):
+        player = game_state.get_player_by_color(turn)
+        if ply < opening_plies:
+            valid_moves = list(game_state.get_valid_moves(player).items())
+            action_type, action_value = rng.choice(valid_moves) if valid_moves else ('skip', ())
+        else:
+            engine = engines[turn]
+            limits = SearchLimits(time_budget=engine.time_budget, node_budget=engine.node_budget)
+            start = time.process_time()
+            _, action_type, action_value, _ = search_move(game_state, player, engine.difficulty,
+                                                          engine.search_depth, limits,
+                                                          last_position=last_positions.get(turn),
+                                                          memory=memories[turn], engine=engine.engine)
+            cpu_times[turn] += time.process_time() - start
+
+        last_positions[turn] = (player.row, player.col)
+        play_move(game_state, action_type, action_value, player)
+        move_history.append((action_type, tuple(action_value)))
+
+        if player.col == player.goal_col:
+            return turn, ply + 1, cpu_times
+        if is_repetition_draw(move_history):
+            return None, ply + 1, cpu_times
+        turn = game_state.get_opponent_color(turn)
+
+    return None, max_plies, cpu_times
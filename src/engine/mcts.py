@@ -0,0 +1,286 @@
+import math
+import random
+
+from engine.bot_helper import game_over, get_intelligent_moves
+from engine.search_limits import SearchTimeout
+from helpers.board_helper import get_neighbours, get_wall_slots
+from helpers.path_helper import goal_distances, repair_goal_distances
+
+# Exploration constant of the UCT formula, the playouts being won or lost
+EXPLORATION = 1.4
+# Chance a rollout player with walls left places a wall across the opponent's next step instead of moving
+ROLLOUT_WALL_CHANCE = 0.15
+# Plies after which a rollout is scored from the path lengths instead of played to the end
+ROLLOUT_MAX_PLIES = 60
+# Playouts between two calls of on_iteration
+REPORT_PLAYOUTS = 500
+
+
+class MCTSNode:
+    __slots__ = ('action', 'color', 'hash', 'parent', 'children', 'untried', 'visits', 'wins', 'winner')
+
+    def __init__(self, action, color, hash, parent, winner=None):
+        """
+        Position of the search tree reached by action, played by color. wins counts the playouts through the
+        node won by color, untried holds the moves left to expand, None until the node is first expanded,
+        and winner is color if the action won the game.
+        """
+        self.action = action
+        self.color = color
+        self.hash = hash
+        self.parent = parent
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        self.wins = 0
+        self.winner = winner
+
+
+def tree_moves(game_state, player):
+    """
+    Return the moves of the player expanded in the tree: the moves of get_intelligent_moves that get closer to
+    the goal or block the opponent's shortest path, then the other pawn moves. ('skip', ()) if there is none.
+    """
+    intelligent_moves, other_moves = get_intelligent_moves(game_state, player, game_state.grid_size,
+                                                           game_state.board, player.available_walls)
+    if intelligent_moves is None:
+        return [('skip', ())]
+    moves = intelligent_moves + [move for move in other_moves if move[0] != 'wall']
+    return [('skip', ()) if action_type == 'skip' else (action_type, action_value)
+            for action_type, action_value in moves] or [('skip', ())]
+
+
+def paths_exist(game_state):
+    """
+    Check if both players can still reach their goal. The search places walls from the valid walls of the last
+    wall placement, which the pawn moves since may have made invalid.
+    """
+    grid_size, board = game_state.grid_size, game_state.board
+    return all(goal_distances(player.goal_col, grid_size, board)[player.row * grid_size + player.col] is not None
+               for player in (game_state.red_player, game_state.blue_player))
+
+
+# Slots blocking each road, per grid size, see get_road_slots
+_road_slots_cache = {}
+
+
+def get_road_slots(grid_size):
+    """Return {(cell, neighbour_cell): [slot, ...]} of the wall slots blocking each road, lower cell first."""
+    road_slots = _road_slots_cache.get(grid_size)
+    if road_slots is None:
+        road_slots = {}
+        for slot, roads in enumerate(get_wall_slots(grid_size).roads):
+            for cell, _, neighbour_cell, _ in roads:
+                road_slots.setdefault((cell, neighbour_cell), []).append(slot)
+        _road_slots_cache[grid_size] = road_slots
+    return road_slots
+
+
+def rollout(game_state, color):
+    """
+    Play the position out from the color to move and return the winning color. Both players step along their
+    shortest path, and now and then a player with walls left places a random wall across a shortest path step
+    of the opponent. Once neither player has walls left, or after ROLLOUT_MAX_PLIES, the player with the
+    shorter path wins, the player to move on ties.
+    The walls are placed on the board and the goal distances repaired directly, without the valid walls of
+    apply_move_or_wall, and the board is restored before returning.
+    """
+    grid_size = game_state.grid_size
+    board = game_state.board
+    blocked = board.blocked
+    neighbours = get_neighbours(grid_size)
+    slots = board.slots
+    road_slots = get_road_slots(grid_size)
+
+    red, blue = game_state.red_player, game_state.blue_player
+    cells = {'red': red.row * grid_size + red.col, 'blue': blue.row * grid_size + blue.col}
+    walls_left = {'red': red.available_walls, 'blue': blue.available_walls}
+    goal_cols = {'red': red.goal_col, 'blue': blue.goal_col}
+    distances = {goal_color: goal_distances(goal_col, grid_size, board) for goal_color, goal_col in goal_cols.items()}
+
+    placed_walls = []
+    try:
+        for _ in range(ROLLOUT_MAX_PLIES):
+            if not walls_left['red'] and not walls_left['blue']:
+                break
+            opponent_color = 'blue' if color == 'red' else 'red'
+
+            if walls_left[color] and random.random() < ROLLOUT_WALL_CHANCE:
+                # Free slots across the roads of the opponent's next shortest path steps
+                cell = cells[opponent_color]
+                step_distance = distances[opponent_color][cell] - 1
+                wall_slots = [slot for bit, neighbour in neighbours[cell]
+                              if not blocked[cell] & bit and distances[opponent_color][neighbour] == step_distance
+                              for slot in road_slots[(min(cell, neighbour), max(cell, neighbour))]
+                              if board.free_walls >> slot & 1]
+                if wall_slots:
+                    wall = slots.walls[random.choice(wall_slots)]
+                    board.add_wall(wall)
+                    new_distances = {goal_color: repair_goal_distances(old_distances, grid_size, board, wall)
+                                     for goal_color, old_distances in distances.items()}
+                    if all(new_distances[pawn_color][cell] is not None for pawn_color, cell in cells.items()):
+                        placed_walls.append(wall)
+                        distances = new_distances
+                        walls_left[color] -= 1
+                        color = opponent_color
+                        continue
+                    board.remove_wall(wall)
+
+            # Pawn moves closest to the goal, jumping straight over the opponent like get_valid_moves_helper
+            cell, opponent_cell = cells[color], cells[opponent_color]
+            player_distances = distances[color]
+            targets = []
+            for bit, neighbour in neighbours[cell]:
+                if blocked[cell] & bit:
+                    continue
+                if neighbour == opponent_cell:
+                    neighbour = next((jump for jump_bit, jump in neighbours[opponent_cell]
+                                      if jump_bit == bit and not blocked[opponent_cell] & bit), None)
+                    if neighbour is None:
+                        continue
+                targets.append(neighbour)
+            if targets:
+                best_distance = min(player_distances[target] for target in targets)
+                cells[color] = random.choice([target for target in targets
+                                              if player_distances[target] == best_distance])
+                if not best_distance:
+                    return color
+            color = opponent_color
+
+        opponent_color = 'blue' if color == 'red' else 'red'
+        return color if distances[color][cells[color]] <= distances[opponent_color][cells[opponent_color]] \
+            else opponent_color
+    finally:
+        for wall in reversed(placed_walls):
+            board.remove_wall(wall)
+
+
+class MCTS:
+    def __init__(self, exploration=EXPLORATION):
+        """
+        Monte Carlo tree search (UCT) over the moves of get_intelligent_moves, with greedy shortest path rollouts.
+        The tree is kept from one search to the next: when the position searched next is two plies below the
+        last root, the playouts already made below it are reused.
+        Args:
+            exploration: Exploration constant of the UCT formula.
+        """
+        self.exploration = exploration
+        self.root = None
+
+    def clear(self):
+        """Forget the tree, for a new game."""
+        self.root = None
+
+    def find_root(self, game_state):
+        """Return the node of the position in the last tree, at the root or two plies below it, or None."""
+        root = self.root
+        if root is None:
+            return None
+        if root.hash == game_state.hash:
+            return root
+        for child in root.children:
+            for grandchild in child.children:
+                if grandchild.hash == game_state.hash:
+                    return grandchild
+        return None
+
+    def search(self, game_state, player, root_moves, limits, max_playouts=None, on_iteration=None):
+        """
+        Run playouts from the position until the limits stop the search or max_playouts have been run.
+        Returns (value, action_type, action_value, depth) of the most visited root move: value is its expected
+        result for the player from -1 (loss) to 1 (win) and depth is the length of the most visited line.
+        The move is None if no playout was run.
+        Args:
+            root_moves: Moves searched at the root.
+            limits: SearchLimits of the move, each playout counting as a node.
+            on_iteration: Called with the same values as the result every REPORT_PLAYOUTS playouts.
+        """
+        root = self.find_root(game_state)
+        if root is None:
+            root = MCTSNode(None, game_state.get_opponent_color(player.color), game_state.hash, None)
+            root.untried = list(reversed(root_moves))
+        else:
+            # Keep the playouts of the root moves and add the ones the tree did not expand
+            root.parent = None
+            root.children = [child for child in root.children if child.action in root_moves]
+            expanded = [child.action for child in root.children]
+            root.untried = [move for move in reversed(root_moves) if move not in expanded]
+        self.root = root
+
+        state = game_state.copy_for_search()
+        playouts = 0
+        try:
+            while max_playouts is None or playouts < max_playouts:
+                limits.count_node()
+                self.playout(state, root)
+                playouts += 1
+                if on_iteration is not None and playouts % REPORT_PLAYOUTS == 0:
+                    on_iteration(*self.best_move(root))
+        except SearchTimeout:
+            pass
+        return self.best_move(root)
+
+    def playout(self, game_state, root):
+        """Select a line down the tree, expand it by one move, roll it out and back the result up to the root."""
+        node = root
+        undos = []
+
+        # Selection
+        while node.winner is None and node.untried is not None and not node.untried and node.children:
+            node = self.select_child(node)
+            undos.append(game_state.apply_move_or_wall(*node.action, game_state.get_player_by_color(node.color)))
+
+        # Expansion
+        if node.winner is None:
+            color = game_state.get_opponent_color(node.color)
+            player = game_state.get_player_by_color(color)
+            if node.untried is None:
+                node.untried = list(reversed(tree_moves(game_state, player)))
+            while node.untried:
+                action = node.untried.pop()
+                undo = game_state.apply_move_or_wall(*action, player)
+                if action[0] == 'wall' and not paths_exist(game_state):
+                    game_state.undo_move_or_wall(undo)
+                    continue
+                undos.append(undo)
+                child = MCTSNode(action, color, game_state.hash, node,
+                                 winner=color if game_over(game_state) else None)
+                node.children.append(child)
+                node = child
+                break
+
+        # Simulation
+        winner = node.winner
+        if winner is None:
+            winner = rollout(game_state, game_state.get_opponent_color(node.color))
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if node.color == winner:
+                node.wins += 1
+            node = node.parent
+
+        for undo in reversed(undos):
+            game_state.undo_move_or_wall(undo)
+
+    def select_child(self, node):
+        """Return the child with the highest upper confidence bound."""
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        return max(node.children,
+                   key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits))
+
+    def best_move(self, root):
+        """Return (value, action_type, action_value, depth) of the most visited root move, see search."""
+        if not root.children:
+            return float('-inf'), None, None, 0
+        child = max(root.children, key=lambda child: child.visits)
+        value = 2 * child.wins / child.visits - 1
+
+        depth = 1
+        node = child
+        while node.children:
+            node = max(node.children, key=lambda child: child.visits)
+            depth += 1
+        return value, child.action[0], child.action[1], depth
@@ -0,0 +1,58 @@
+# Fewest moves a position needs for the history to reorder them: positions with pawn moves only are left in
+# their static order, shortest path first, as sorting costs more than it saves there
+HISTORY_MIN_MOVES = 8
+
+
+def move_key(color, action_type, action_value):
+    """Return the history key of a move: the target cell of a pawn move or the slot of a wall, per color."""
+    if action_type == 'wall':
+        (start_row, start_col), (end_row, end_col) = action_value
+        return color, start_row, start_col, end_row, end_col
+    if action_type == 'skip':
+        return color,
+    return color, action_value[0], action_value[1]
+
+
+class MoveOrdering:
+    def __init__(self):
+        """
+        Dynamic move ordering of the search below the root: the transposition table move first, then the
+        killer moves of the ply, then the other moves by their history score. Moves with the same score keep
+        the static order of select_moves, shortest path and path-blocking walls first.
+        """
+        # Up to two moves per ply from the root that caused a cutoff in a sibling position
+        self.killers = {}
+        # Sum of depth * depth over the cutoffs caused by each move_key
+        self.history = {}
+
+    def new_search(self):
+        """Forget the killers, which depend on the root, and halve the history so that recent cutoffs count most."""
+        self.killers.clear()
+        self.history = {key: score // 2 for key, score in self.history.items() if score > 1}
+
+    def order(self, moves, ply, color, tt_move=None):
+        """Return the moves of the color at the ply, as a new list in search order."""
+        moves = list(moves)
+        history = self.history
+        if history and len(moves) >= HISTORY_MIN_MOVES:
+            moves.sort(key=lambda move: -history.get(move_key(color, *move), 0))
+
+        first = []
+        if tt_move is not None and tt_move in moves:
+            first.append(tt_move)
+        for killer in self.killers.get(ply, ()):
+            if killer not in first and killer in moves:
+                first.append(killer)
+        if first:
+            moves = first + [move for move in moves if move not in first]
+        return moves
+
+    def record_cutoff(self, color, action_type, action_value, ply, depth):
+        """Reward a move that caused a cutoff with depth plies left to search."""
+        move = (action_type, action_value)
+        killers = self.killers.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        key = move_key(color, action_type, action_value)
+        self.history[key] = self.history.get(key, 0) + depth * depth
@@ -0,0 +1,323 @@
+import multiprocessing
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from engine.bot_helper import iterative_deepening, search_root_move
+from engine.move_ordering import MoveOrdering
+from engine.search_limits import SearchLimits, SearchTimeout
+from engine.transposition_table import SharedTranspositionTable, TranspositionTable
+
+# Seconds between two checks of the coordinator's limits while waiting for the workers
+POLL_INTERVAL = 0.05
+
+# Slots of the shared transposition table of each color in a Lazy-SMP search
+SHARED_TT_SIZE = 1 << 20
+
+# State of a worker process, set by init_worker for the whole session
+_worker = {}
+
+
+def init_worker(shared_alpha, stop_flag):
+    """Store the values shared with the searching thread in a worker process, once for the whole session."""
+    _worker['shared_alpha'] = shared_alpha
+    _worker['stop_flag'] = stop_flag
+    _worker['game'] = None
+    # Transposition table and move ordering of each color, kept from one move to the next like SearchMemory
+    _worker['memories'] = {}
+    # Shared transposition tables attached to, by shared memory name
+    _worker['tables'] = {}
+    _worker['search'] = None
+
+
+def load_search(search, position):
+    """
+    Return the (game_state, player, difficulty, last_position) of the search in this worker, unpickled from
+    position on the first task of the search only. The tables of the previous game are dropped on a new game.
+    """
+    game, _ = search
+    if _worker['game'] != game:
+        _worker['game'] = game
+        _worker['memories'] = {}
+        for table in _worker['tables'].values():
+            table.close()
+        _worker['tables'] = {}
+    if _worker['search'] != search:
+        _worker['search'] = search
+        game_state, color, difficulty, last_position = pickle.loads(position)
+        _worker['position'] = game_state, game_state.get_player_by_color(color), difficulty, last_position
+    return _worker['position']
+
+
+def worker_memory(search, color):
+    """Return the {'tt': ..., 'ordering': ...} of the color in this worker, aged once per search."""
+    memory = _worker['memories'].get(color)
+    if memory is None:
+        memory = _worker['memories'][color] = {'tt': TranspositionTable(), 'ordering': MoveOrdering(), 'search': None}
+    if memory['search'] != search:
+        memory['search'] = search
+        memory['tt'].new_search()
+        memory['ordering'].new_search()
+    return memory
+
+
+def attach_table(grid_size, size, name, generation):
+    """
+    Return the shared transposition table of the name, attaching to it on first use only, at the generation of
+    the searching thread.
+    """
+    table = _worker['tables'].get(name)
+    if table is None:
+        table = _worker['tables'][name] = SharedTranspositionTable(grid_size, size, name)
+    table.generation = generation
+    return table
+
+
+def search_move_in_worker(search, position, index, type, move, depth, deadline, node_budget):
+    """
+    Search one root move in a worker process, with the best value found by any worker when the task starts as
+    its alpha bound, which is not raised during the search.
+    Returns (index, value, alpha, nodes), with value None if the limits ran out.
+    """
+    search_state, player, difficulty, last_position = load_search(search, position)
+    memory = worker_memory(search, player.color)
+    limits = SearchLimits(node_budget=node_budget, deadline=deadline, stop_flag=_worker['stop_flag'])
+    shared_alpha = _worker['shared_alpha']
+    alpha = shared_alpha.value
+    try:
+        value = search_root_move(search_state, type, move, depth, player, alpha, float('inf'), difficulty, limits,
+                                 last_position, memory['tt'], memory['ordering'])
+    except SearchTimeout:
+        return index, None, alpha, limits.nodes
+
+    # Raise the bound of the moves still to be submitted
+    with shared_alpha.get_lock():
+        if value > shared_alpha.value:
+            shared_alpha.value = value
+    return index, value, alpha, limits.nodes
+
+
+def run_helper_search(search, position, table, index, root_moves, max_depth, deadline, node_budget):
+    """
+    Search the whole position in a Lazy-SMP helper process, only to fill the shared transposition table, given
+    as (grid_size, size, name, generation). Each helper starts from a different root move, so the helpers spread over
+    different parts of the tree instead of repeating the main search. Returns the number of nodes searched.
+    """
+    game_state, player, difficulty, last_position = load_search(search, position)
+    limits = SearchLimits(node_budget=node_budget, deadline=deadline, stop_flag=_worker['stop_flag'])
+    shift = index % len(root_moves)
+    helper_moves = root_moves[shift:] + root_moves[:shift]
+    iterative_deepening(game_state, helper_moves, max_depth, player, difficulty, limits, last_position,
+                        attach_table(*table))
+    return limits.nodes
+
+
+class SearchPool:
+    def __init__(self, workers):
+        """
+        Worker processes kept for the whole session and shared by the parallel searches of every move, so that
+        the workers import the engine once and keep their transposition tables and path caches warm from one
+        move to the next. shutdown must be called once the pool is no longer needed.
+        Args:
+            workers: Number of worker processes.
+        """
+        self.workers = workers
+        # Spawned workers only import the search modules, forking the GUI's threads is unsafe
+        context = multiprocessing.get_context('spawn')
+        self.shared_alpha = context.Value('d', float('-inf'))
+        self.stop_flag = context.Value('b', 0, lock=False)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=init_worker,
+            initargs=(self.shared_alpha, self.stop_flag),
+        )
+        # Shared transposition table of each color for the Lazy-SMP search
+        self.tables = {}
+        self.game = 0
+        self.search = 0
+
+    def new_search(self, game_state, player, difficulty, last_position):
+        """
+        Start the search of a move and return (search, position): the key of the search the workers age their
+        tables by and the pickled position sent along with the tasks, unpickled once per worker.
+        """
+        self.stop_flag.value = 0
+        self.search += 1
+        position = pickle.dumps((game_state.copy_for_search(), player.color, difficulty, last_position))
+        return (self.game, self.search), position
+
+    def new_game(self):
+        """Forget the tables of the previous game, in the workers and in shared memory."""
+        self.game += 1
+        for table in self.tables.values():
+            table.clear()
+
+    def shared_table(self, color, grid_size):
+        """Return the shared transposition table of the color, for the Lazy-SMP search."""
+        table = self.tables.get(color)
+        if table is None or table.grid_size != grid_size:
+            if table is not None:
+                table.close()
+            table = self.tables[color] = SharedTranspositionTable(grid_size, SHARED_TT_SIZE)
+        return table
+
+    def shutdown(self):
+        """Stop the workers, aborting the searches still running, and free the shared transposition tables."""
+        self.stop_flag.value = 1
+        # Wait for the workers, which may still be starting and need the shared memory to exist
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        for table in self.tables.values():
+            table.close()
+        self.tables = {}
+
+
+class ParallelRootSearch:
+    def __init__(self, pool, game_state, player, difficulty, last_position=None):
+        """
+        Root-parallel search: the root moves of each iteration are searched as separate tasks of the pool.
+        The first root move is searched alone (young brothers wait), then the others are spread over the
+        workers. Each task reads the best value found so far as its alpha bound when it starts, and keeps that
+        bound to the end: a task already running does not see the better values found meanwhile by the other
+        workers, so the first tasks of each batch search with the full window.
+        Args:
+            pool: SearchPool searching the root moves.
+            game_state: Position to search.
+            player: Player to move, the bot.
+        """
+        self.pool = pool
+        self.search, self.position = pool.new_search(game_state, player, difficulty, last_position)
+
+    def iterative_deepening(self, root_moves, max_depth, limits, on_iteration=None):
+        """
+        Search depth 1, 2, 3... up to max_depth until the limits run out, like bot_helper.iterative_deepening.
+        Returns (best_value, best_type, best_move, completed_depth) from the last completed iteration.
+        """
+        best_value = float('-inf')
+        best_type = None
+        best_move = None
+        completed_depth = 0
+
+        for depth in range(1, max_depth + 1):
+            try:
+                value, type, move = self.search_root(root_moves, depth, limits)
+            except SearchTimeout:
+                break
+
+            completed_depth = depth
+            if move is not None:
+                best_value, best_type, best_move = value, type, move
+            if on_iteration is not None:
+                on_iteration(best_value, best_type, best_move, completed_depth)
+
+            # A forced win has been found, searching deeper cannot improve on it
+            if best_value == float('inf'):
+                break
+
+        return best_value, best_type, best_move, completed_depth
+
+    def search_root(self, root_moves, depth, limits):
+        """
+        Search every root move to the given depth and return (best_value, best_type, best_move).
+        Raises SearchTimeout if the limits ran out before every move was searched.
+        """
+        root_moves = list(root_moves)
+        if not root_moves:
+            return float('-inf'), None, None
+        self.pool.shared_alpha.value = float('-inf')
+
+        results = self.run_tasks(root_moves, [0], depth, limits)
+        results += self.run_tasks(root_moves, range(1, len(root_moves)), depth, limits)
+
+        # A value no higher than the alpha it was searched with is only an upper bound, so on equal values
+        # a move searched with a lower alpha wins, then the move that comes first like in search_root
+        best_value = float('-inf')
+        best_index = None
+        best_is_exact = False
+        for index, value, alpha, _ in sorted(results):
+            is_exact = value > alpha
+            if value > best_value or (value == best_value and is_exact and not best_is_exact):
+                best_value, best_index, best_is_exact = value, index, is_exact
+
+        if best_index is None:
+            return best_value, None, None
+        best_type, best_move = root_moves[best_index]
+        return best_value, best_type, best_move
+
+    def run_tasks(self, root_moves, indexes, depth, limits):
+        """Search the root moves at the given indexes on the pool and return their results."""
+        # The workers get an equal share of the nodes left
+        node_budget = limits.remaining_nodes()
+        if node_budget is not None:
+            node_budget //= self.pool.workers
+
+        futures = {self.pool.executor.submit(search_move_in_worker, self.search, self.position, index,
+                                             *root_moves[index], depth, limits.deadline, node_budget)
+                   for index in indexes}
+        results = []
+        timed_out = False
+        while futures:
+            done, futures = wait(futures, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, value, alpha, nodes = future.result()
+                limits.nodes += nodes
+                if value is None:
+                    timed_out = True
+                else:
+                    results.append((index, value, alpha, nodes))
+
+            # Stop every worker as soon as the search is stopped or one of them runs out of time
+            if limits.stopped or timed_out:
+                self.pool.stop_flag.value = 1
+        if timed_out or limits.stopped:
+            raise SearchTimeout()
+        return results
+
+
+class LazySMPSearch:
+    def __init__(self, pool, game_state, player, difficulty, last_position=None):
+        """
+        Lazy-SMP search: the main search runs in the calling thread while every worker of the pool searches the
+        same position, all of them sharing the color's transposition table in shared memory, kept for the whole
+        game and aged by a generation per search. The helpers' results only reach the main search through the
+        table, as cut-offs and best moves to try first.
+        Args:
+            pool: SearchPool whose workers are the helpers.
+            game_state: Position to search.
+            player: Player to move, the bot.
+        """
+        self.pool = pool
+        self.game_state = game_state
+        self.player = player
+        self.difficulty = difficulty
+        self.last_position = last_position
+        self.tt = pool.shared_table(player.color, game_state.grid_size)
+        self.tt.new_search()
+        self.search, self.position = pool.new_search(game_state, player, difficulty, last_position)
+
+    def iterative_deepening(self, root_moves, max_depth, limits, on_iteration=None):
+        """
+        Search depth 1, 2, 3... up to max_depth until the limits run out, like bot_helper.iterative_deepening.
+        Returns (best_value, best_type, best_move, completed_depth) of the main search.
+        """
+        root_moves = list(root_moves)
+        if not root_moves:
+            return float('-inf'), None, None, 0
+
+        # The helpers get an equal share of the node budget, the main search keeps the whole budget
+        node_budget = limits.remaining_nodes()
+        if node_budget is not None:
+            node_budget //= self.pool.workers
+        table = (self.tt.grid_size, self.tt.size, self.tt.memory.name, self.tt.generation)
+        helpers = [self.pool.executor.submit(run_helper_search, self.search, self.position, table, index, root_moves,
+                                             max_depth, limits.deadline, node_budget)
+                   for index in range(1, self.pool.workers + 1)]
+
+        try:
+            return iterative_deepening(self.game_state, root_moves, max_depth, self.player, self.difficulty, limits,
+                                       self.last_position, self.tt, on_iteration)
+        finally:
+            # The main search is over, the helpers' work is no longer needed
+            self.pool.stop_flag.value = 1
+            for helper in helpers:
+                if not helper.cancel():
+                    limits.nodes += helper.result()
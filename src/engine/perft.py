@@ -0,0 +1,46 @@
+def perft(game_state, depth, color):
+    """
+    Count the move sequences of the given length from the position, color to move, following every legal
+    pawn move and wall placement. Sequences cut short by a player reaching their goal before the last move are
+    not counted, while a last move reaching the goal is.
+    The game state is modified in place and restored.
+    """
+    player = game_state.get_player_by_color(color)
+    legal_moves = game_state.get_legal_moves(player)
+    if depth <= 1:
+        # Count the last moves without playing them
+        return len(legal_moves) if depth == 1 else 1
+
+    opponent_color = game_state.get_opponent_color(color)
+    leaves = 0
+    for action_type, action_value in legal_moves:
+        leaves += perft_move(game_state, action_type, action_value, player, depth, opponent_color)
+    return leaves
+
+
+def perft_divide(game_state, depth, color):
+    """Return the perft count below each legal move of the position, as a list of (move, count)."""
+    player = game_state.get_player_by_color(color)
+    opponent_color = game_state.get_opponent_color(color)
+    return [((action_type, action_value),
+             perft_move(game_state, action_type, action_value, player, depth, opponent_color))
+            for action_type, action_value in game_state.get_legal_moves(player)]
+
+
+def perft_move(game_state, action_type, action_value, player, depth, opponent_color):
+    """
+    Play a move, count the sequences of depth - 1 moves that follow it and take it back. A last move counts as
+    one sequence without being played, even if it reaches the goal, like in perft.
+    """
+    if depth <= 1:
+        return 1
+    undo = game_state.apply_move_or_wall(action_type, action_value, player)
+    try:
+        if action_type != 'wall':
+            # The walls a pawn move forbids depend on the new pawn position
+            game_state.update_wall_states()
+        if player.col == player.goal_col:
+            return 0
+        return perft(game_state, depth - 1, opponent_color)
+    finally:
+        game_state.undo_move_or_wall(undo)
@@ -0,0 +1,43 @@
+from engine.game_state import GameState
+
+# Fixed positions of the benchmark and perft tools, with red to move. Walls are given as [(row, col), (row, col)]
+POSITIONS = {
+    # Start of the game
+    'opening': {
+        'red_pos': (4, 8), 'blue_pos': (4, 0),
+    },
+    # Both pawns have left the start, the first walls are down
+    'early': {
+        'red_pos': (3, 6), 'blue_pos': (5, 2), 'red_walls': 9, 'blue_walls': 9,
+        'walls': [[(2, 4), (4, 4)], [(5, 5), (7, 5)]],
+    },
+    # Pawns in the middle of the board, a few walls on both sides
+    'midgame': {
+        'red_pos': (3, 5), 'blue_pos': (5, 3), 'red_walls': 7, 'blue_walls': 8,
+        'walls': [[(3, 4), (5, 4)], [(5, 2), (5, 4)], [(2, 6), (4, 6)], [(6, 5), (6, 7)]],
+    },
+    # Wall-heavy middle game, most walls placed and long detours
+    'walls': {
+        'red_pos': (4, 4), 'blue_pos': (2, 3), 'red_walls': 6, 'blue_walls': 4,
+        'walls': [[(1, 1), (1, 3)], [(1, 3), (3, 3)], [(4, 5), (4, 7)], [(6, 2), (8, 2)], [(7, 5), (7, 7)],
+                  [(2, 6), (4, 6)]],
+    },
+    # Corridors built by many walls
+    'maze': {
+        'red_pos': (1, 5), 'blue_pos': (7, 3), 'red_walls': 3, 'blue_walls': 3,
+        'walls': [[(2, 0), (2, 2)], [(2, 3), (2, 5)], [(2, 6), (2, 8)], [(7, 1), (7, 3)], [(7, 4), (7, 6)],
+                  [(7, 7), (7, 9)], [(3, 4), (5, 4)], [(4, 5), (6, 5)], [(0, 2), (2, 2)], [(7, 7), (9, 7)],
+                  [(5, 1), (5, 3)], [(4, 6), (4, 8)]],
+    },
+    # Few walls left and pawns close to their goals, the race decides the game
+    'endgame': {
+        'red_pos': (2, 2), 'blue_pos': (6, 6), 'red_walls': 1, 'blue_walls': 0,
+        'walls': [[(1, 1), (3, 1)], [(3, 0), (3, 2)], [(6, 7), (8, 7)], [(5, 7), (5, 9)], [(4, 3), (4, 5)],
+                  [(2, 5), (4, 5)], [(6, 2), (6, 4)]],
+    },
+}
+
+
+def get_position(name):
+    """Return a new game state of one of the fixed positions, red to move."""
+    return GameState.from_position(current_turn='red', **POSITIONS[name])
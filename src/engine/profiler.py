@@ -0,0 +1,117 @@
+import functools
+import sys
+import time
+
+from helpers import path_helper, wall_helpers
+
+# Calls and cumulative seconds of each phase, as {name: [calls, seconds]}
+_phases = {}
+# (namespace, attribute, original) of every reference replaced by enable, to restore them
+_patched = []
+
+
+def _phase_targets():
+    """Return the functions timed as phases, as {name: (owner, attribute)}."""
+    from engine import bot_helper
+    from engine.game_state import GameState
+    from helpers import valid_moves_helper
+
+    return {
+        'find_forbidden_walls': (wall_helpers, 'find_forbidden_walls_new'),
+        'update_forbidden_walls': (wall_helpers, 'update_forbidden_walls'),
+        'goal_distances': (path_helper, 'goal_distances'),
+        'bfs_pathfinder': (path_helper, 'bfs_pathfinder'),
+        'valid_moves': (valid_moves_helper, 'get_valid_moves_helper'),
+        'intelligent_moves': (bot_helper, 'get_intelligent_moves'),
+        'evaluate': (bot_helper, 'evaluate'),
+        'copy_for_search': (GameState, 'copy_for_search'),
+        'apply_move': (GameState, 'apply_move_or_wall'),
+        'undo_move': (GameState, 'undo_move_or_wall'),
+    }
+
+
+def _timed(name, function):
+    """Wrap a function to count its calls and time in the phase."""
+    counters = _phases.setdefault(name, [0, 0.0])
+    perf_counter = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            counters[0] += 1
+            counters[1] += perf_counter() - start
+
+    return wrapper
+
+
+def is_enabled():
+    return bool(_patched)
+
+
+def enable():
+    """
+    Start timing the phases of the search. Every reference to a phase function, in its own module and in the
+    modules that imported it by name, is replaced by a timing wrapper, so the search runs the original
+    functions with no overhead at all while profiling is disabled.
+    Only the calling process is profiled, not the processes of a parallel search.
+    """
+    if _patched:
+        return
+    for name, (owner, attribute) in _phase_targets().items():
+        original = getattr(owner, attribute)
+        wrapper = _timed(name, original)
+        if isinstance(owner, type):
+            namespaces = [owner]
+        else:
+            # Functions are also reachable through the globals of every module that imported them
+            namespaces = [module for module in list(sys.modules.values())
+                          if module is not None and getattr(module, attribute, None) is original]
+        for namespace in namespaces:
+            setattr(namespace, attribute, wrapper)
+            _patched.append((namespace, attribute, original))
+    reset()
+
+
+def disable():
+    """Stop timing the phases, restoring the original functions."""
+    while _patched:
+        namespace, attribute, original = _patched.pop()
+        setattr(namespace, attribute, original)
+
+
+def reset():
+    """Clear the phase counters and the cache statistics."""
+    for counters in _phases.values():
+        counters[:] = [0, 0.0]
+    path_helper.cache.reset_stats()
+    wall_helpers.find_forbidden_walls_cache.reset_stats()
+
+
+def report():
+    """
+    Return the phases as {name: {'calls': ..., 'seconds': ...}}, slowest first, and the cache statistics.
+    Phase times include the phases called inside them, goal_distances inside evaluate for instance.
+    """
+    phases = {name: {'calls': calls, 'seconds': seconds}
+              for name, (calls, seconds) in sorted(_phases.items(), key=lambda item: -item[1][1]) if calls}
+    caches = {
+        'path': path_helper.cache.stats(),
+        'forbidden_walls': wall_helpers.find_forbidden_walls_cache.stats(),
+    }
+    return {'phases': phases, 'caches': caches}
+
+
+def format_report(profile=None):
+    """Return a report as printable lines."""
+    profile = profile or report()
+    lines = [f"{'phase':<24} {'calls':>9} {'seconds':>9} {'us/call':>9}"]
+    for name, phase in profile['phases'].items():
+        lines.append(f"{name:<24} {phase['calls']:>9} {phase['seconds']:>9.3f} "
+                     f"{phase['seconds'] / phase['calls'] * 1e6:>9.1f}")
+    for name, stats in profile['caches'].items():
+        lines.append(f"{name} cache: {stats['hits']} hits, {stats['misses']} misses, "
+                     f"hit rate {stats['hit_rate']:.1%}, {stats['entries']} entries, {stats['evictions']} evictions")
+    return "\n".join(lines)
@@ -0,0 +1,308 @@
+import threading
+
+from engine.game_state import GameState
+from engine.match import play_move
+from engine.pv_table import PVTable
+from engine.search import DIFFICULTY_SETTINGS, PARALLEL_SEARCH, SearchMemory, get_search_pool, search_move
+from engine.search_limits import SearchLimits
+from helpers.wall_helpers import order_walls
+
+ENGINE_NAME = "Quoridor engine"
+# Deepest iteration of a 'go infinite' search, which runs until 'stop'
+INFINITE_DEPTH = 100
+# Arguments of 'go' given alone, and the ones followed by a value
+GO_FLAGS = ('infinite',)
+GO_PARAMETERS = ('depth', 'movetime', 'nodes')
+# Arguments of 'position' followed by a value, the walls being followed by any number of walls
+POSITION_FIELDS = ('red', 'blue', 'redwalls', 'bluewalls', 'turn')
+
+
+# === Move Notation ===
+
+def format_move(action_type, action_value):
+    """
+    Return the text of a move: the target cell of a pawn move as 'row,col', a wall as its two ends
+    'row,col-row,col', or 'skip'.
+    """
+    if action_type == 'skip':
+        return 'skip'
+    if action_type == 'wall':
+        start, end = order_walls(action_value)
+        return f"{start[0]},{start[1]}-{end[0]},{end[1]}"
+    return f"{action_value[0]},{action_value[1]}"
+
+
+def parse_cell(text):
+    row, col = text.split(',')
+    return int(row), int(col)
+
+
+def parse_move(game_state, player, text):
+    """Return the legal (action_type, action_value) of the player written as text, or raise ValueError."""
+    legal_moves = game_state.get_legal_moves(player)
+    if text == 'skip':
+        target = ('skip', ())
+    elif '-' in text:
+        start, end = text.split('-')
+        target = ('wall', order_walls([parse_cell(start), parse_cell(end)]))
+    else:
+        cell = parse_cell(text)
+        target = next((move for move in legal_moves if move[0] != 'wall' and tuple(move[1]) == cell), None)
+    for action_type, action_value in legal_moves:
+        if target is not None and action_type == target[0] and list(action_value) == list(target[1]):
+            return action_type, action_value
+    raise ValueError(f"illegal move {text}")
+
+
+def format_score(value):
+    """Return the text of a search value, in the units of the evaluation, or 'win' or 'loss' if forced."""
+    if value == float('inf'):
+        return "win"
+    if value == float('-inf'):
+        return "loss"
+    return f"{value:.2f}"
+
+
+# === Protocol ===
+
+class EngineProtocol:
+    def __init__(self, output):
+        """
+        Line-based text protocol driving the engine from another program, in the spirit of UCI.
+        The search memory (transposition table and principal variation), the path and wall caches and the worker
+        processes of the parallel searches live as long as the process, so that they stay warm from one move to
+        the next.
+        Args:
+            output: Text file the responses are written to, flushed after every line.
+        """
+        self.output = output
+        self.output_lock = threading.Lock()
+        self.options = {'difficulty': 'hard', 'workers': 1, 'hash': 1 << 18}
+        self.memory = SearchMemory(self.options['hash'])
+        self.pool = None
+        self.search_thread = None
+        self.limits = None
+        self.set_position(GameState.new_game(), 'blue')
+
+    def send(self, line):
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self, input):
+        """
+        Handle the commands read from input until 'quit' or the end of the input. 'quit' stops the running
+        search, while at the end of the input the search is left to finish and send its bestmove.
+        """
+        for line in input:
+            if not self.handle(line):
+                self.stop_search()
+                break
+        else:
+            self.wait_search()
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def handle(self, line):
+        """Handle one command line, returning False on 'quit'."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, arguments = tokens[0], tokens[1:]
+        try:
+            if command == 'quit':
+                return False
+            elif command == 'qei':
+                self.send(f"id name {ENGINE_NAME}")
+                self.send(f"option name difficulty type combo default hard var {' var '.join(DIFFICULTY_SETTINGS)}")
+                self.send("option name workers type spin default 1")
+                self.send(f"option name hash type spin default {1 << 18}")
+                self.send("qeiok")
+            elif command == 'isready':
+                self.send("readyok")
+            elif command == 'setoption':
+                self.stop_search()
+                self.set_option(arguments)
+            elif command == 'newgame':
+                self.stop_search()
+                self.clear_memory()
+            elif command == 'position':
+                self.stop_search()
+                self.parse_position(arguments)
+            elif command == 'go':
+                self.go(arguments)
+            elif command == 'stop':
+                self.stop_search()
+            elif command == 'd':
+                self.send(f"info string {self.describe_position()}")
+            else:
+                self.send(f"info string unknown command {command}")
+        except (ValueError, IndexError, KeyError) as error:
+            self.send(f"info string error {error}")
+        return True
+
+    # === Options and Position ===
+
+    def set_option(self, arguments):
+        """Handle 'setoption name <name> value <value>'."""
+        name = arguments[arguments.index('name') + 1].lower()
+        value = arguments[arguments.index('value') + 1]
+        if name == 'difficulty':
+            if value not in DIFFICULTY_SETTINGS:
+                raise ValueError(f"unknown difficulty {value}")
+            # The table scores of the selective plies were searched under the old difficulty's policy
+            if value != self.options['difficulty']:
+                self.clear_memory()
+            self.options['difficulty'] = value
+        elif name == 'workers':
+            self.options['workers'] = max(int(value), 1)
+        elif name == 'hash':
+            self.options['hash'] = int(value)
+            self.memory = SearchMemory(self.options['hash'])
+        else:
+            raise ValueError(f"unknown option {name}")
+
+    def clear_memory(self):
+        """Forget what the searches have learnt, in this process and in the workers."""
+        self.memory.clear()
+        if self.pool is not None:
+            self.pool.new_game()
+
+    def set_position(self, game_state, turn, last_positions=None):
+        self.game_state = game_state
+        self.turn = turn
+        self.last_positions = last_positions or {}
+
+    def parse_position(self, arguments):
+        """
+        Handle 'position startpos [moves ...]' or
+        'position red <row,col> blue <row,col> [walls <wall> ...] [redwalls <n>] [bluewalls <n>]
+        [turn red|blue] [moves ...]'.
+        The position is built apart and only replaces the current one once every move has been played, so
+        that an illegal move leaves the current position unchanged.
+        """
+        if 'moves' in arguments:
+            moves = arguments[arguments.index('moves') + 1:]
+            arguments = arguments[:arguments.index('moves')]
+        else:
+            moves = []
+
+        if arguments[0] == 'startpos':
+            game_state, turn = GameState.new_game(), 'blue'
+        else:
+            fields = {}
+            walls = []
+            in_walls = False
+            tokens = iter(arguments)
+            for token in tokens:
+                # Field values are read with their field, 'turn red' must not start a red field
+                if token in POSITION_FIELDS:
+                    fields[token] = next(tokens, None)
+                    if fields[token] is None:
+                        raise ValueError(f"missing value of {token}")
+                    in_walls = False
+                elif token == 'walls':
+                    in_walls = True
+                elif in_walls:
+                    start, end = token.split('-')
+                    walls.append([parse_cell(start), parse_cell(end)])
+                else:
+                    raise ValueError(f"unknown position argument {token}")
+            turn = fields.get('turn', 'blue')
+            if turn not in ('red', 'blue'):
+                raise ValueError(f"unknown turn {turn}")
+            game_state = GameState.from_position(parse_cell(fields['red']), parse_cell(fields['blue']), walls,
+                                                 red_walls=int(fields.get('redwalls', 10)),
+                                                 blue_walls=int(fields.get('bluewalls', 10)), current_turn=turn)
+
+        last_positions = {}
+        for text in moves:
+            player = game_state.get_player_by_color(turn)
+            action_type, action_value = parse_move(game_state, player, text)
+            last_positions[turn] = (player.row, player.col)
+            play_move(game_state, action_type, action_value, player)
+            turn = game_state.get_opponent_color(turn)
+        self.set_position(game_state, turn, last_positions)
+
+    def describe_position(self):
+        red, blue = self.game_state.red_player, self.game_state.blue_player
+        walls = " ".join(format_move('wall', wall) for wall in self.game_state.placed_walls)
+        return (f"red {red.row},{red.col} blue {blue.row},{blue.col} walls {walls or '-'} "
+                f"redwalls {red.available_walls} bluewalls {blue.available_walls} turn {self.turn}")
+
+    # === Search ===
+
+    def go(self, arguments):
+        """
+        Handle 'go [depth <n>] [movetime <ms>] [nodes <n>] [infinite]': search in a background thread, sending
+        an info line after every iteration and the bestmove line at the end. Without limits, the difficulty's
+        depth and time budget are used.
+        """
+        if self.search_thread is not None and self.search_thread.is_alive():
+            self.send("info string already searching")
+            return
+        settings = DIFFICULTY_SETTINGS[self.options['difficulty']]
+        parameters = {}
+        infinite = False
+        tokens = iter(arguments)
+        for token in tokens:
+            if token in GO_FLAGS:
+                infinite = True
+            elif token in GO_PARAMETERS:
+                parameters[token] = next(tokens, None)
+                if parameters[token] is None:
+                    raise ValueError(f"missing value of {token}")
+            else:
+                raise ValueError(f"unknown go argument {token}")
+        search_depth = int(parameters.get('depth', INFINITE_DEPTH if infinite else settings['search_depth']))
+        time_budget = int(parameters['movetime']) / 1000 if 'movetime' in parameters else None
+        node_budget = int(parameters['nodes']) if 'nodes' in parameters else None
+        if not infinite and time_budget is None and node_budget is None and 'depth' not in parameters:
+            time_budget = settings['time_budget']
+
+        self.limits = SearchLimits(time_budget=time_budget, node_budget=node_budget)
+        self.search_thread = threading.Thread(target=self.search, args=(self.limits, search_depth), daemon=True)
+        self.search_thread.start()
+
+    def search(self, limits, search_depth):
+        """
+        Search the current position and send the best move, run in the search thread. If the search fails, the
+        error is reported and the first legal move is sent, so that the bestmove line always comes.
+        """
+        player = self.game_state.get_player_by_color(self.turn)
+        pv = PVTable()
+
+        def send_info(value, action_type, action_value, depth):
+            elapsed = limits.elapsed()
+            # The searches without a principal variation table only report their best move
+            line = pv.best_line
+            if not line or line[0] != (action_type, action_value):
+                line = [(action_type, action_value)] if action_value is not None else []
+            moves = " ".join(format_move(*move) for move in line) or '-'
+            self.send(f"info depth {depth} score {format_score(value)} nodes {limits.nodes} "
+                      f"time {round(elapsed * 1000)} nps {round(limits.nodes / elapsed) if elapsed else 0} pv {moves}")
+
+        try:
+            self.pool = get_search_pool(self.pool, self.options['workers'], PARALLEL_SEARCH)
+            _, action_type, action_value, _ = search_move(
+                self.game_state, player, self.options['difficulty'], search_depth, limits,
+                last_position=self.last_positions.get(self.turn), memory=self.memory,
+                search_workers=self.options['workers'], parallel_search=PARALLEL_SEARCH, on_iteration=send_info,
+                engine=DIFFICULTY_SETTINGS[self.options['difficulty']]['engine'], pool=self.pool, pv=pv)
+        except Exception as error:
+            self.send(f"info string error {error!r}")
+            action_type, action_value = self.game_state.get_legal_moves(player)[0]
+        self.send(f"bestmove {format_move(action_type, action_value)}")
+
+    def stop_search(self):
+        """Stop the running search, if any, and wait for its bestmove line."""
+        if self.search_thread is not None:
+            self.limits.stop()
+            self.wait_search()
+
+    def wait_search(self):
+        """Wait for the running search, if any, to finish and send its bestmove line."""
+        if self.search_thread is not None:
+            self.search_thread.join()
+            self.search_thread = None
@@ -0,0 +1,27 @@
+class PVTable:
+    def __init__(self):
+        """
+        Triangular principal variation table: lines[ply] is the best line found so far from the position being
+        searched at that ply. A line is only rebuilt when a move raises alpha, from the line of the ply below,
+        instead of building a move list at every node.
+        """
+        self.lines = []
+        # Line of the last completed iteration, root move first
+        self.best_line = []
+
+    def clear(self, ply):
+        """Empty the line of the ply, on entering a position."""
+        lines = self.lines
+        if ply < len(lines):
+            lines[ply] = ()
+        else:
+            lines.extend(() for _ in range(ply + 1 - len(lines)))
+
+    def update(self, ply, move):
+        """Make the move, followed by the line just searched below it, the line of the ply."""
+        lines = self.lines
+        lines[ply] = (move,) + lines[ply + 1] if ply + 1 < len(lines) else (move,)
+
+    def complete_iteration(self):
+        """Keep the root line of an iteration that finished, as the best line."""
+        self.best_line = list(self.lines[0]) if self.lines else []
@@ -0,0 +1,159 @@
+from helpers.board_helper import get_neighbours
+from helpers.lru_cache import LRUCache
+from helpers.path_helper import goal_distances
+from helpers.valid_moves_helper import get_valid_moves_helper
+
+# Results of a race position for the player to move
+DRAW = 0
+WIN = 1
+LOSS = 2
+
+# Number of solved boards kept, a 9x9 board takes about 1 MB
+RACE_CACHE_MAX_ENTRIES = 8
+
+# Solved races keyed by grid size, the goal columns and the board's wall bitmask
+race_cache = LRUCache(RACE_CACHE_MAX_ENTRIES)
+
+
+def is_race(game_state):
+    """Check if neither player has walls left, leaving a pure race to the goals on a fixed board."""
+    return game_state.red_player.available_walls == 0 and game_state.blue_player.available_walls == 0
+
+
+def state_index(grid_size, red_cell, blue_cell, color):
+    """Return the index of a race position in the tables of solve_race."""
+    return ((red_cell * grid_size * grid_size) + blue_cell) * 2 + (color == 'blue')
+
+
+def solve_race(grid_size, board, red_goal_col, blue_goal_col):
+    """
+    Solve every race position of the board by retrograde analysis: once no wall can be placed the board never
+    changes, so all pawn positions and players to move can be solved at once, jumps and blocked pawns included.
+    The red player goes to the column red_goal_col and the blue player to blue_goal_col.
+    Returns (results, plies, successors): the result for the player to move of every state_index (DRAW if
+    neither player can force a win), the plies to the end of the game with the winner as fast and the loser
+    as slow as possible, and the state_index reached by each pawn move of the position.
+    """
+    cache_key = (grid_size, red_goal_col, blue_goal_col, board.walls_key())
+    solved = race_cache.get(cache_key)
+    if solved is not None:
+        return solved
+
+    cells = grid_size * grid_size
+    blocked = board.blocked
+    # Open roads of every cell, as {direction_bit: neighbour}
+    steps = [{bit: neighbour for bit, neighbour in get_neighbours(grid_size)[cell] if not blocked[cell] & bit}
+             for cell in range(cells)]
+
+    def pawn_moves(cell, other_cell):
+        """Return the cells a pawn can move to, jumping straight over the other pawn like get_valid_moves_helper."""
+        targets = []
+        for bit, neighbour in steps[cell].items():
+            if neighbour != other_cell:
+                targets.append(neighbour)
+            elif bit in steps[other_cell]:
+                targets.append(steps[other_cell][bit])
+        return targets
+
+    states = cells * cells * 2
+    results = bytearray(states)
+    plies = [0] * states
+    successors = [()] * states
+    predecessors = [[] for _ in range(states)]
+    unresolved = [0] * states
+    queue = []
+
+    for red_cell in range(cells):
+        for blue_cell in range(cells):
+            if red_cell == blue_cell:
+                continue
+            red_won = red_cell % grid_size == red_goal_col
+            blue_won = blue_cell % grid_size == blue_goal_col
+            for color in ('red', 'blue'):
+                index = state_index(grid_size, red_cell, blue_cell, color)
+                if red_won or blue_won:
+                    # The player who just moved has reached its goal
+                    results[index] = LOSS
+                    queue.append(index)
+                    continue
+                if color == 'red':
+                    next_states = [state_index(grid_size, cell, blue_cell, 'blue')
+                                   for cell in pawn_moves(red_cell, blue_cell)]
+                    skip_state = state_index(grid_size, red_cell, blue_cell, 'blue')
+                else:
+                    next_states = [state_index(grid_size, red_cell, cell, 'red')
+                                   for cell in pawn_moves(blue_cell, red_cell)]
+                    skip_state = state_index(grid_size, red_cell, blue_cell, 'red')
+                # A pawn with no move left skips its turn
+                successors[index] = next_states or [skip_state]
+                unresolved[index] = len(successors[index])
+                for next_state in successors[index]:
+                    predecessors[next_state].append(index)
+
+    # Walk back from the finished games: a position is won if one move leads to a lost position, lost once
+    # every move leads to a won one. The queue grows while it is walked, so positions are solved by plies
+    for index in queue:
+        result = results[index]
+        for previous in predecessors[index]:
+            if results[previous] != DRAW:
+                continue
+            if result == LOSS:
+                results[previous] = WIN
+                plies[previous] = plies[index] + 1
+                queue.append(previous)
+            else:
+                unresolved[previous] -= 1
+                if not unresolved[previous]:
+                    results[previous] = LOSS
+                    plies[previous] = plies[index] + 1
+                    queue.append(previous)
+
+    solved = (results, plies, successors)
+    race_cache[cache_key] = solved
+    return solved
+
+
+def resolve_race(game_state, player):
+    """
+    Return the exact result of a race position for the player to move, without searching, as
+    (value, action_type, action_value, plies): value is inf for a forced win, -inf for a forced loss and 0 for
+    a draw, plies is the number of plies left to the end of the game.
+    The best move wins fastest, loses slowest, or keeps the draw closest to the player's goal.
+    Returns None if the game is already over or the player has no pawn move and must skip its turn, positions
+    the search handles itself.
+    """
+    grid_size = game_state.grid_size
+    red, blue = game_state.red_player, game_state.blue_player
+    results, plies, successors = solve_race(grid_size, game_state.board, red.goal_col, blue.goal_col)
+    index = state_index(grid_size, red.row * grid_size + red.col, blue.row * grid_size + blue.col, player.color)
+    # The skip state only differs by the player to move, the lowest bit of the index
+    if not successors[index] or successors[index] == [index ^ 1]:
+        return None
+    result = results[index]
+
+    def target_of(state):
+        """Return the cell the player's pawn is on in a successor state."""
+        cell_pair = state // 2
+        return cell_pair // (grid_size * grid_size) if player.color == 'red' else cell_pair % (grid_size * grid_size)
+
+    # The opponent's result after each move
+    if result == WIN:
+        best_state = min((state for state in successors[index] if results[state] == LOSS), key=plies.__getitem__)
+    elif result == LOSS:
+        best_state = max(successors[index], key=plies.__getitem__)
+    else:
+        # Among the moves keeping the draw, the one closest to the goal, ready for a mistake of the opponent
+        distances = goal_distances(player.goal_col, grid_size, game_state.board)
+        best_state = min((state for state in successors[index] if results[state] != WIN),
+                         key=lambda state: distances[target_of(state)])
+
+    opponent_player = game_state.get_player_by_color(game_state.get_opponent_color(player.color))
+    target_cell = target_of(best_state)
+    action_type, action_value = 'skip', ()
+    for direction, (row, col) in get_valid_moves_helper(player, opponent_player, grid_size, game_state.board).items():
+        if row * grid_size + col == target_cell:
+            action_type, action_value = direction, (row, col)
+            break
+
+    value = {WIN: float('inf'), LOSS: float('-inf'), DRAW: 0}[result]
+    return value, action_type, action_value, plies[index]
@@ -0,0 +1,48 @@
+class ReductionPolicy:
+    def __init__(self, wall_plies=None, lmr_min_depth=None, lmr_late_moves=6, lmr_reduction=1, futility_depth=0,
+                 futility_margin=1.0):
+        """
+        How selective the search of a difficulty is below the root.
+        Args:
+            wall_plies: {ply: (intelligent_limit, other_limit)} of the plies from the root where walls are placed:
+                the first intelligent_limit intelligent moves (pawn moves to the goal, walls on the opponent's
+                shortest path) and the first other_limit other moves, None for all of them. Only pawn moves are
+                searched at the other plies.
+            lmr_min_depth: Depth left from which late wall moves are searched lmr_reduction plies shallower with
+                a null window, and searched again at full depth only if they beat alpha. None never reduces.
+            lmr_late_moves: Number of moves of a position searched at full depth before wall moves are reduced.
+            futility_depth: Deepest depth left where walls off the opponent's shortest path are pruned when the
+                position is too far below alpha. Walls are only searched at the plies of wall_plies, so the
+                pruning only reaches deep iterations if it covers the depth left at those plies.
+            futility_margin: Value a pruned wall is assumed to gain per ply left below the first one.
+        """
+        self.wall_plies = wall_plies or {}
+        self.lmr_min_depth = lmr_min_depth
+        self.lmr_late_moves = lmr_late_moves
+        self.lmr_reduction = lmr_reduction
+        self.futility_depth = futility_depth
+        self.futility_margin = futility_margin
+
+    @property
+    def selective_plies(self):
+        """Deepest ply from the root where moves are selected differently from the plies below."""
+        return max(self.wall_plies, default=0)
+
+    def should_reduce(self, action_type, index, depth):
+        """Check if the move at index in the search order of a position depth plies from the leaves is reduced."""
+        return (action_type == 'wall' and self.lmr_min_depth is not None and depth >= self.lmr_min_depth
+                and index >= self.lmr_late_moves)
+
+
+# Policies of the difficulties: impossible places walls on the two first plies and reduces or prunes the late
+# and useless ones, hard only places walls on the opponent's path on the first ply, medium and easy never do.
+# Impossible's futility_depth covers both wall plies up to its search depth of 7: on the benchmark positions at
+# depth 6 it searches 99268 nodes instead of 105148 without futility pruning and 103577 with a depth of 2,
+# for the same moves
+REDUCTION_POLICIES = {
+    'impossible': ReductionPolicy(wall_plies={1: (None, None), 2: (10, 2)}, lmr_min_depth=3, lmr_late_moves=3,
+                                  lmr_reduction=1, futility_depth=6, futility_margin=0.5),
+    'hard': ReductionPolicy(wall_plies={1: (None, 0)}),
+    'medium': ReductionPolicy(),
+    'easy': ReductionPolicy(),
+}
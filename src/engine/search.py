@@ -0,0 +1,226 @@
+from engine.bot_helper import get_intelligent_moves, iterative_deepening
+from engine.mcts import MCTS
+from engine.move_ordering import MoveOrdering
+from engine.parallel_search import LazySMPSearch, ParallelRootSearch, SearchPool
+from engine.pv_table import PVTable
+from engine.race import is_race, resolve_race
+from engine.transposition_table import TranspositionTable
+from helpers import path_helper, wall_helpers
+from helpers.valid_moves_helper import get_valid_moves_helper
+
+# How the processes share the search: 'lazy_smp' (shared transposition table) or 'root' (split root moves)
+PARALLEL_SEARCH = 'lazy_smp'
+# Searches a difficulty can use: iterative deepening alpha-beta, or Monte Carlo tree search
+ENGINES = ('alphabeta', 'mcts')
+# Playouts of the Monte Carlo tree search per unit of search depth, when the search has no time or node budget
+DEPTH_PLAYOUTS = 1000
+
+# Search settings of each difficulty: search_depth is the deepest iteration, time_budget (seconds) and
+# node_budget cap each move, search_workers is the number of processes searching (1 until a benchmark shows a
+# gain of the parallel searches, the engine protocol's workers option overrides it), engine is one of ENGINES and
+# cache_entries bounds the path and forbidden wall caches, about 1 KB per entry each on a 9x9 grid
+DIFFICULTY_SETTINGS = {
+    'easy': {'search_depth': 5, 'time_budget': 1, 'node_budget': None, 'search_workers': 1, 'engine': 'alphabeta',
+             'cache_entries': 20000},
+    'medium': {'search_depth': 7, 'time_budget': 3, 'node_budget': None, 'search_workers': 1,
+               'engine': 'alphabeta', 'cache_entries': 20000},
+    'hard': {'search_depth': 7, 'time_budget': 6, 'node_budget': None, 'search_workers': 1, 'engine': 'alphabeta',
+             'cache_entries': 20000},
+    'impossible': {'search_depth': 7, 'time_budget': 10, 'node_budget': None,
+                   'search_workers': 1, 'engine': 'alphabeta', 'cache_entries': 20000},
+}
+
+
+class SearchMemory:
+    def __init__(self, tt_size=1 << 18):
+        """
+        What the searches of one player have learnt, kept from one move to the next of a game: the transposition
+        table, aged by a generation per search, the history of the move ordering and the principal variation of
+        the last search. When the opponent plays the predicted reply, the next search resumes at the depth the
+        last one had reached. The Monte Carlo tree search keeps its tree instead.
+        """
+        self.tt = TranspositionTable(tt_size)
+        self.ordering = MoveOrdering()
+        self.mcts = MCTS()
+        self.clear()
+
+    def clear(self):
+        """Forget everything, for a new game."""
+        self.tt.clear()
+        self.mcts.clear()
+        self.ordering = MoveOrdering()
+        self.pv = []
+        self.completed_depth = 0
+        self.expected_hash = None
+
+    def remember(self, game_state, player, pv, completed_depth):
+        """Store the principal variation of a finished search and the position it predicts for the next move."""
+        self.pv = pv
+        self.completed_depth = completed_depth
+        self.expected_hash = None
+        if len(self.pv) >= 3:
+            expected_state = game_state.copy_for_search()
+            color = player.color
+            for action_type, action_value in self.pv[:2]:
+                expected_state.apply_move_or_wall(action_type, action_value,
+                                                  expected_state.get_player_by_color(color))
+                color = expected_state.get_opponent_color(color)
+            self.expected_hash = expected_state.hash
+
+    def resume(self, game_state, root_moves):
+        """
+        Return (depth, (type, move)) searched below the position by the last search if it is the predicted one,
+        with the predicted move, or None.
+        """
+        if self.expected_hash is None or game_state.hash != self.expected_hash:
+            return None
+        depth = self.completed_depth - 2
+        if depth < 1 or self.pv[2] not in root_moves:
+            return None
+        return depth, self.pv[2]
+
+
+def get_root_moves(game_state, player, difficulty):
+    """Return the moves searched at the root for the difficulty, every valid pawn move if there is none."""
+    intelligent_moves, other_moves = get_intelligent_moves(game_state, player, game_state.grid_size,
+                                                           game_state.board, player.available_walls)
+    if difficulty == 'easy':
+        root_moves = intelligent_moves[:5]
+    elif difficulty == 'medium':
+        root_moves = intelligent_moves
+    else:
+        root_moves = intelligent_moves + other_moves
+
+    if not root_moves:
+        opponent_player = game_state.get_player_by_color(game_state.get_opponent_color(player.color))
+        valid_moves = get_valid_moves_helper(player, opponent_player, game_state.grid_size, game_state.board)
+        root_moves = list(valid_moves.items())
+    return root_moves
+
+
+def set_cache_limits(cache_entries):
+    """Bound the path and forbidden wall caches, shared by every search of the process, to cache_entries each."""
+    path_helper.cache.resize(cache_entries)
+    wall_helpers.find_forbidden_walls_cache.resize(cache_entries)
+
+
+def get_search_pool(pool, search_workers, parallel_search=PARALLEL_SEARCH):
+    """
+    Return the SearchPool a session keeps for parallel searches with search_workers processes: pool if it has the
+    right number of workers, else a new pool replacing it, which is shut down. pool is returned unchanged, None
+    included, if the search is not parallel. With 'lazy_smp' the calling thread is one of the search_workers and
+    the pool holds the helpers.
+    """
+    if search_workers <= 1:
+        return pool
+    workers = search_workers - 1 if parallel_search == 'lazy_smp' else search_workers
+    if pool is not None and pool.workers != workers:
+        pool.shutdown()
+        pool = None
+    if pool is None:
+        pool = SearchPool(workers)
+    return pool
+
+
+def default_move(root_moves):
+    """Return the move played when the search found none: the first root move, or ('skip', ()) if there is none."""
+    if not root_moves:
+        return 'skip', ()
+    return root_moves[0]
+
+
+def search_move(game_state, player, difficulty, search_depth, limits, last_position=None, tt=None,
+                search_workers=1, parallel_search=PARALLEL_SEARCH, on_iteration=None, memory=None,
+                engine='alphabeta', pool=None, pv=None):
+    """
+    Search the best move of the player, with no interface involved.
+    Returns (best_value, best_type, best_move, completed_depth). When the search found no move, the first root
+    move is played, or ('skip', ()) if there is no root move.
+    Args:
+        game_state: Position to search, left unchanged.
+        player: Player to move.
+        search_depth: Deepest iteration of the iterative deepening. The Monte Carlo tree search runs
+            search_depth * DEPTH_PLAYOUTS playouts instead when limits have neither a time nor a node budget.
+        limits: SearchLimits of the move.
+        last_position: Cell the player comes from, moving back there is penalized.
+        tt: Transposition table of the single process search.
+        search_workers: Number of processes searching, 1 searches in the calling thread only.
+        parallel_search: With 'root', the root moves are spread over the processes, with 'lazy_smp' helper
+            processes share a transposition table with the calling thread.
+        on_iteration: Called with (best_value, best_type, best_move, completed_depth) after every iteration.
+        memory: SearchMemory of the player, kept for the whole game. Its transposition table replaces tt and the
+            search resumes from the last one when the opponent played the predicted reply. The Monte Carlo tree
+            search reuses its tree.
+        engine: 'alphabeta' for the iterative deepening alpha-beta search, 'mcts' for the Monte Carlo tree
+            search, which runs in the calling thread only and ignores last_position, tt and search_workers.
+        pool: SearchPool of the session from get_search_pool, kept warm from one move to the next. Without it,
+            a parallel search starts processes for this move only.
+        pv: PVTable of the single process alpha-beta search, whose best_line is the principal variation of the
+            last completed iteration when on_iteration is called. A new one if not given.
+    When neither player has walls left, the race is solved exactly instead of searched and completed_depth is the
+    number of plies to the end of the game, 0 for a draw, unless the game is over or the player must skip.
+    The path and forbidden wall caches are resized to the difficulty's cache_entries first.
+    """
+    set_cache_limits(DIFFICULTY_SETTINGS[difficulty]['cache_entries'])
+    race = resolve_race(game_state, player) if is_race(game_state) else None
+    if race is not None:
+        best_value, best_type, best_move, plies = race
+        if on_iteration is not None:
+            on_iteration(best_value, best_type, best_move, plies)
+        if memory is not None:
+            memory.remember(game_state, player, [(best_type, best_move)], plies)
+        return best_value, best_type, best_move, plies
+
+    root_moves = get_root_moves(game_state, player, difficulty)
+    if engine == 'mcts':
+        mcts = memory.mcts if memory is not None else MCTS()
+        max_playouts = None
+        if limits.deadline is None and limits.node_budget is None:
+            max_playouts = search_depth * DEPTH_PLAYOUTS
+        best_value, best_type, best_move, completed_depth = mcts.search(
+            game_state, player, root_moves, limits, max_playouts=max_playouts, on_iteration=on_iteration)
+        if not best_move:
+            best_type, best_move = default_move(root_moves)
+        return best_value, best_type, best_move, completed_depth
+
+    resumed = None
+    ordering = None
+    if memory is not None:
+        tt = memory.tt
+        tt.new_search()
+        ordering = memory.ordering
+        ordering.new_search()
+        if search_workers <= 1:
+            resumed = memory.resume(game_state, root_moves)
+
+    if search_workers > 1:
+        move_pool = get_search_pool(None, search_workers, parallel_search) if pool is None else pool
+        try:
+            if parallel_search == 'lazy_smp':
+                parallel = LazySMPSearch(move_pool, game_state, player, difficulty, last_position=last_position)
+            else:
+                parallel = ParallelRootSearch(move_pool, game_state, player, difficulty, last_position=last_position)
+            best_value, best_type, best_move, completed_depth = parallel.iterative_deepening(
+                root_moves, search_depth, limits, on_iteration=on_iteration)
+        finally:
+            if pool is None:
+                move_pool.shutdown()
+    else:
+        start_depth = min(resumed[0], search_depth) if resumed else 1
+        pv_table = pv if pv is not None else PVTable()
+        best_value, best_type, best_move, completed_depth = iterative_deepening(
+            game_state, root_moves, search_depth, player, difficulty, limits, last_position=last_position, tt=tt,
+            on_iteration=on_iteration, start_depth=start_depth, ordering=ordering, pv=pv_table)
+        pv = pv_table.best_line
+        if not best_move and resumed:
+            # No iteration finished, the move predicted by the last search is the best one known
+            completed_depth, (best_type, best_move) = resumed
+            pv = memory.pv[2:]
+
+    if memory is not None and best_move:
+        memory.remember(game_state, player, pv if search_workers <= 1 else [(best_type, best_move)], completed_depth)
+
+    # Force a move if no best move was found
+    if not best_move:
+        best_type, best_move = default_move(root_moves)
+    return best_value, best_type, best_move, completed_depth
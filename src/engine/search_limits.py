@@ -0,0 +1,48 @@
+import time
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time or node budget has run out."""
+
+
+class SearchLimits:
+    def __init__(self, time_budget=None, node_budget=None, deadline=None, stop_flag=None):
+        """
+        Per-move budget shared by every node of a search.
+        Args:
+            time_budget: Seconds the search may run for, or None for no limit.
+            node_budget: Number of nodes the search may examine, or None for no limit.
+            deadline: time.time() at which the search must stop, used instead of time_budget when given.
+            stop_flag: Shared value whose value is set to stop the searches of every process at once, or None.
+        """
+        self.start_time = time.time()
+        if deadline is None and time_budget:
+            deadline = self.start_time + time_budget
+        self.deadline = deadline
+        self.node_budget = node_budget
+        self.nodes = 0
+        self.stopped = False
+        self.stop_flag = stop_flag
+
+    def count_node(self):
+        """Count a node and abort the search if a budget has been exceeded."""
+        self.nodes += 1
+        if self.stopped or (self.stop_flag is not None and self.stop_flag.value):
+            raise SearchTimeout()
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            raise SearchTimeout()
+        if self.deadline is not None and time.time() > self.deadline:
+            raise SearchTimeout()
+
+    def stop(self):
+        """Abort the search at the next node."""
+        self.stopped = True
+
+    def remaining_nodes(self):
+        """Return the number of nodes left in the node budget, or None for no limit."""
+        if self.node_budget is None:
+            return None
+        return max(self.node_budget - self.nodes, 0)
+
+    def elapsed(self):
+        return time.time() - self.start_time
@@ -0,0 +1,189 @@
+from multiprocessing import shared_memory
+
+from helpers.board_helper import get_wall_slots
+
+# Bound types of a stored score
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class TranspositionTable:
+    def __init__(self, size=1 << 18):
+        """
+        Fixed-size table of search results keyed by the Zobrist hash of the position.
+        Entries live in buckets of two slots; a new entry replaces the entry of an older search first, then the
+        shallower of the two, so the table can be kept from one move to the next.
+        Args:
+            size: Number of slots, rounded down to a power of two.
+        """
+        self.size = 1 << (max(size, 2).bit_length() - 1)
+        self.mask = (self.size - 1) & ~1
+        self.entries = [None] * self.size
+        # Number of the current search, stored in the entries to age them
+        self.generation = 0
+
+    def new_search(self):
+        """Start a new search: the entries stored so far stay valid but are the first to be replaced."""
+        self.generation += 1
+
+    def probe(self, key):
+        """Return the (key, depth, flag, score, best_move, generation) entry for the key, or None."""
+        index = key & self.mask
+        entry = self.entries[index]
+        if entry is not None and entry[0] == key:
+            return entry
+        entry = self.entries[index + 1]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, flag, score, best_move):
+        """Store a search result, replacing the same position or the shallower entry of the bucket."""
+        index = key & self.mask
+        first = self.entries[index]
+        second = self.entries[index + 1]
+
+        if first is not None and first[0] == key:
+            target = index
+        elif second is not None and second[0] == key:
+            target = index + 1
+        elif first is None:
+            target = index
+        elif second is None:
+            target = index + 1
+        elif first[5] != second[5]:
+            target = index if first[5] < second[5] else index + 1
+        else:
+            target = index if first[1] <= second[1] else index + 1
+
+        self.entries[target] = (key, depth, flag, score, best_move, self.generation)
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.generation = 0
+
+
+# Words of a shared table entry: key ^ info ^ score bits, info (depth, flag, generation and best move), score
+ENTRY_WORDS = 3
+# Generations told apart by a shared table entry, older ones wrap around
+GENERATIONS = 256
+# Action types of the moves stored in a shared table entry
+MOVE_TYPES = ('up', 'down', 'left', 'right', 'skip', 'wall')
+
+
+class SharedTranspositionTable:
+    def __init__(self, grid_size, size=1 << 18, name=None):
+        """
+        Transposition table in shared memory that several search processes read and write without locks.
+        It has the same buckets and replacement policy as TranspositionTable. An entry is stored as three
+        64-bit words: the key XORed with the other two, the packed depth, flag, generation and best move, and
+        the score. An entry whose words do not XOR back to the probed key is either another position or was
+        torn by a concurrent write, and is treated as missing.
+        The table is sent to other processes by pickling, which attaches them to the same memory. The generation
+        is kept by each process: the helpers of a search are given the generation of the searching thread.
+        Args:
+            grid_size: Number of cells per side, used to pack the best moves.
+            size: Number of slots, rounded down to a power of two.
+            name: Name of the shared memory block to attach to, or None to create a new one.
+        """
+        self.grid_size = grid_size
+        self.size = 1 << (max(size, 2).bit_length() - 1)
+        self.mask = (self.size - 1) & ~1
+        self.slots = get_wall_slots(grid_size)
+        # Room left for the target of a move, a cell index for pawn moves or a slot for walls
+        self.move_stride = max(grid_size * grid_size, len(self.slots.walls))
+        # Number of the current search modulo GENERATIONS, stored in the entries to age them
+        self.generation = 0
+
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=self.size * ENTRY_WORDS * 8)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        # Integer and float views of the same words, the score is stored as a float and XORed as an integer
+        self.words = self.memory.buf.cast('Q')
+        self.scores = self.memory.buf.cast('d')
+
+    def __getstate__(self):
+        return self.grid_size, self.size, self.memory.name
+
+    def __setstate__(self, state):
+        grid_size, size, name = state
+        self.__init__(grid_size, size, name)
+
+    def new_search(self):
+        """Start a new search: the entries stored so far stay valid but are the first to be replaced."""
+        self.generation = (self.generation + 1) % GENERATIONS
+
+    def probe(self, key):
+        """Return the (key, depth, flag, score, best_move, generation) entry for the key, or None."""
+        words = self.words
+        first = (key & self.mask) * ENTRY_WORDS
+        for base in (first, first + ENTRY_WORDS):
+            info = words[base + 1]
+            if info and words[base] ^ info ^ words[base + 2] == key:
+                return (key, info & 0xFF, info >> 8 & 3, self.scores[base + 2], self.decode_move(info >> 18),
+                        info >> 10 & 0xFF)
+        return None
+
+    def store(self, key, depth, flag, score, best_move):
+        """Store a search result, replacing the same position or the shallower entry of the bucket."""
+        words = self.words
+        first = (key & self.mask) * ENTRY_WORDS
+        second = first + ENTRY_WORDS
+        first_info, second_info = words[first + 1], words[second + 1]
+
+        if first_info and words[first] ^ first_info ^ words[first + 2] == key:
+            base = first
+        elif second_info and words[second] ^ second_info ^ words[second + 2] == key:
+            base = second
+        elif not first_info:
+            base = first
+        elif not second_info:
+            base = second
+        elif first_info >> 10 & 0xFF != second_info >> 10 & 0xFF:
+            # The entry of the older search, counting the searches since each was stored
+            first_age = (self.generation - (first_info >> 10 & 0xFF)) % GENERATIONS
+            second_age = (self.generation - (second_info >> 10 & 0xFF)) % GENERATIONS
+            base = first if first_age > second_age else second
+        else:
+            base = first if first_info & 0xFF <= second_info & 0xFF else second
+
+        info = depth | flag << 8 | self.generation << 10 | self.encode_move(best_move) << 18
+        self.scores[base + 2] = score
+        words[base + 1] = info
+        words[base] = key ^ info ^ words[base + 2]
+
+    def encode_move(self, move):
+        """Pack an (action_type, action_value) move into an integer, 0 for no move."""
+        if move is None:
+            return 0
+        type, value = move
+        if type == 'wall':
+            target = self.slots.slot_of(value)
+        else:
+            target = value[0] * self.grid_size + value[1]
+        return 1 + MOVE_TYPES.index(type) * self.move_stride + target
+
+    def decode_move(self, code):
+        """Unpack a move packed by encode_move."""
+        if not code:
+            return None
+        type_index, target = divmod(code - 1, self.move_stride)
+        type = MOVE_TYPES[type_index]
+        if type == 'wall':
+            return type, self.slots.walls[target]
+        return type, divmod(target, self.grid_size)
+
+    def clear(self):
+        self.memory.buf[:] = bytes(self.size * ENTRY_WORDS * 8)
+        self.generation = 0
+
+    def close(self):
+        """Detach from the shared memory, and free it if this table created it."""
+        self.words.release()
+        self.scores.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
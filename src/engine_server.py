@@ -0,0 +1,38 @@
+"""
+Long-lived engine process speaking a line-based text protocol over stdin and stdout, so that GUIs, arenas and
+scripts can drive the engine while its transposition table and caches stay warm between moves.
+
+Commands:
+    qei                          identify the engine and its options, answered by 'qeiok'
+    isready                      answered by 'readyok'
+    setoption name <name> value <value>
+                                 difficulty (easy, medium, hard, impossible), workers, hash (table slots)
+    newgame                      clear the transposition table and principal variation
+    position startpos [moves <move> ...]
+    position red <row,col> blue <row,col> [walls <wall> ...] [redwalls <n>] [bluewalls <n>] [turn red|blue]
+             [moves <move> ...]
+    go [depth <n>] [movetime <ms>] [nodes <n>] [infinite]
+                                 search, sending 'info depth .. score .. nodes .. time .. nps .. pv ..' lines
+                                 and finally 'bestmove <move>'
+    stop                         stop the search, which sends its bestmove
+    d                            print the current position
+    quit
+
+Moves are the target cell of a pawn move 'row,col', a wall as its two ends 'row,col-row,col', or 'skip'.
+
+At the end of the input the engine lets the running search finish, while 'quit' stops it at once.
+
+Example, from the src directory:
+    printf 'position startpos moves 4,1\\ngo depth 3\\n' | python engine_server.py
+"""
+import sys
+
+from engine.protocol import EngineProtocol
+
+
+def main():
+    EngineProtocol(sys.stdout).run(sys.stdin)
+
+
+if __name__ == '__main__':
+    main()
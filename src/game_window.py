@@ -5,6 +5,7 @@ from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import QApplication, QGraphicsView, QMainWindow, QWidget, QHBoxLayout
 
 from bot.bot import Bot
+from bot.bot_worker import BotWorker
 from helpers.path_helper import clear_cache
 from helpers.resource_helper import resource_path
 from ui.layouts import create_start_buttons_layout, create_game_items_layout, create_win_buttons_layout, \
@@ -65,6 +66,11 @@ class GameWindow(QMainWindow):
         self.layout.addWidget(self.win_buttons_container)
         self.win_buttons_container.hide()
 
+        # Thread searching the bots' moves, kept warm for the whole session
+        self.bot_worker = BotWorker()
+        self.bot_worker.move_computed.connect(self.handle_bot_move)
+        self.bot_worker.start()
+
         # Initialize players to None
         self.blue_player = None
         self.red_player = None
@@ -95,6 +101,8 @@ class GameWindow(QMainWindow):
 
     def start_game(self, vs_bot=False,difficulty=None):
         """Start or Restart the game with the option to play vs a bot."""
+        # Drop the search of the previous game, if any
+        self.bot_worker.new_game()
         # Remove the current scene and create a new one
         self.scene = GridScene(game=self)
         self.view.setScene(self.scene)
@@ -191,11 +199,10 @@ class GameWindow(QMainWindow):
 
     def end_game(self):
         """End the game and show the start buttons."""
-        bot_worker = getattr(self.turn_manager.red_player, 'bot_worker', None)
-        if bot_worker and bot_worker.isRunning():
-            print("Stopping bot worker")
-            bot_worker.stop()
-            bot_worker.wait()
+        self.bot_worker.new_game()
+        # Moves already computed for the bots of this game are dropped by handle_bot_move
+        self.red_player = None
+        self.blue_player = None
         self.vs_bot = False
         self.difficulty=None
         self.difficulty_buttons_container.hide()
@@ -206,6 +213,17 @@ class GameWindow(QMainWindow):
         self.view.setScene(self.scene)
         self.view.setStyleSheet("")
 
+    def handle_bot_move(self, bot, best_type, best_move):
+        """Hand a computed move to the bot it was searched for, unless that bot's game is over."""
+        if bot is self.red_player or bot is self.blue_player:
+            bot.handle_computed_move(best_type, best_move)
+
+    def closeEvent(self, event):
+        """Stop the bot worker, and the processes of its parallel searches, before the window closes."""
+        self.bot_worker.stop()
+        self.bot_worker.wait()
+        super().closeEvent(event)
+
     def win_game(self, player):
         """End the game and show the start buttons."""
         self.game_items_container.hide()
@@ -0,0 +1,274 @@
+# Bits of the per-cell blocked-direction masks
+UP = 1
+DOWN = 2
+LEFT = 4
+RIGHT = 8
+
+# (row_change, col_change) of each direction bit and the bit seen from the neighbour
+DIRECTION_BITS = {
+    (-1, 0): UP,
+    (1, 0): DOWN,
+    (0, -1): LEFT,
+    (0, 1): RIGHT,
+}
+OPPOSITE_BITS = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+# Neighbour tables and wall slot tables per grid size, see get_neighbours and get_wall_slots
+_neighbours_cache = {}
+_wall_slots_cache = {}
+
+
+def get_neighbours(grid_size):
+    """
+    Return, for every cell index (row * grid_size + col), the list of (direction_bit, neighbour_index)
+    of the cells next to it inside the grid.
+    """
+    neighbours = _neighbours_cache.get(grid_size)
+    if neighbours is None:
+        neighbours = []
+        for row in range(grid_size):
+            for col in range(grid_size):
+                cell_neighbours = []
+                for (drow, dcol), bit in DIRECTION_BITS.items():
+                    new_row, new_col = row + drow, col + dcol
+                    if 0 <= new_row < grid_size and 0 <= new_col < grid_size:
+                        cell_neighbours.append((bit, new_row * grid_size + new_col))
+                neighbours.append(cell_neighbours)
+        _neighbours_cache[grid_size] = neighbours
+    return neighbours
+
+
+def get_wall_slots(grid_size):
+    """Return the shared WallSlots table of a grid size."""
+    wall_slots = _wall_slots_cache.get(grid_size)
+    if wall_slots is None:
+        wall_slots = WallSlots(grid_size)
+        _wall_slots_cache[grid_size] = wall_slots
+    return wall_slots
+
+
+class WallSlots:
+    def __init__(self, grid_size):
+        """
+        Precomputed table of every wall that can be placed on the grid, (grid_size - 1)^2 horizontal and as many
+        vertical ones. Slots are numbered in row, column, horizontal-then-vertical order, so walking the set
+        bits of a slot mask from the lowest gives the walls in grid scan order.
+        For every slot it stores the ordered wall, the two roads it blocks as (cell, bit, neighbour_cell,
+        neighbour_bit), the conflict mask of the slots it overlaps or crosses, itself included, and the mask
+        of the three grid corners it touches (corner index row * (grid_size + 1) + col).
+        """
+        self.grid_size = grid_size
+        self.walls = []
+        self.index = {}
+        self.roads = []
+        self.conflicts = []
+        self.points = []
+
+        corner_slots = {}
+        for row in range(grid_size):
+            for col in range(grid_size):
+                # Horizontal wall, blocks moving down from the two cells above it
+                if 1 <= row < grid_size and col < grid_size - 1:
+                    top_cell = (row - 1) * grid_size + col
+                    corner_slots[(row, col + 1, True)] = len(self.walls)
+                    self._add_slot([(row, col), (row, col + 2)],
+                                   ((top_cell, DOWN, top_cell + grid_size, UP),
+                                    (top_cell + 1, DOWN, top_cell + 1 + grid_size, UP)))
+                # Vertical wall, blocks moving right from the two cells on its left
+                if 1 <= col < grid_size and row < grid_size - 1:
+                    left_cell = row * grid_size + col - 1
+                    corner_slots[(row + 1, col, False)] = len(self.walls)
+                    self._add_slot([(row, col), (row + 2, col)],
+                                   ((left_cell, RIGHT, left_cell + 1, LEFT),
+                                    (left_cell + grid_size, RIGHT, left_cell + grid_size + 1, LEFT)))
+
+        # A wall conflicts with the walls sharing its middle corner and the walls of the same
+        # orientation whose middle is one corner away along it
+        for (row, col, is_horizontal), slot in corner_slots.items():
+            if is_horizontal:
+                neighbours = [(row, col, False), (row, col - 1, True), (row, col + 1, True)]
+            else:
+                neighbours = [(row, col, True), (row - 1, col, False), (row + 1, col, False)]
+            conflicts = 1 << slot
+            for neighbour in neighbours:
+                if neighbour in corner_slots:
+                    conflicts |= 1 << corner_slots[neighbour]
+            self.conflicts[slot] = conflicts
+
+        self.all_slots = (1 << len(self.walls)) - 1
+
+        # Corners on the grid border, and the slots touching each corner
+        corners_per_side = grid_size + 1
+        self.border_points = 0
+        for row in range(corners_per_side):
+            for col in range(corners_per_side):
+                if row in (0, grid_size) or col in (0, grid_size):
+                    self.border_points |= 1 << (row * corners_per_side + col)
+        self.slots_at_point = [0] * (corners_per_side * corners_per_side)
+        for slot, points in enumerate(self.points):
+            while points:
+                lowest = points & -points
+                self.slots_at_point[lowest.bit_length() - 1] |= 1 << slot
+                points ^= lowest
+
+    def _add_slot(self, wall, roads):
+        self.index[(wall[0], wall[1])] = len(self.walls)
+        self.walls.append(wall)
+        self.roads.append(roads)
+        self.conflicts.append(0)
+
+        (row1, col1), (row2, col2) = wall
+        corners_per_side = self.grid_size + 1
+        points = 0
+        for row, col in ((row1, col1), ((row1 + row2) // 2, (col1 + col2) // 2), (row2, col2)):
+            points |= 1 << (row * corners_per_side + col)
+        self.points.append(points)
+
+    def slot_of(self, wall):
+        """Return the slot of a wall given as [(row, col), (row, col)] in any order, or None if it cannot be placed."""
+        start, end = tuple(wall[0]), tuple(wall[1])
+        if start > end:
+            start, end = end, start
+        return self.index.get((start, end))
+
+    def mask_of(self, walls):
+        """Return the slot mask of a list of walls, ignoring walls that cannot be placed."""
+        mask = 0
+        for wall in walls:
+            slot = self.slot_of(wall)
+            if slot is not None:
+                mask |= 1 << slot
+        return mask
+
+    def walls_of(self, mask):
+        """Return the walls of a slot mask in slot order."""
+        walls = []
+        while mask:
+            lowest = mask & -mask
+            walls.append(self.walls[lowest.bit_length() - 1])
+            mask ^= lowest
+        return walls
+
+
+class Board:
+    def __init__(self, grid_size, placed_walls=()):
+        """
+        Integer-bitmask view of the walls on the grid, indexed by the WallSlots table of the grid size.
+        walls has the bit of every placed wall, free_walls the bit of every slot that does not overlap or
+        cross a placed wall, and blocked holds, for every cell index, the UP/DOWN/LEFT/RIGHT bits of the
+        roads leaving that cell that are blocked by a wall.
+        Args:
+            grid_size: Number of cells per side.
+            placed_walls: Walls to place on the board, as [(row, col), (row, col)].
+        """
+        self.grid_size = grid_size
+        self.slots = get_wall_slots(grid_size)
+        self.walls = 0
+        self.free_walls = self.slots.all_slots
+        self.blocked = [0] * (grid_size * grid_size)
+        for wall in placed_walls:
+            self.add_wall(wall)
+
+    # === Wall Slots ===
+
+    def wall_slot(self, wall):
+        """Return the slot of a wall, or None if the wall lies on the border or outside the grid."""
+        return self.slots.slot_of(wall)
+
+    def has_wall(self, wall):
+        """Check if a wall has been placed in this exact position."""
+        slot = self.slots.slot_of(wall)
+        return slot is not None and bool(self.walls >> slot & 1)
+
+    def is_free(self, wall):
+        """Check if a wall fits inside the grid without overlapping or crossing a placed wall."""
+        slot = self.slots.slot_of(wall)
+        return slot is not None and bool(self.free_walls >> slot & 1)
+
+    def overlaps_roads(self, wall):
+        """Check if any of the roads of a wall is already blocked."""
+        blocked = self.blocked
+        return any(blocked[cell] & bit for cell, bit, _, _ in self.slots.roads[self.slots.slot_of(wall)])
+
+    def add_wall(self, wall):
+        """Place a wall inside the grid, blocking its two roads in both directions."""
+        slot = self.slots.slot_of(wall)
+        self.walls |= 1 << slot
+        self.free_walls &= ~self.slots.conflicts[slot]
+        blocked = self.blocked
+        for cell, bit, neighbour_cell, neighbour_bit in self.slots.roads[slot]:
+            blocked[cell] |= bit
+            blocked[neighbour_cell] |= neighbour_bit
+
+    def remove_wall(self, wall):
+        """Remove a wall placed with add_wall."""
+        slot = self.slots.slot_of(wall)
+        self.walls &= ~(1 << slot)
+        blocked = self.blocked
+        for cell, bit, neighbour_cell, neighbour_bit in self.slots.roads[slot]:
+            blocked[cell] &= ~bit
+            blocked[neighbour_cell] &= ~neighbour_bit
+
+        # Slots may conflict with several placed walls, so rebuild the free slots from the walls left
+        conflicts = self.slots.conflicts
+        free_walls = self.slots.all_slots
+        walls = self.walls
+        while walls:
+            lowest = walls & -walls
+            free_walls &= ~conflicts[lowest.bit_length() - 1]
+            walls ^= lowest
+        self.free_walls = free_walls
+
+    def slots_touching_group(self, wall):
+        """
+        Return the mask of the slots touching the group of placed walls connected to a wall through shared
+        corners, the grid border counting as a single wall.
+        """
+        slots = self.slots
+        points = slots.points
+        group_points = points[slots.slot_of(wall)]
+        remaining = self.walls
+        grown = True
+        while grown:
+            grown = False
+            if group_points & slots.border_points:
+                group_points |= slots.border_points
+            walls = remaining
+            while walls:
+                lowest = walls & -walls
+                slot = lowest.bit_length() - 1
+                if points[slot] & group_points:
+                    group_points |= points[slot]
+                    remaining ^= lowest
+                    grown = True
+                walls ^= lowest
+
+        touching = 0
+        slots_at_point = slots.slots_at_point
+        while group_points:
+            lowest = group_points & -group_points
+            touching |= slots_at_point[lowest.bit_length() - 1]
+            group_points ^= lowest
+        return touching
+
+    # === Roads ===
+
+    def is_blocked(self, pos1, pos2):
+        """Check if the road between two adjacent cells is blocked by a wall. Non-adjacent cells are never blocked."""
+        bit = DIRECTION_BITS.get((pos2[0] - pos1[0], pos2[1] - pos1[1]))
+        if bit is None:
+            return False
+        return bool(self.blocked[pos1[0] * self.grid_size + pos1[1]] & bit)
+
+    def walls_key(self):
+        """Return a single integer identifying the set of placed walls, usable as a cache key."""
+        return self.walls
+
+    def copy(self):
+        board_copy = Board.__new__(Board)
+        board_copy.grid_size = self.grid_size
+        board_copy.slots = self.slots
+        board_copy.walls = self.walls
+        board_copy.free_walls = self.free_walls
+        board_copy.blocked = self.blocked.copy()
+        return board_copy
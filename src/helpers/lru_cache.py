@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, max_entries):
+        """
+        Bounded cache that evicts the least recently used entry once it holds max_entries entries.
+        Keeps hit, miss and eviction counters so the usefulness of the cache can be checked, see stats.
+        Args:
+            max_entries: Number of entries the cache may hold, which bounds its memory use.
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return the value stored for the key and mark it as recently used, or default if it is not cached."""
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        return default
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __setitem__(self, key, value):
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+        entries[key] = value
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self.entries)
+
+    def resize(self, max_entries):
+        """Change the number of entries the cache may hold, evicting the least recently used ones if it shrinks."""
+        self.max_entries = max_entries
+        self.trim(max_entries)
+
+    def trim(self, max_entries):
+        """Evict the least recently used entries until at most max_entries are left."""
+        entries = self.entries
+        while len(entries) > max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove every entry, keeping the counters."""
+        self.entries.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """Return the size, hit, miss and eviction counts and the hit rate of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
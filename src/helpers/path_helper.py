@@ -1,183 +1,162 @@
-from collections import deque
+import heapq
 
-# Global cache dictionary
-cache = {}
+from helpers.board_helper import DOWN, LEFT, RIGHT, UP, get_neighbours
+from helpers.lru_cache import LRUCache
 
-def bfs_pathfinder(start, goal_col, grid_size, blocked_roads):
+# Number of results the global cache keeps until resized, a goal distance list of a 9x9 grid takes about 1 KB
+CACHE_MAX_ENTRIES = 20000
+# Share of the cache's entries clear_cache keeps between games
+CACHE_KEPT_FRACTION = 0.05
+
+# Global cache of the results, keyed by the grid size and the board's wall bitmask
+cache = LRUCache(CACHE_MAX_ENTRIES)
+
+def goal_distances(goal_col, grid_size, board):
     """
-    Perform a BFS to find the shortest path to the goal column.
-    This version includes a cache mechanism to avoid recalculating previously analyzed paths.
+    Perform a multi-source BFS backwards from every cell of the goal column.
+    Returns a flat list indexed by cell (row * grid_size + col) with the number of steps from that cell
+    to the goal column, or None if the goal cannot be reached from it.
+    The distances only depend on the walls, so the same list serves every pawn position.
     """
 
-    # Convert blocked_roads to a tuple of tuples to make it hashable
-    blocked_roads_tuple = tuple(tuple(sorted(road)) for road in blocked_roads)
-
     # Create a cache key that uniquely identifies the scenario
-    cache_key = (start, goal_col, blocked_roads_tuple)
-
-    # Check if the path has already been analyzed and is in the cache
-    if cache_key in cache:
-        return cache[cache_key]['path']
-
-    # Initialize BFS with starting position
-    queue = deque([(start, [])])
-    visited = {start}
-
-    # Preprocess blocked roads for faster lookup
-    blocked_set = set()
-    for road in blocked_roads:
-        blocked_set.add(frozenset(road))
-
-    # Direction vectors for up, down, left, right
-    directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]  # (row_change, col_change)
-
+    cache_key = ('distances', grid_size, goal_col, board.walls_key())
+
+    # Check if the distances have already been computed and are in the cache
+    distances = cache.get(cache_key)
+    if distances is not None:
+        return distances
+
+    distances = [None] * (grid_size * grid_size)
+    queue = []
+    for row in range(grid_size):
+        goal_cell = row * grid_size + goal_col
+        distances[goal_cell] = 0
+        queue.append(goal_cell)
+
+    blocked = board.blocked
+    neighbours = get_neighbours(grid_size)
+
+    # The queue grows while it is walked, which makes the loop a BFS
+    for cell in queue:
+        next_distance = distances[cell] + 1
+        blocked_directions = blocked[cell]
+        for bit, neighbour in neighbours[cell]:
+            if not blocked_directions & bit and distances[neighbour] is None:
+                distances[neighbour] = next_distance
+                queue.append(neighbour)
+
+    cache[cache_key] = distances
+    return distances
+
+def repair_goal_distances(distances, grid_size, board, wall):
+    """
+    Return the goal distances once wall has been added to the board, given the distances before it.
+    Instead of a new BFS, only the cells whose distance grows are searched again: the cells that relied on
+    a blocked road and every cell left with no neighbor one step closer to the goal outside of them.
+    Cells that can no longer reach the goal get None. The given list is never modified.
+    """
+    slots = board.slots
+    blocked = board.blocked
+    neighbours = get_neighbours(grid_size)
+
+    # Cells one step further from the goal than the cell on the other side of a blocked road
+    queue = []
+    for cell, _, neighbour_cell, _ in slots.roads[slots.slot_of(wall)]:
+        cell_distance, neighbour_distance = distances[cell], distances[neighbour_cell]
+        if cell_distance is None or neighbour_distance is None:
+            continue
+        if cell_distance == neighbour_distance + 1:
+            heapq.heappush(queue, (cell_distance, cell))
+        elif neighbour_distance == cell_distance + 1:
+            heapq.heappush(queue, (neighbour_distance, neighbour_cell))
+
+    # The wall only blocked roads along which the distance does not change
+    if not queue:
+        return distances
+
+    # Find the affected cells by increasing distance, so every possible support of a cell is settled first
+    affected = set()
     while queue:
-        (current_row, current_col), path = queue.popleft()
-
-        # Check if we've reached the goal column
-        if current_col == goal_col:
-            # Save the result in the cache
-            cached_path = path + [(current_row, current_col)]
-            cache[cache_key] = {'exists': True, 'path': cached_path}
-            return cached_path  # Return the shortest path
-
-        # Explore neighbors
-        for drow, dcol in directions:
-            new_row, new_col = current_row + drow, current_col + dcol
-            new_position = (new_row, new_col)
-
-            # Check if the new position is within the grid bounds
-            if 0 <= new_row < grid_size and 0 <= new_col < grid_size:
-                # Check if the path between current and new positions is not blocked
-                edge = frozenset([(current_row, current_col), new_position])
-                if edge not in blocked_set:
-                    if new_position not in visited:
-                        visited.add(new_position)
-                        queue.append((new_position, path + [(current_row, current_col)]))
-
-    # If no path found, save the result in cache
-    cache[cache_key] = {'exists': False, 'path': None}
-    return None  # No path found
-
-def dfs_path_exists(start, goal_col, grid_size, blocked_roads):
+        distance, cell = heapq.heappop(queue)
+        if cell in affected:
+            continue
+        blocked_directions = blocked[cell]
+        if any(not blocked_directions & bit and distances[neighbour] == distance - 1 and neighbour not in affected
+               for bit, neighbour in neighbours[cell]):
+            continue
+        affected.add(cell)
+        for bit, neighbour in neighbours[cell]:
+            if not blocked_directions & bit and distances[neighbour] == distance + 1:
+                heapq.heappush(queue, (distance + 1, neighbour))
+
+    # Search the affected cells again, starting from the distances of the cells around them
+    new_distances = distances.copy()
+    for cell in affected:
+        new_distances[cell] = None
+    for cell in affected:
+        blocked_directions = blocked[cell]
+        for bit, neighbour in neighbours[cell]:
+            if not blocked_directions & bit and neighbour not in affected and new_distances[neighbour] is not None:
+                heapq.heappush(queue, (new_distances[neighbour] + 1, cell))
+    while queue:
+        distance, cell = heapq.heappop(queue)
+        if new_distances[cell] is not None:
+            continue
+        new_distances[cell] = distance
+        blocked_directions = blocked[cell]
+        for bit, neighbour in neighbours[cell]:
+            if not blocked_directions & bit and neighbour in affected and new_distances[neighbour] is None:
+                heapq.heappush(queue, (distance + 1, neighbour))
+
+    return new_distances
+
+def carry_goal_distances(goal_col, grid_size, board, wall, previous_walls_key):
     """
-    Perform a DFS to check if a path exists to the goal column.
-    This version includes a cache mechanism to avoid recalculating previously analyzed paths.
+    Cache the goal distances of the board, which has just received wall, by repairing the cached
+    distances of the walls it had before (previous_walls_key). Does nothing if those are not cached.
     """
-
-    # Convert blocked_roads to a tuple of tuples to make it hashable
-    blocked_roads_tuple = tuple(tuple(sorted(road)) for road in blocked_roads)
-
-    # Create a cache key that uniquely identifies the scenario
-    cache_key = ('dfs', start, goal_col, blocked_roads_tuple)
-
-    # Check if the path has already been analyzed and is in the cache
+    cache_key = ('distances', grid_size, goal_col, board.walls_key())
     if cache_key in cache:
-        return cache[cache_key]
-
-    # Initialize DFS with starting position
-    stack = [start]
-    visited = {start}
-
-    # Preprocess blocked roads for faster lookup
-    blocked_set = set()
-    for road in blocked_roads:
-        # Road is a tuple of two positions
-        blocked_set.add(frozenset(road))
-
-    # Direction vectors for up, down, left, right
-    directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]  # (row_change, col_change)
-
-    while stack:
-        current_row, current_col = stack.pop()
-
-        # Check if we've reached the goal column
-        if current_col == goal_col:
-            # Save the result in cache
-            cache[cache_key] = True
-            return True
-
-        # Explore neighbors
-        for drow, dcol in directions:
-            new_row, new_col = current_row + drow, current_col + dcol
-            new_position = (new_row, new_col)
-
-            # Check if the new position is within the grid bounds
-            if 0 <= new_row < grid_size and 0 <= new_col < grid_size:
-                # Check if the path between current and new positions is not blocked
-                edge = frozenset([(current_row, current_col), new_position])
-                if edge not in blocked_set and new_position not in visited:
-                    visited.add(new_position)
-                    stack.append(new_position)
+        return
+    previous_distances = cache.get(('distances', grid_size, goal_col, previous_walls_key))
+    if previous_distances is not None:
+        cache[cache_key] = repair_goal_distances(previous_distances, grid_size, board, wall)
 
-    # Save the result in cache
-    cache[cache_key] = False
-    return False  # No path found
-
-def bfs_pathfinder_cell_to_cell(start, goal, grid_size, blocked_roads, find_shortest_path=False):
+def bfs_pathfinder(start, goal_col, grid_size, board):
     """
-    Performs BFS to find a path from start to goal on a grid of given size,
-    considering blocked roads (walls).
+    Find the shortest path to the goal column, as the list of cells from start to the goal included.
+    The path follows the goal distances downhill, so no BFS is run when the distances are cached.
     """
+    distances = goal_distances(goal_col, grid_size, board)
 
-    # Define movement directions: up, down, left, right
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # (delta_row, delta_col)
+    current_row, current_col = start
+    distance = distances[current_row * grid_size + current_col]
+    if distance is None:
+        return None  # No path found
 
-    # Initialize visited set and queue for BFS
-    visited = set()
-    queue = deque()
+    blocked = board.blocked
 
-    # Enqueue the starting position
-    queue.append((start, [start]))  # Each element is a tuple: (current_position, path_so_far)
-    visited.add(start)
+    # Direction vectors for left, right, up, down with the bit of the road they take
+    directions = [(0, -1, LEFT), (0, 1, RIGHT), (-1, 0, UP), (1, 0, DOWN)]  # (row_change, col_change, bit)
 
-    # Convert blocked_roads to a set of frozensets for faster lookup
-    blocked_roads_set = set(frozenset(road) for road in blocked_roads)
+    path = [(current_row, current_col)]
+    while distance > 0:
+        # Step to the first open neighbor one step closer to the goal
+        blocked_directions = blocked[current_row * grid_size + current_col]
+        for drow, dcol, bit in directions:
+            new_row, new_col = current_row + drow, current_col + dcol
+            if 0 <= new_row < grid_size and 0 <= new_col < grid_size and not blocked_directions & bit \
+                    and distances[new_row * grid_size + new_col] == distance - 1:
+                break
+        current_row, current_col = new_row, new_col
+        distance -= 1
+        path.append((current_row, current_col))
 
-    while queue:
-        current_pos, path = queue.popleft()
-
-        # Check if we've reached the goal
-        if current_pos == goal:
-            if find_shortest_path:
-                return path  # Return the path from start to goal
-            else:
-                return True  # Path exists
-
-        current_row, current_col = current_pos
-
-        # Explore neighboring cells
-        for delta_row, delta_col in directions:
-            neighbor_row = current_row + delta_row
-            neighbor_col = current_col + delta_col
-            neighbor_pos = (neighbor_row, neighbor_col)
-
-            # Check if neighbor is within grid bounds
-            if 0 <= neighbor_row < grid_size and 0 <= neighbor_col < grid_size:
-                # Check if the move between current_pos and neighbor_pos is not blocked
-                road = frozenset({current_pos, neighbor_pos})
-                if road not in blocked_roads_set and neighbor_pos not in visited:
-                    visited.add(neighbor_pos)
-                    queue.append((neighbor_pos, path + [neighbor_pos] if find_shortest_path else None))
-
-    # If we exhaust the queue without reaching the goal
-    if find_shortest_path:
-        return []  # No path exists
-    else:
-        return False  # No path exists
-
-def is_path_blocked(pos1, pos2, blocked_roads):
-    """
-    Check if the path between two positions is blocked by a wall.
-    """
-    return [pos1, pos2] in blocked_roads or [pos2, pos1] in blocked_roads
+    return path
 
 def clear_cache():
     """
-    Clear the cache of stored paths, keeping the first 1000 entries.
+    Clear the cache of stored paths, keeping the most recently used CACHE_KEPT_FRACTION of its entries.
     """
-    global cache
-
-    if len(cache) > 1000:
-        # Create a new cache dictionary with the first 1000 items
-        cache = dict(list(cache.items())[:1000])
+    cache.trim(int(cache.max_entries * CACHE_KEPT_FRACTION))
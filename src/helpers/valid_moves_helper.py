@@ -1,11 +1,11 @@
-def get_valid_moves_helper(player, other_player, grid_size, current_blocked_roads):
+def get_valid_moves_helper(player, other_player, grid_size, board):
     """
     Return a dictionary of valid moves based on player row and column.
     Args:
         player: The player object whose valid moves we are calculating.
         other_player: The opposing player object (used to check if they are near).
         grid_size: Size of the grid (an integer representing the width and height).
-        current_blocked_roads: List of blocked roads represented as tuples [(pos1, pos2), (pos2, pos1)].
+        board: Board holding the roads blocked by the placed walls.
 
     Returns:
         Dictionary format: {'up': (row, col), 'down': (row, col), 'left': (row, col), 'right': (row, col)}
@@ -32,7 +32,7 @@ def get_valid_moves_helper(player, other_player, grid_size, current_blocked_road
             directions['left'] = (-2, 0)  # Allow move two cells left
         elif other_player_position == 'right':
             directions['right'] = (2, 0)  # Allow move two cells right
-        directions = is_there_a_wall(player, other_player_position, directions, current_blocked_roads)
+        directions = is_there_a_wall(player, other_player_position, directions, board)
 
     valid_moves = {}
 
@@ -44,8 +44,7 @@ def get_valid_moves_helper(player, other_player, grid_size, current_blocked_road
         # Check if the move is within the grid bounds
         if 0 <= new_row < grid_size and 0 <= new_col < grid_size:
             # Check if the move is not blocked by a wall
-            if [(player.row, player.col), (new_row, new_col)] not in current_blocked_roads and \
-                    [(new_row, new_col), (player.row, player.col)] not in current_blocked_roads:
+            if not board.is_blocked((player.row, player.col), (new_row, new_col)):
                 valid_moves[direction] = (new_row, new_col)
 
     # If no valid moves are found, return None
@@ -66,7 +65,7 @@ def where_is_other_player(player, other_player):
     return None
 
 
-def is_there_a_wall(player, other_player_position, directions, current_blocked_roads):
+def is_there_a_wall(player, other_player_position, directions, board):
     """
     Adjust directions if a wall is blocking the path of the player.
     """
@@ -81,16 +80,11 @@ def is_there_a_wall(player, other_player_position, directions, current_blocked_r
     if other_player_position in position_change:
         row_change, col_change = position_change[other_player_position]
 
-        blocked_roads = [
-            [(player.row, player.col), (player.row + row_change, player.col + col_change)],
-            [(player.row + row_change, player.col + col_change), (player.row, player.col)],
-            [(player.row + row_change, player.col + col_change),
-             (player.row + 2 * row_change, player.col + 2 * col_change)],
-            [(player.row + 2 * row_change, player.col + 2 * col_change),
-             (player.row + row_change, player.col + col_change)]
-        ]
+        other_player_cell = (player.row + row_change, player.col + col_change)
+        landing_cell = (player.row + 2 * row_change, player.col + 2 * col_change)
 
-        if any(road in current_blocked_roads for road in blocked_roads):
+        if board.is_blocked((player.row, player.col), other_player_cell) or \
+                board.is_blocked(other_player_cell, landing_cell):
             directions.pop(other_player_position)
 
     return directions
@@ -1,26 +1,7 @@
-from helpers.path_helper import bfs_pathfinder, bfs_pathfinder_cell_to_cell, dfs_path_exists
+from helpers.board_helper import get_neighbours
+from helpers.lru_cache import LRUCache
 
 
-def get_blocked_roads(wall):
-    # Extract start and end points from the wall
-    wall_start, wall_end = wall[0], wall[1]
-
-    # Add blocked roads based on wall orientation
-    if wall_start[1] == wall_end[1]:  # Vertical wall
-        eventual_blocks = [[(wall_start[0], wall_start[1] - 1), (wall_start[0], wall_start[1])],
-                           [(wall_end[0] - 1, wall_end[1] - 1), (wall_end[0] - 1, wall_end[1])]]
-
-    elif wall_start[0] == wall_end[0]:  # Horizontal wall
-        eventual_blocks = [
-            [(wall_start[0] - 1, wall_start[1]), (wall_start[0], wall_start[1])],
-            [(wall_end[0] - 1, wall_end[1] - 1), (wall_end[0], wall_end[1] - 1)]
-        ]
-    else:
-        print("How did you get here?")
-        return None
-
-    return eventual_blocks
-
 def order_walls(wall):
     # Extract start and end points from the wall
     wall_start, wall_end = wall[0], wall[1]
@@ -31,235 +12,209 @@ def order_walls(wall):
         ordered_wall=[(wall_end[0], wall_end[1]), (wall_start[0], wall_start[1])]
     return ordered_wall
 
-def is_wall_within_bounds(wall, grid_size):
-    (row1, col1), (row2, col2) = wall
-    return 0 <= row1 <= grid_size and 0 <= col1 <= grid_size and \
-        0 <= row2 <= grid_size and 0 <= col2 <= grid_size
-
-def walls_intersect(start1, end1, start2, end2):
-    """Check if two walls intersect each other."""
-    # Middle Intersection
-    middle1 = ((start1[0] + end1[0]) / 2, (start1[1] + end1[1]) / 2)
-    middle2 = ((start2[0] + end2[0]) / 2, (start2[1] + end2[1]) / 2)
-
-    if middle1 == middle2:
-        return True
-
-    if start1 == middle2 and (middle1 == start2 or middle1 == end2):
-        return True
-
-    if end1 == middle2 and (middle1 == start2 or middle1 == end2):
-        return True
-
-    return False
-
-def is_valid_wall(start, end, grid_size, placed_walls,forbidden_walls):
+def is_valid_wall(start, end, board, forbidden_walls):
     """Check if the wall placement is within bounds and doesn't overlap or intersect with another wall's middle."""
-    # Check if the wall is within grid bounds
-    if not is_wall_within_bounds((start, end), grid_size):
+    # The board's free slots exclude the border, the placed walls and every wall overlapping or crossing them
+    if not board.is_free((start, end)):
         return False
 
-    # Check if the wall is placed on the border of the grid
-    if start[0] == 0 and end[0] == 0:
-        return False
-    if start[0] == grid_size and end[0] == grid_size:
-        return False
-    if start[1] == 0 and end[1] == 0:
-        return False
-    if start[1] == grid_size and end[1] == grid_size:
-        return False
-
-    # Check if a wall already exists in this position
-    if [(start, end)] in placed_walls or [(end, start)] in placed_walls:
-        return False
-
-    # Check if the proposed wall crosses the middle of any existing walls
-    for wall_start, wall_end in placed_walls:
-        if walls_intersect(start, end, wall_start, wall_end):
-            return False
-
     # Check if the proposed wall is a forbidden wall
     if [start, end] in forbidden_walls or [end, start] in forbidden_walls:
         return False
 
     return True
 
-# Define a global cache to store results
-find_forbidden_walls_cache = {}
-
-# Helper function to convert list of blocked roads and placed walls into a hashable format
-def hashable_walls(walls):
-    return tuple(frozenset(wall) for wall in walls)
+# Number of forbidden wall lists the global cache keeps until resized
+FORBIDDEN_WALLS_CACHE_MAX_ENTRIES = 20000
 
-def hashable_blocked_roads(blocked_roads):
-    return tuple(frozenset(road) for road in blocked_roads)
+# Define a global cache to store results
+find_forbidden_walls_cache = LRUCache(FORBIDDEN_WALLS_CACHE_MAX_ENTRIES)
 
-def find_forbidden_walls_new(grid_size, placed_walls, current_blocked_roads, red_player_pos, blue_player_pos, red_goal_col, blue_goal_col):
+def find_forbidden_walls_new(grid_size, board, red_player_pos, blue_player_pos, red_goal_col, blue_goal_col):
     """
     Find the walls that cannot be placed because they would block either player from reaching their goal.
-    This version reduces the number of BFS calls by reusing shortest paths and only analyzes walls
-    that share a common point with two walls, or one wall and one grid border.
+    This version finds them for every wall slot at once with one bridge analysis of the grid per player.
     """
-    global count
-    # Convert placed_walls and current_blocked_roads to hashable structures to create a cache key
-    placed_walls_hashable = hashable_walls(placed_walls)
-    current_blocked_roads_hashable = hashable_blocked_roads(current_blocked_roads)
-
-    # Create a tuple that represents the cache key
-    cache_key = (grid_size, placed_walls_hashable, current_blocked_roads_hashable, red_player_pos, blue_player_pos, red_goal_col, blue_goal_col)
+    # Create a tuple that represents the cache key, the board's wall bitmasks identify the placed walls
+    cache_key = (grid_size, board.walls_key(), red_player_pos, blue_player_pos, red_goal_col, blue_goal_col)
 
     # Check if the result is already in the cache
-    if cache_key in find_forbidden_walls_cache:
-        return find_forbidden_walls_cache[cache_key]
-
-    # If not in the cache, compute the result
-    forbidden_walls = []
-
-    # Perform BFS for both players to find the initial shortest path without hypothetical walls
-    blue_shortest_path = bfs_pathfinder(blue_player_pos, blue_goal_col, grid_size, current_blocked_roads)
-    red_shortest_path = bfs_pathfinder(red_player_pos, red_goal_col, grid_size, current_blocked_roads)
-
-    # Helper function to check if the hypothetical wall shares a common point with two other walls or one wall and a grid border
-    def shares_common_point_with_two(hypothetical_wall, placed_walls, grid_size):
-        wall_start, wall_end = hypothetical_wall
-
-        # Calculate the middle point of the hypothetical wall
-        middle_point = ((wall_start[0] + wall_end[0]) / 2, (wall_start[1] + wall_end[1]) / 2)
-
-        shared_point_count = 0
-
-        # Helper function to check if a point is on the grid border
-        def is_border(point):
-            return point[0] == 0 or point[0] == grid_size or point[1] == 0 or point[1] == grid_size
-
-        # Check against all placed walls for shared points
-        for placed_wall in placed_walls:
-            placed_start, placed_end = placed_wall
-            placed_middle = ((placed_start[0] + placed_end[0]) / 2, (placed_start[1] + placed_end[1]) / 2)
+    forbidden_walls = find_forbidden_walls_cache.get(cache_key)
+    if forbidden_walls is not None:
+        return forbidden_walls
 
-            # Check if any of the start, middle, or end points match with placed walls
-            if (wall_start == placed_start or wall_start == placed_end or wall_start == placed_middle or
-                wall_end == placed_start or wall_end == placed_end or wall_end == placed_middle or
-                middle_point == placed_start or middle_point == placed_end or middle_point == placed_middle):
-                shared_point_count += 1
-
-            # If we have already found two shared points, we can return early
-            if shared_point_count == 2:
-                return True
-
-        # Check if the wall touches a grid border
-        if is_border(wall_start) or is_border(wall_end) or is_border(middle_point):
-            shared_point_count += 1
-
-        return shared_point_count == 2
-
-    # Helper function to check if the hypothetical wall intersects the player's current shortest path
-    def wall_blocks_path(hypothetical_wall, player_shortest_path):
-
-        try:
-            # Get the roads blocked by the hypothetical wall
-            blocked_roads = get_blocked_roads(hypothetical_wall)
-
-            # Check if any of the blocked roads intersect with the player's shortest path
-            for blocked_road in blocked_roads:
-                road_segment = tuple(blocked_road)
-
-                # Iterate over the segments of the player's path
-                for i in range(len(player_shortest_path) - 1):
-                    path_segment = (player_shortest_path[i], player_shortest_path[i + 1])
-
-                    # Check if the road segment matches the path segment in either direction
-                    if road_segment == path_segment or road_segment == path_segment[::-1]:
-                        return True
-
-        except Exception as e:
-            # Catch and print the exception message
-            # print(f"An error occurred: {str(e)}")
-            # print("Current blocked roads:", current_blocked_roads)
-            # print("WALL THAT CRASHED:", hypothetical_wall)
-            return False
-
-        # If no intersections are found, return False
-        return False
-
-    # Loop through the grid to simulate placement of both horizontal and vertical walls
-    for row in range(grid_size):
-        for col in range(grid_size):
-            for wall_type in ["horizontal", "vertical"]:
-                if wall_type == "horizontal":
-                    hypothetical_wall = order_walls([(row, col), (row, col + 2)])
-                else:
-                    hypothetical_wall = order_walls([(row, col), (row + 2, col)])
-
-                # Check if the wall shares a common point with two walls or one wall and a grid border
-                if (hypothetical_wall not in placed_walls
-                        and is_wall_within_bounds(hypothetical_wall, grid_size)
-                        and shares_common_point_with_two(hypothetical_wall, placed_walls, grid_size)):
-                    # First, check if the wall intersects the blue or red player's shortest path
-                    blue_path_blocked = wall_blocks_path(hypothetical_wall, blue_shortest_path)
-                    red_path_blocked = wall_blocks_path(hypothetical_wall, red_shortest_path)
-
-                    # If the wall intersects the shortest path, check if it completely blocks the player
-                    if blue_path_blocked:
-                        # Rerun BFS for the blue player with the hypothetical wall added
-                        blocked_roads = get_blocked_roads(hypothetical_wall)
-                        current_plus_hypothetical = current_blocked_roads + blocked_roads
-                        can_circumvent_wall=True
-
-                        #Check if we can circumvent the wall
-                        for blocked_road in blocked_roads:
-                            start=blocked_road[0]
-                            end=blocked_road[1]
-                            if not bfs_pathfinder_cell_to_cell(start,end,grid_size,current_plus_hypothetical):
-                                can_circumvent_wall=False
-                                break
-
-                        #Let's check if another path
-                        if not can_circumvent_wall:
-                            if not dfs_path_exists(blue_player_pos, blue_goal_col, grid_size, current_plus_hypothetical):
-                                forbidden_walls.append(hypothetical_wall)
-                                continue  # Skip further checks if already blocked
-
-                    if red_path_blocked:
-                        # Rerun BFS for the red player with the hypothetical wall added
-                        blocked_roads = get_blocked_roads(hypothetical_wall)
-                        current_plus_hypothetical = current_blocked_roads + blocked_roads
-                        can_circumvent_wall = True
-
-                        # Check if we can circumvent the wall
-                        for blocked_road in blocked_roads:
-                            start = blocked_road[0]
-                            end = blocked_road[1]
-                            if not bfs_pathfinder_cell_to_cell(start, end, grid_size, current_plus_hypothetical):
-                                can_circumvent_wall = False
-                                break
-
-                        # Let's check if another path exists
-                        if not can_circumvent_wall:
-                            if not dfs_path_exists(red_player_pos, red_goal_col, grid_size, current_plus_hypothetical):
-                                forbidden_walls.append(hypothetical_wall)
+    # If not in the cache, check every wall slot
+    forbidden_walls = check_forbidden_walls(grid_size, board, board.slots.all_slots,
+                                            red_player_pos, blue_player_pos, red_goal_col, blue_goal_col)
 
     # Store the result in the cache before returning
     find_forbidden_walls_cache[cache_key] = forbidden_walls
     return forbidden_walls
 
-def find_valid_walls(grid_size, placed_walls, forbidden_walls):
+def update_forbidden_walls(grid_size, board, forbidden_walls, new_wall, red_player_pos, blue_player_pos,
+                           red_goal_col, blue_goal_col):
     """
-    Find the valid walls that can be placed on the grid.
+    Update the forbidden walls found before new_wall was placed, with both players still on the same cells.
+    Placing a wall only ever adds forbidden walls, and a wall can only start cutting a player off together
+    with the new wall if it touches the group of walls (and grid border) the new wall is connected to,
+    so only the slots touching that group are checked again and the others keep their previous state.
+    Args:
+        board: Board with new_wall already placed.
+        forbidden_walls: Forbidden walls found before new_wall was placed.
     """
-    valid_walls = []
-
-    # Loop through the grid and check for possible wall placements
-    for row in range(grid_size):
-        for col in range(grid_size):
-            # Check for horizontal walls
-            horizontal_wall = order_walls([(row, col), (row, col + 2)])
-            if is_valid_wall(horizontal_wall[0], horizontal_wall[1], grid_size, placed_walls,forbidden_walls):
-                valid_walls.append(horizontal_wall)
-
-            # Check for vertical walls
-            vertical_wall = order_walls([(row, col), (row + 2, col)])
-            if is_valid_wall(vertical_wall[0], vertical_wall[1], grid_size, placed_walls,forbidden_walls):
-                valid_walls.append(vertical_wall)
+    cache_key = (grid_size, board.walls_key(), red_player_pos, blue_player_pos, red_goal_col, blue_goal_col)
+    cached_walls = find_forbidden_walls_cache.get(cache_key)
+    if cached_walls is not None:
+        return cached_walls
+
+    slots = board.slots
+    recheck_slots = board.slots_touching_group(new_wall)
+    kept_slots = slots.mask_of(forbidden_walls) & ~recheck_slots
+    rechecked_walls = check_forbidden_walls(grid_size, board, recheck_slots,
+                                            red_player_pos, blue_player_pos, red_goal_col, blue_goal_col)
+
+    # Keep the slot order of find_forbidden_walls_new
+    forbidden_walls = slots.walls_of(kept_slots | slots.mask_of(rechecked_walls))
+    find_forbidden_walls_cache[cache_key] = forbidden_walls
+    return forbidden_walls
 
-    return valid_walls
+def check_forbidden_walls(grid_size, board, candidate_slots, red_player_pos, blue_player_pos,
+                          red_goal_col, blue_goal_col):
+    """
+    Return the walls of the candidate slot mask that would block either player from reaching their goal.
+    """
+    # Walls already placed or overlapping a placed wall can never be placed
+    slots = board.slots
+    candidate_slots &= ~board.walls
+    candidate_slots &= ~slots.mask_of(
+        wall for wall in slots.walls_of(candidate_slots) if board.overlaps_roads(wall))
+
+    forbidden_slots = find_cut_off_slots(red_player_pos, red_goal_col, grid_size, board, candidate_slots)
+    forbidden_slots |= find_cut_off_slots(blue_player_pos, blue_goal_col, grid_size, board,
+                                          candidate_slots & ~forbidden_slots)
+    return slots.walls_of(forbidden_slots)
+
+def find_cut_off_slots(player_pos, goal_col, grid_size, board, candidate_slots):
+    """
+    Return the mask of the candidate wall slots that would cut the player off from the goal column.
+    A wall removes two roads, so it cuts the player off when one of them is a bridge, or when the two
+    together are a cut, between the player and the goal column. Both are found in a single DFS from a
+    virtual node joined to every goal cell: every non-tree road gets its own bit, and every tree road
+    the XOR of the bits of the non-tree roads going around it. A tree road with no bits is a bridge, and
+    two roads form a cut when their bits are equal. The player is cut off when it is on the far side.
+    """
+    blocked = board.blocked
+    neighbours = get_neighbours(grid_size)
+    root = grid_size * grid_size
+
+    # Open roads of every cell, plus the virtual roads between the goal cells and the root
+    adjacency = []
+    for cell in range(root):
+        blocked_directions = blocked[cell]
+        cell_adjacency = [neighbour for bit, neighbour in neighbours[cell] if not blocked_directions & bit]
+        if cell % grid_size == goal_col:
+            cell_adjacency.append(root)
+        adjacency.append(cell_adjacency)
+    adjacency.append([row * grid_size + goal_col for row in range(grid_size)])
+
+    # Iterative DFS recording the preorder, the tree parents and the bits of the non-tree roads
+    node_count = root + 1
+    parent = [-1] * node_count
+    preorder = [-1] * node_count
+    labels = [0] * node_count
+    back_road_bits = {}
+    order = [root]
+    preorder[root] = 0
+    next_neighbour = [0] * node_count
+    stack = [root]
+    while stack:
+        node = stack[-1]
+        node_adjacency = adjacency[node]
+        index = next_neighbour[node]
+        if index == len(node_adjacency):
+            stack.pop()
+            continue
+        next_neighbour[node] = index + 1
+        neighbour = node_adjacency[index]
+        if preorder[neighbour] == -1:
+            preorder[neighbour] = len(order)
+            order.append(neighbour)
+            parent[neighbour] = node
+            stack.append(neighbour)
+        elif neighbour != parent[node] and preorder[neighbour] < preorder[node]:
+            # Non-tree road from the node back up to one of its ancestors
+            bit = 1 << len(back_road_bits)
+            back_road_bits[(node, neighbour)] = bit
+            back_road_bits[(neighbour, node)] = bit
+            labels[node] ^= bit
+            labels[neighbour] ^= bit
+
+    # Bits of the tree road above each node, XOR of the labels of its subtree, and subtree sizes
+    size = [1] * node_count
+    for node in reversed(order[1:]):
+        node_parent = parent[node]
+        labels[node_parent] ^= labels[node]
+        size[node_parent] += size[node]
+
+    player_cell = player_pos[0] * grid_size + player_pos[1]
+    player_order = preorder[player_cell]
+
+    def is_below(node):
+        """Check if the player is in the subtree of the node."""
+        return preorder[node] <= player_order < preorder[node] + size[node]
+
+    cut_off_slots = 0
+    roads = board.slots.roads
+    while candidate_slots:
+        lowest = candidate_slots & -candidate_slots
+        candidate_slots ^= lowest
+        (cell1, _, neighbour1, _), (cell2, _, neighbour2, _) = roads[lowest.bit_length() - 1]
+
+        # Roads outside the player's part of the grid cannot cut it off
+        if preorder[cell1] == -1 and preorder[cell2] == -1:
+            continue
+
+        # Child end of each tree road, or bit of each non-tree road
+        child1 = child2 = None
+        bit1 = bit2 = None
+        if preorder[cell1] != -1:
+            if parent[neighbour1] == cell1:
+                child1 = neighbour1
+            elif parent[cell1] == neighbour1:
+                child1 = cell1
+            else:
+                bit1 = back_road_bits[(cell1, neighbour1)]
+        if preorder[cell2] != -1:
+            if parent[neighbour2] == cell2:
+                child2 = neighbour2
+            elif parent[cell2] == neighbour2:
+                child2 = cell2
+            else:
+                bit2 = back_road_bits[(cell2, neighbour2)]
+
+        cut_off = False
+        if child1 is not None and labels[child1] == 0 and is_below(child1):
+            cut_off = True
+        elif child2 is not None and labels[child2] == 0 and is_below(child2):
+            cut_off = True
+        elif child1 is not None and child2 is not None and labels[child1] == labels[child2]:
+            # Two tree roads on the same branch cut off the part between them
+            upper, lower = (child1, child2) if preorder[child1] < preorder[child2] else (child2, child1)
+            cut_off = is_below(upper) and not is_below(lower)
+        elif child1 is not None and bit2 is not None and labels[child1] == bit2:
+            cut_off = is_below(child1)
+        elif child2 is not None and bit1 is not None and labels[child2] == bit1:
+            cut_off = is_below(child2)
+
+        if cut_off:
+            cut_off_slots |= lowest
+
+    return cut_off_slots
+
+def find_valid_walls(board, forbidden_walls):
+    """
+    Find the valid walls that can be placed on the grid.
+    """
+    # Free slots of the board, minus the forbidden ones, in grid scan order
+    valid_mask = board.free_walls & ~board.slots.mask_of(forbidden_walls)
+    return board.slots.walls_of(valid_mask)
@@ -0,0 +1,56 @@
+import random
+
+from helpers.wall_helpers import order_walls
+
+GRID_SIZE = 9
+MAX_WALLS = 20
+
+# Fixed seed so that hashes are reproducible between runs
+_random = random.Random(20241017)
+
+
+def _random_key():
+    return _random.getrandbits(64)
+
+
+# Pawn keys per color and cell
+PAWN_KEYS = {
+    color: [[_random_key() for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+    for color in ('red', 'blue')
+}
+
+# Wall keys per (start, end) of every wall that fits inside the grid
+WALL_KEYS = {}
+for _row in range(GRID_SIZE + 1):
+    for _col in range(GRID_SIZE + 1):
+        for _end in ((_row, _col + 2), (_row + 2, _col)):
+            WALL_KEYS[((_row, _col), _end)] = _random_key()
+
+# Remaining walls keys per color and wall count
+WALLS_LEFT_KEYS = {color: [_random_key() for _ in range(MAX_WALLS + 1)] for color in ('red', 'blue')}
+
+# Toggled on every turn, so the same board with a different side to move hashes differently
+SIDE_KEY = _random_key()
+
+# Keys of the plies near the root where the bot selects its moves differently, so that a position searched with
+# walls considered and the same position searched with pawn moves only get different table entries
+PLY_KEYS = [_random_key() for _ in range(3)]
+
+
+def wall_key(wall):
+    """Return the key of a wall given as [(row, col), (row, col)] in any order."""
+    start, end = order_walls(wall)
+    return WALL_KEYS[(start, end)]
+
+
+def compute_hash(red_player, blue_player, placed_walls, side_to_move):
+    """Compute the hash of a position from scratch."""
+    hash_value = 0
+    for player, color in ((red_player, 'red'), (blue_player, 'blue')):
+        hash_value ^= PAWN_KEYS[color][player.row][player.col]
+        hash_value ^= WALLS_LEFT_KEYS[color][player.available_walls]
+    for wall in placed_walls:
+        hash_value ^= wall_key(wall)
+    if side_to_move == 'blue':
+        hash_value ^= SIDE_KEY
+    return hash_value
@@ -0,0 +1,70 @@
+"""
+Perft: counts every legal sequence of pawn moves and wall placements to a given depth from the fixed positions,
+reports the leaf counts and leaves per second and checks them against the stored reference counts.
+
+Example, from the src directory:
+    python perft.py --depth 3
+    python perft.py --positions midgame --depth 2 --divide
+"""
+import argparse
+import sys
+import time
+
+from engine import profiler
+from engine.perft import perft, perft_divide
+from engine.positions import POSITIONS, get_position
+
+# Perft counts of the fixed positions with red to move, for depths 1, 2, 3...
+REFERENCE_COUNTS = {
+    'opening': [131, 16677, 2062264],
+    'early': [124, 14932, 1745332],
+    'midgame': [115, 12825, 1386079],
+    'walls': [109, 11402, 1165056],
+    'maze': [88, 7470, 610988],
+    'endgame': [107, 316, 2473],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count the legal move sequences from the fixed positions.")
+    parser.add_argument('--depth', type=int, default=2, help="length of the move sequences")
+    parser.add_argument('--positions', nargs='+', default=list(POSITIONS), choices=list(POSITIONS))
+    parser.add_argument('--divide', action='store_true', help="also print the count below each first move")
+    parser.add_argument('--profile', action='store_true', help="time the phases of move generation")
+    args = parser.parse_args()
+
+    if args.profile:
+        profiler.enable()
+
+    failures = 0
+    for name in args.positions:
+        game_state = get_position(name)
+        start = time.perf_counter()
+        if args.divide:
+            divided = perft_divide(game_state, args.depth, 'red')
+            for (action_type, action_value), count in divided:
+                print(f"  {action_type} {action_value}: {count}")
+            leaves = sum(count for _, count in divided)
+        else:
+            leaves = perft(game_state, args.depth, 'red')
+        elapsed = time.perf_counter() - start
+
+        references = REFERENCE_COUNTS.get(name, [])
+        if args.depth > len(references):
+            status = "no reference"
+        elif leaves == references[args.depth - 1]:
+            status = "ok"
+        else:
+            status = f"MISMATCH, expected {references[args.depth - 1]}"
+            failures += 1
+        print(f"{name:<9} depth {args.depth}: {leaves} leaves in {elapsed:.2f} seconds, "
+              f"{leaves / elapsed if elapsed else 0:.0f} leaves/s, {status}")
+
+    if args.profile:
+        print(profiler.format_report())
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+import pytest
+
+from arena import sprt_bounds, sprt_llr
+
+BOUNDS = sprt_bounds(0.05, 0.05)
+
+
+@pytest.mark.parametrize('wins, draws, losses', [(200, 0, 0), (40, 0, 0), (150, 50, 0)])
+def test_sprt_accepts_elo1_when_the_first_engine_never_loses(wins, draws, losses):
+    assert sprt_llr(wins, draws, losses, 0, 10) > BOUNDS[1]
+
+
+@pytest.mark.parametrize('wins, draws, losses', [(0, 0, 200), (0, 0, 40), (0, 50, 150)])
+def test_sprt_accepts_elo0_when_the_first_engine_never_wins(wins, draws, losses):
+    assert sprt_llr(wins, draws, losses, 0, 10) < BOUNDS[0]
+
+
+def test_sprt_stays_undecided_on_few_mixed_games():
+    assert sprt_llr(0, 0, 0, 0, 10) == 0.0
+    assert BOUNDS[0] < sprt_llr(3, 2, 3, 0, 10) < BOUNDS[1]
@@ -0,0 +1,104 @@
+import random
+from collections import deque
+
+import pytest
+
+from engine.game_state import GameState
+from helpers import wall_helpers
+from helpers.wall_helpers import find_forbidden_walls_new, update_forbidden_walls
+
+
+def can_reach_goal(board, grid_size, start, goal_col):
+    """Plain BFS over the cells, checking every road with Board.is_blocked."""
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        row, col = queue.popleft()
+        if col == goal_col:
+            return True
+        for next_cell in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if (0 <= next_cell[0] < grid_size and 0 <= next_cell[1] < grid_size and next_cell not in seen
+                    and not board.is_blocked((row, col), next_cell)):
+                seen.add(next_cell)
+                queue.append(next_cell)
+    return False
+
+
+def placeable_slots(board):
+    """Slots free of placed and crossing walls whose roads are both open."""
+    return {slot for slot, wall in enumerate(board.slots.walls)
+            if board.free_walls >> slot & 1 and not board.overlaps_roads(wall)}
+
+
+def slots_of(board, walls):
+    return {board.slots.slot_of(wall) for wall in walls}
+
+
+def brute_forbidden_slots(game_state):
+    """Placeable slots that would cut a player off, found by placing each wall and searching."""
+    board, grid_size = game_state.board, game_state.grid_size
+    forbidden = set()
+    for slot in placeable_slots(board):
+        wall = board.slots.walls[slot]
+        board.add_wall(wall)
+        if not all(can_reach_goal(board, grid_size, (player.row, player.col), player.goal_col)
+                   for player in (game_state.red_player, game_state.blue_player)):
+            forbidden.add(slot)
+        board.remove_wall(wall)
+    return forbidden
+
+
+def forbidden_walls(game_state, new_wall=None, previous_walls=None):
+    """
+    Return the forbidden walls of find_forbidden_walls_new, or of update_forbidden_walls if new_wall is given,
+    computed afresh: both share the same cache entries.
+    """
+    red, blue = game_state.red_player, game_state.blue_player
+    arguments = (game_state.grid_size, game_state.board)
+    positions = ((red.row, red.col), (blue.row, blue.col), red.goal_col, blue.goal_col)
+    wall_helpers.find_forbidden_walls_cache.clear()
+    if new_wall is None:
+        return find_forbidden_walls_new(*arguments, *positions)
+    return update_forbidden_walls(*arguments, previous_walls, new_wall, *positions)
+
+
+def random_position(rng, grid_size, walls):
+    """Random pawn cells off the goal columns and up to walls random walls leaving both players a path."""
+    cells = rng.sample([(row, col) for row in range(grid_size) for col in range(1, grid_size - 1)], 2)
+    game_state = GameState.from_position(cells[0], cells[1], grid_size=grid_size)
+    board = game_state.board
+    for _ in range(walls):
+        candidates = sorted(placeable_slots(board) - slots_of(board, forbidden_walls(game_state)))
+        if not candidates:
+            break
+        wall = board.slots.walls[rng.choice(candidates)]
+        game_state.placed_walls.append(wall)
+        board.add_wall(wall)
+    return game_state
+
+
+# Slots crossing a placed wall are left to Board.free_walls, so only the placeable slots are compared
+@pytest.mark.parametrize('grid_size', [5, 7, 9])
+@pytest.mark.parametrize('seed', range(5))
+def test_forbidden_walls_match_brute_force(grid_size, seed):
+    rng = random.Random(seed)
+    game_state = random_position(rng, grid_size, walls=rng.randrange(4, 2 * grid_size))
+    board = game_state.board
+    assert slots_of(board, forbidden_walls(game_state)) & placeable_slots(board) == brute_forbidden_slots(game_state)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_updated_forbidden_walls_match_brute_force(seed):
+    rng = random.Random(seed)
+    game_state = random_position(rng, 7, walls=rng.randrange(4, 12))
+    board = game_state.board
+    for _ in range(4):
+        previous_walls = forbidden_walls(game_state)
+        candidates = sorted(placeable_slots(board) - slots_of(board, previous_walls))
+        if not candidates:
+            break
+        new_wall = board.slots.walls[rng.choice(candidates)]
+        game_state.placed_walls.append(new_wall)
+        board.add_wall(new_wall)
+        updated_walls = forbidden_walls(game_state, new_wall, previous_walls)
+        assert slots_of(board, updated_walls) & placeable_slots(board) == brute_forbidden_slots(game_state)
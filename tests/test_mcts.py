@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from engine.game_state import GameState
+from engine.mcts import MCTS
+from engine.positions import get_position
+from engine.search import get_root_moves
+from engine.search_limits import SearchLimits
+
+
+@pytest.fixture(autouse=True)
+def seeded_rollouts():
+    """Make the random rollouts repeat from one run to the next."""
+    state = random.getstate()
+    random.seed(0)
+    yield
+    random.setstate(state)
+
+
+def search(mcts, game_state, player, playouts):
+    return mcts.search(game_state, player, get_root_moves(game_state, player, 'hard'), SearchLimits(),
+                       max_playouts=playouts)
+
+
+def most_visited(node):
+    return max(node.children, key=lambda child: child.visits)
+
+
+def test_every_playout_goes_through_a_root_move():
+    game_state = get_position('midgame')
+    hash = game_state.hash
+    mcts = MCTS()
+    _, action_type, action_value, depth = search(mcts, game_state, game_state.red_player, 1000)
+    root = mcts.root
+    assert root.visits == 1000
+    assert sum(child.visits for child in root.children) == root.visits
+    assert (action_type, action_value) == most_visited(root).action
+    assert depth > 1
+    # The playouts are made and unmade on a copy
+    assert game_state.hash == hash
+
+
+def test_tree_is_reused_two_plies_below():
+    game_state = get_position('midgame').copy_for_search()
+    red, blue = game_state.red_player, game_state.blue_player
+    mcts = MCTS()
+    search(mcts, game_state, red, 2000)
+
+    # The opponent plays the reply the tree expects, the subtree below keeps its playouts
+    child = most_visited(mcts.root)
+    grandchild = most_visited(child)
+    game_state.apply_move_or_wall(*child.action, red)
+    game_state.apply_move_or_wall(*grandchild.action, blue)
+    assert mcts.find_root(game_state) is grandchild
+    visits = grandchild.visits
+    search(mcts, game_state, red, 500)
+    assert mcts.root is grandchild and grandchild.parent is None
+    assert grandchild.visits == visits + 500
+    root_moves = get_root_moves(game_state, red, 'hard')
+    assert all(node.action in root_moves for node in grandchild.children)
+
+    # A position out of the tree starts a new one
+    other_state = get_position('opening')
+    assert mcts.find_root(other_state) is None
+    search(mcts, other_state, other_state.red_player, 100)
+    assert mcts.root is not grandchild and mcts.root.visits == 100
+
+
+def test_winning_move_is_found():
+    # Red is one step from its goal column
+    game_state = GameState.from_position((4, 1), (4, 4), current_turn='red')
+    value, action_type, action_value, _ = search(MCTS(), game_state, game_state.red_player, 300)
+    assert (action_type, action_value) == ('left', (4, 0))
+    assert value == 1
@@ -0,0 +1,47 @@
+from engine.move_ordering import HISTORY_MIN_MOVES, MoveOrdering
+
+# Static order of the moves of a position, pawn moves first
+MOVES = [('left', (4, 3)), ('up', (3, 4)), ('down', (5, 4))] + [('wall', [(row, 2), (row, 4)]) for row in range(1, 8)]
+
+
+def test_table_move_comes_before_the_killers_and_the_history():
+    ordering = MoveOrdering()
+    # The history favours the last wall, the killers of the ply are the last two cutoffs there, latest first
+    ordering.record_cutoff('red', *MOVES[-1], ply=5, depth=4)
+    ordering.record_cutoff('red', *MOVES[4], ply=2, depth=1)
+    ordering.record_cutoff('red', *MOVES[5], ply=2, depth=1)
+    ordering.record_cutoff('red', *MOVES[6], ply=2, depth=1)
+
+    ordered = ordering.order(MOVES, 2, 'red', tt_move=MOVES[2])
+    # The table move, the killers, then the history: the killer pushed out first, the others in static order
+    known = [MOVES[2], MOVES[6], MOVES[5], MOVES[-1], MOVES[4]]
+    assert ordered == known + [move for move in MOVES if move not in known]
+
+    # Another ply has no killers and the other color no history
+    assert ordering.order(MOVES, 3, 'red')[0] == MOVES[-1]
+    assert ordering.order(MOVES, 3, 'blue') == MOVES
+
+
+def test_table_move_missing_from_the_moves_is_ignored():
+    ordering = MoveOrdering()
+    ordering.record_cutoff('red', *MOVES[3], ply=1, depth=2)
+    assert ordering.order(MOVES[:3], 1, 'red', tt_move=MOVES[3]) == MOVES[:3]
+
+
+def test_few_moves_keep_their_static_order_without_killers():
+    ordering = MoveOrdering()
+    ordering.record_cutoff('red', *MOVES[2], ply=1, depth=3)
+    few_moves = MOVES[:HISTORY_MIN_MOVES - 1]
+    assert ordering.order(few_moves, 2, 'red') == few_moves
+    assert ordering.order(MOVES, 2, 'red')[0] == MOVES[2]
+
+
+def test_new_search_forgets_the_killers_and_ages_the_history():
+    ordering = MoveOrdering()
+    ordering.record_cutoff('red', *MOVES[4], ply=1, depth=3)
+    ordering.record_cutoff('red', *MOVES[5], ply=1, depth=1)
+    ordering.new_search()
+    assert ordering.killers == {}
+    # Halved, the single shallow cutoff is forgotten
+    assert list(ordering.history.values()) == [4]
+    assert ordering.order(MOVES, 1, 'red')[0] == MOVES[4]
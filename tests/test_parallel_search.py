@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from engine.bot_helper import iterative_deepening
+from engine.parallel_search import ParallelRootSearch, SearchPool
+from engine.positions import get_position
+from engine.search import get_root_moves, get_search_pool
+from engine.search_limits import SearchLimits
+
+
+@pytest.fixture(scope='module')
+def pool():
+    """One SearchPool of two workers for the whole module, its workers being slow to spawn."""
+    pool = SearchPool(2)
+    yield pool
+    pool.shutdown()
+
+
+def serial_and_root_parallel(pool, name, difficulty, depth):
+    """
+    Return the results of the serial and the root-parallel searches of red in the position to the depth, the
+    workers starting with empty tables like the serial search.
+    """
+    pool.new_game()
+    game_state = get_position(name)
+    player = game_state.red_player
+    root_moves = get_root_moves(game_state, player, difficulty)
+    serial = iterative_deepening(game_state, root_moves, depth, player, difficulty, SearchLimits())
+    parallel = ParallelRootSearch(pool, game_state, player, difficulty).iterative_deepening(root_moves, depth,
+                                                                                              SearchLimits())
+    return serial, parallel
+
+
+@pytest.mark.parametrize('name', ['opening', 'midgame', 'maze'])
+@pytest.mark.parametrize('difficulty', ['medium', 'impossible'])
+def test_root_parallel_search_matches_the_serial_search(pool, name, difficulty):
+    serial, parallel = serial_and_root_parallel(pool, name, difficulty, 3)
+    assert parallel[0] == serial[0]
+    assert parallel[3] == serial[3] == 3
+
+
+def test_stopped_root_parallel_search_leaves_the_pool_usable(pool):
+    game_state = get_position('midgame')
+    player = game_state.red_player
+    root_moves = get_root_moves(game_state, player, 'impossible')
+    limits = SearchLimits()
+    # Stopped from another thread, like the engine protocol's 'stop', long before depth 7 is reached
+    timer = threading.Timer(0.5, limits.stop)
+    timer.start()
+    _, _, _, completed_depth = ParallelRootSearch(pool, game_state, player, 'impossible').iterative_deepening(
+        root_moves, 7, limits)
+    timer.join()
+    assert completed_depth < 7
+    assert limits.elapsed() < 5
+
+    # The stop flag set for the workers is cleared by the next search, the tables of the stopped search are not
+    # (their deeper results would change the values of a shallow search) until the next game
+    serial, parallel = serial_and_root_parallel(pool, 'midgame', 'impossible', 2)
+    assert parallel[0] == serial[0] and parallel[3] == 2
+
+
+def test_search_pool_is_kept_while_its_size_fits():
+    # With 'lazy_smp' the calling thread is one of the search workers
+    pool = get_search_pool(None, 2, 'lazy_smp')
+    assert pool.workers == 1
+    assert get_search_pool(pool, 2, 'lazy_smp') is pool
+    assert get_search_pool(pool, 1, 'lazy_smp') is pool
+    assert get_search_pool(None, 1, 'lazy_smp') is None
+
+    bigger_pool = get_search_pool(pool, 3, 'lazy_smp')
+    try:
+        assert bigger_pool is not pool and bigger_pool.workers == 2
+        # The replaced pool has been shut down
+        with pytest.raises(RuntimeError):
+            pool.executor.submit(int)
+    finally:
+        bigger_pool.shutdown()
+    assert bigger_pool.tables == {}
+
+
+def test_workers_keep_their_tables_until_a_new_game():
+    game_state = get_position('midgame')
+    player = game_state.red_player
+    root_moves = get_root_moves(game_state, player, 'impossible')
+    # A single worker searches the root moves in order, so that its node counts repeat
+    pool = SearchPool(1)
+    try:
+        nodes = []
+        for new_game in (False, False, True):
+            if new_game:
+                pool.new_game()
+            limits = SearchLimits()
+            ParallelRootSearch(pool, game_state, player, 'impossible').iterative_deepening(root_moves, 3, limits)
+            nodes.append(limits.nodes)
+    finally:
+        pool.shutdown()
+    # The second search hits the table of the first one, the search of the new game starts over
+    assert nodes[1] < nodes[0] == nodes[2]
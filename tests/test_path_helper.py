@@ -0,0 +1,65 @@
+import random
+from collections import deque
+
+import pytest
+
+from engine.bot_helper import get_intelligent_moves
+from engine.positions import get_position
+from helpers.board_helper import Board
+from helpers.path_helper import bfs_pathfinder, repair_goal_distances
+
+
+def brute_goal_distances(board, grid_size, goal_col):
+    """Plain BFS from the goal column over the cells, checking every road with Board.is_blocked."""
+    distances = [None] * (grid_size * grid_size)
+    queue = deque()
+    for row in range(grid_size):
+        distances[row * grid_size + goal_col] = 0
+        queue.append((row, goal_col))
+    while queue:
+        row, col = queue.popleft()
+        for next_row, next_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if (0 <= next_row < grid_size and 0 <= next_col < grid_size
+                    and distances[next_row * grid_size + next_col] is None
+                    and not board.is_blocked((row, col), (next_row, next_col))):
+                distances[next_row * grid_size + next_col] = distances[row * grid_size + col] + 1
+                queue.append((next_row, next_col))
+    return distances
+
+
+# Walls are placed without any path check, so cells get cut off from the goal and must end up None
+@pytest.mark.parametrize('grid_size', [5, 9])
+@pytest.mark.parametrize('seed', range(5))
+def test_repaired_goal_distances_match_brute_force(grid_size, seed):
+    rng = random.Random(seed)
+    board = Board(grid_size, [])
+    distances = {goal_col: brute_goal_distances(board, grid_size, goal_col) for goal_col in (0, grid_size - 1)}
+    while True:
+        candidates = [slot for slot, wall in enumerate(board.slots.walls)
+                      if board.free_walls >> slot & 1 and not board.overlaps_roads(wall)]
+        if not candidates:
+            break
+        wall = board.slots.walls[rng.choice(candidates)]
+        board.add_wall(wall)
+        for goal_col, old_distances in distances.items():
+            previous = old_distances.copy()
+            distances[goal_col] = repair_goal_distances(old_distances, grid_size, board, wall)
+            assert old_distances == previous
+            assert distances[goal_col] == brute_goal_distances(board, grid_size, goal_col)
+
+
+@pytest.mark.parametrize('name', ['opening', 'midgame', 'maze'])
+def test_intelligent_pawn_moves_follow_the_shortest_path(name):
+    game_state = get_position(name)
+    for player in (game_state.red_player, game_state.blue_player):
+        grid_size, board = game_state.grid_size, game_state.board
+        path = bfs_pathfinder((player.row, player.col), player.goal_col, grid_size, board)
+        distances = brute_goal_distances(board, grid_size, player.goal_col)
+        # The path is a shortest one, one step closer to the goal at every cell
+        assert [distances[row * grid_size + col] for row, col in path] == list(range(len(path) - 1, -1, -1))
+
+        intelligent_moves, other_moves = get_intelligent_moves(game_state, player, grid_size, board,
+                                                               player.available_walls)
+        for action_type, move in intelligent_moves + other_moves:
+            if action_type != 'wall':
+                assert ((action_type, move) in intelligent_moves) == (move in path)
@@ -0,0 +1,56 @@
+import pytest
+
+from engine import bot_helper
+from engine.bot_helper import evaluate, game_over, iterative_deepening, select_moves
+from engine.positions import get_position
+from engine.reduction_policy import REDUCTION_POLICIES
+from engine.search import get_root_moves
+from engine.search_limits import SearchLimits
+from engine.transposition_table import TranspositionTable
+
+
+def minimax(game_state, depth, root_color, color, difficulty, ply):
+    """Plain negamax over the moves negamax selects, with the full window at every node and no table."""
+    sign = 1 if color == root_color else -1
+    if depth == 0 or game_over(game_state):
+        return sign * evaluate(game_state, root_color, depth)
+    player = game_state.get_player_by_color(color)
+    opponent_color = game_state.get_opponent_color(color)
+    moves, _ = select_moves(game_state, player, game_state.get_player_by_color(opponent_color), ply,
+                            REDUCTION_POLICIES[difficulty])
+    if not moves:
+        return sign * float('-inf')
+    best_value = float('-inf')
+    for action_type, action_value in moves:
+        undo = game_state.apply_move_or_wall(action_type, action_value, player)
+        best_value = max(best_value, -minimax(game_state, depth - 1, root_color, opponent_color, difficulty,
+                                              ply + 1))
+        game_state.undo_move_or_wall(undo)
+    return best_value
+
+
+def root_minimax(game_state, root_moves, depth, player, difficulty):
+    search_state = game_state.copy_for_search()
+    opponent_color = search_state.get_opponent_color(player.color)
+    best_value = float('-inf')
+    for action_type, action_value in root_moves:
+        undo = search_state.apply_move_or_wall(action_type, action_value, player)
+        best_value = max(best_value, -minimax(search_state, depth - 1, player.color, opponent_color, difficulty, 1))
+        search_state.undo_move_or_wall(undo)
+    return best_value
+
+
+@pytest.mark.parametrize('name', ['opening', 'midgame', 'maze'])
+@pytest.mark.parametrize('difficulty, depth', [('medium', 4), ('hard', 3)])
+def test_principal_variation_search_matches_minimax(monkeypatch, name, difficulty, depth):
+    game_state = get_position(name)
+    for player in (game_state.red_player, game_state.blue_player):
+        root_moves = get_root_moves(game_state, player, difficulty)
+        expected = root_minimax(game_state, root_moves, depth, player, difficulty)
+        # A narrow aspiration window makes the iterations fail high or low and search again
+        for window, tt in ((bot_helper.ASPIRATION_WINDOW, None), (bot_helper.ASPIRATION_WINDOW, TranspositionTable()),
+                           (0.01, TranspositionTable())):
+            monkeypatch.setattr(bot_helper, 'ASPIRATION_WINDOW', window)
+            value, _, _, completed_depth = iterative_deepening(game_state, root_moves, depth, player, difficulty,
+                                                               SearchLimits(), tt=tt)
+            assert (value, completed_depth) == (expected, depth)
@@ -0,0 +1,85 @@
+import io
+
+import pytest
+
+from engine.game_state import GameState
+from engine.match import play_move
+from engine.positions import get_position
+from engine.protocol import EngineProtocol, format_move, parse_move
+
+
+def run(*lines):
+    """Run the protocol on the command lines and return the protocol and its response lines."""
+    output = io.StringIO()
+    protocol = EngineProtocol(output)
+    protocol.run(lines)
+    return protocol, output.getvalue().splitlines()
+
+
+def parse_moves(game_state, turn, texts):
+    """Play the moves written as texts from the position, raising ValueError on an illegal one."""
+    for text in texts:
+        player = game_state.get_player_by_color(turn)
+        play_move(game_state, *parse_move(game_state, player, text), player)
+        turn = game_state.get_opponent_color(turn)
+
+
+@pytest.mark.parametrize('name', ['opening', 'midgame', 'maze'])
+def test_every_legal_move_survives_its_text(name):
+    game_state = get_position(name)
+    for player in (game_state.red_player, game_state.blue_player):
+        for move in game_state.get_legal_moves(player):
+            assert parse_move(game_state, player, format_move(*move)) == move
+
+
+def test_position_is_described_back():
+    description = ("red 3,5 blue 5,3 walls 3,4-5,4 5,2-5,4 2,6-4,6 6,5-6,7 redwalls 7 bluewalls 8 turn red")
+    _, lines = run(f"position {description}", "d")
+    assert lines == [f"info string {description}"]
+
+    protocol, lines = run("position startpos moves 4,1 4,7 3,4-5,4", "d")
+    assert lines == ["info string red 4,7 blue 4,1 walls 3,4-5,4 redwalls 10 bluewalls 9 turn red"]
+    assert protocol.last_positions == {'blue': (4, 1), 'red': (4, 8)}
+
+
+def test_go_nodes_sends_a_legal_bestmove_and_its_line():
+    protocol, lines = run("position startpos moves 4,1", "go nodes 2000")
+    infos, bestmove = lines[:-1], lines[-1]
+    assert infos and all(line.startswith("info depth ") for line in infos)
+    assert bestmove.startswith("bestmove ")
+
+    game_state = GameState.new_game()
+    parse_moves(game_state, 'blue', ["4,1"])
+    # The principal variation is a line of legal moves starting with the best move
+    pv = infos[-1].split(" pv ")[1].split()
+    assert len(pv) > 1
+    parse_moves(game_state.copy_for_search(), 'red', pv)
+    assert protocol.limits.nodes <= 2000 + 1
+
+
+def test_stop_ends_an_infinite_search_with_one_bestmove():
+    _, lines = run("setoption name difficulty value easy", "go infinite", "stop", "isready")
+    assert [line for line in lines if line.startswith("bestmove")] == lines[-2:-1]
+    assert lines[-1] == "readyok"
+
+
+@pytest.mark.parametrize('command', ["position startpos moves 4,1 9,9", "position startpos moves 4,1 4,1",
+                                     "go depth", "go fast", "go nodes many", "setoption name bogus value 1",
+                                     "setoption name difficulty value superhuman", "position red 1,1",
+                                     "position red 1,1 blue 2,2 turn", "position red 1,1 blue 2,2 turn green",
+                                     "position red 1,1 blue 2,2 color red"])
+def test_bad_input_reports_an_error_and_keeps_the_position(command):
+    protocol, lines = run("position startpos moves 4,1", command, "d")
+    assert lines[0].startswith("info string error ")
+    assert lines[1] == "info string red 4,8 blue 4,1 walls - redwalls 10 bluewalls 10 turn red"
+    assert protocol.search_thread is None
+
+
+def test_changing_the_difficulty_clears_the_search_memory():
+    protocol, _ = run("go depth 2")
+    protocol.handle("setoption name difficulty value hard")
+    assert any(entry is not None for entry in protocol.memory.tt.entries)
+
+    protocol.handle("setoption name difficulty value impossible")
+    assert all(entry is None for entry in protocol.memory.tt.entries)
+    assert protocol.memory.pv == []
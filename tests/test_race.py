@@ -0,0 +1,140 @@
+import random
+
+import pytest
+
+from engine.bot_helper import game_over
+from engine.game_state import GameState
+from engine.race import DRAW, LOSS, WIN, is_race, resolve_race, solve_race, state_index
+from engine.search import search_move
+from engine.search_limits import SearchLimits
+from helpers.path_helper import goal_distances
+
+# Plies searched by the brute-force minimax
+BRUTE_FORCE_PLIES = 6
+
+
+def brute_force(game_state, color, plies):
+    """
+    Plain minimax over the legal moves for color to move: 1 for a win within plies, -1 for a loss within
+    plies, 0 if neither can be forced that fast.
+    """
+    if game_over(game_state):
+        return -1
+    if not plies:
+        return 0
+    player = game_state.get_player_by_color(color)
+    best = -1
+    for action_type, action_value in game_state.get_legal_moves(player):
+        undo = game_state.apply_move_or_wall(action_type, action_value, player)
+        best = max(best, -brute_force(game_state, game_state.get_opponent_color(color), plies - 1))
+        game_state.undo_move_or_wall(undo)
+        if best == 1:
+            break
+    return best
+
+
+def random_race(rng, grid_size):
+    """
+    Return (game_state, color to move) of a race not over yet, played with random legal moves, walls first,
+    from random pawn cells.
+    """
+    while True:
+        cells = rng.sample([(row, col) for row in range(grid_size) for col in range(1, grid_size - 1)], 2)
+        color = rng.choice(('red', 'blue'))
+        game_state = GameState.from_position(cells[0], cells[1], red_walls=rng.randrange(3),
+                                             blue_walls=rng.randrange(3), current_turn=color, grid_size=grid_size)
+        while not game_over(game_state) and (not is_race(game_state) or rng.random() < 0.5):
+            player = game_state.get_player_by_color(color)
+            moves = game_state.get_legal_moves(player)
+            walls = [move for move in moves if move[0] == 'wall']
+            game_state.apply_move_or_wall(*rng.choice(walls or moves), player)
+            color = game_state.get_opponent_color(color)
+        if not game_over(game_state):
+            return game_state, color
+
+
+def race_result(game_state, color):
+    """Return (result, plies) of the position in the tables of solve_race."""
+    grid_size = game_state.grid_size
+    red, blue = game_state.red_player, game_state.blue_player
+    results, plies, _ = solve_race(grid_size, game_state.board, red.goal_col, blue.goal_col)
+    index = state_index(grid_size, red.row * grid_size + red.col, blue.row * grid_size + blue.col, color)
+    return results[index], plies[index]
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_solved_race_matches_brute_force(seed):
+    game_state, color = random_race(random.Random(seed), 5)
+    result, plies = race_result(game_state, color)
+    if result == DRAW or plies > BRUTE_FORCE_PLIES:
+        assert brute_force(game_state, color, BRUTE_FORCE_PLIES) == 0
+    else:
+        # A win is found no sooner than plies, a loss is put off until then
+        assert brute_force(game_state, color, plies) == (1 if result == WIN else -1)
+        assert brute_force(game_state, color, plies - 1) == 0
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_resolved_race_move_keeps_the_result(seed):
+    game_state, color = random_race(random.Random(seed), 5)
+    player = game_state.get_player_by_color(color)
+    race = resolve_race(game_state, player)
+    if game_state.get_legal_moves(player) == [('skip', ())]:
+        assert race is None
+        return
+    value, action_type, action_value, plies = race
+    assert (action_type, action_value) in game_state.get_legal_moves(player)
+
+    game_state.apply_move_or_wall(action_type, action_value, player)
+    opponent_color = game_state.get_opponent_color(color)
+    result, next_plies = race_result(game_state, opponent_color)
+    if value == float('inf'):
+        assert (result, next_plies) == (LOSS, plies - 1)
+    elif value == float('-inf'):
+        assert (result, next_plies) == (WIN, plies - 1)
+    else:
+        assert result == DRAW
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_drawn_race_move_is_closest_to_the_goal(seed):
+    game_state, color = random_race(random.Random(seed), 5)
+    player = game_state.get_player_by_color(color)
+    race = resolve_race(game_state, player)
+    if race is None or race[0] != 0:
+        return
+    grid_size = game_state.grid_size
+    distances = goal_distances(player.goal_col, grid_size, game_state.board)
+    opponent_color = game_state.get_opponent_color(color)
+    # Goal distance after every move keeping the draw
+    drawing_distances = []
+    for action_type, action_value in game_state.get_legal_moves(player):
+        undo = game_state.apply_move_or_wall(action_type, action_value, player)
+        if race_result(game_state, opponent_color)[0] != WIN:
+            drawing_distances.append(distances[player.row * grid_size + player.col])
+        game_state.undo_move_or_wall(undo)
+    _, _, (row, col), _ = race
+    assert distances[row * grid_size + col] == min(drawing_distances)
+
+
+def test_finished_race_is_left_to_the_search():
+    # Red has reached its goal column with no walls left
+    game_state = GameState.from_position((4, 0), (2, 2), red_walls=0, blue_walls=0, current_turn='blue',
+                                         grid_size=5)
+    blue = game_state.blue_player
+    assert resolve_race(game_state, blue) is None
+    _, action_type, action_value, _ = search_move(game_state, blue, 'hard', 3, SearchLimits())
+    assert (action_type, action_value) in game_state.get_legal_moves(blue)
+
+
+def test_skipping_race_is_left_to_the_search():
+    # Blue is walled in on three sides, and red next to it cannot be jumped over: blue can only skip its turn,
+    # while its path to the goal goes through red's cell
+    walls = [[(2, 1), (2, 3)], [(3, 2), (3, 4)], [(2, 2), (4, 2)], [(2, 4), (4, 4)]]
+    game_state = GameState.from_position((2, 3), (2, 2), walls=walls, red_walls=0, blue_walls=0,
+                                         current_turn='blue', grid_size=5)
+    red, blue = game_state.red_player, game_state.blue_player
+    for player in (red, blue):
+        assert goal_distances(player.goal_col, 5, game_state.board)[player.row * 5 + player.col] is not None
+    assert game_state.get_legal_moves(blue) == [('skip', ())]
+    assert resolve_race(game_state, blue) is None
@@ -0,0 +1,81 @@
+import pytest
+
+from engine import bot_helper
+from engine.game_state import GameState
+from engine.positions import get_position
+from engine.reduction_policy import REDUCTION_POLICIES, ReductionPolicy
+from engine.search_limits import SearchLimits
+from helpers.path_helper import bfs_pathfinder
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    """Install a ReductionPolicy for the 'impossible' difficulty for one test."""
+    def install(**settings):
+        monkeypatch.setitem(REDUCTION_POLICIES, 'impossible', ReductionPolicy(**settings))
+    return install
+
+
+def test_reduced_move_beating_alpha_is_searched_again(policy, monkeypatch):
+    policy(wall_plies={1: (None, None)}, lmr_min_depth=2, lmr_late_moves=1, lmr_reduction=1)
+    # Blue is one step from its goal, so the walls searched after the first pawn move beat it
+    game_state = GameState.from_position((4, 4), (4, 7), current_turn='red')
+
+    # (hash, depth, alpha, beta, value) of every search of a move of the node searched
+    calls = []
+    negamax = bot_helper.negamax
+
+    def recording_negamax(game_state, depth, alpha, beta, *args):
+        value = negamax(game_state, depth, alpha, beta, *args)
+        if args[4] == 2:
+            calls.append((game_state.hash, depth, alpha, beta, value))
+        return value
+
+    monkeypatch.setattr(bot_helper, 'negamax', recording_negamax)
+    negamax(game_state.copy_for_search(), 3, float('-inf'), float('inf'), 'red', 'red', SearchLimits(), 'impossible')
+
+    searched_again = 0
+    for index, (hash, depth, alpha, beta, value) in enumerate(calls):
+        if depth != 1:
+            continue
+        next_call = calls[index + 1] if index + 1 < len(calls) else None
+        if value < beta:
+            # The move beats the node's alpha, the opposite of the null window searched
+            assert next_call is not None and next_call[:2] == (hash, 2)
+            searched_again += 1
+        else:
+            assert next_call is None or next_call[0] != hash
+    assert searched_again
+
+
+def test_futility_only_prunes_walls_off_the_opponent_path(policy):
+    policy(wall_plies={1: (None, None)}, futility_depth=1, futility_margin=0)
+    game_state = get_position('midgame').copy_for_search()
+    red, blue = game_state.red_player, game_state.blue_player
+    grid_size, slots = game_state.grid_size, game_state.board.slots
+    path = [row * grid_size + col for row, col in bfs_pathfinder((blue.row, blue.col), blue.goal_col, grid_size,
+                                                                  game_state.board)]
+    path_roads = {(min(cell, next_cell), max(cell, next_cell)) for cell, next_cell in zip(path, path[1:])}
+    blocking_walls = {tuple(wall) for wall in game_state.valid_walls
+                      if any((cell, neighbour) in path_roads
+                             for cell, _, neighbour, _ in slots.roads[slots.slot_of(wall)])}
+    assert blocking_walls and len(blocking_walls) < len(game_state.valid_walls)
+
+    # Searched at depth 1, the moves of the node are the only moves played
+    searched = []
+    apply_move_or_wall = game_state.apply_move_or_wall
+
+    def recording_apply(action_type, action_value, player):
+        searched.append((action_type, tuple(action_value)))
+        return apply_move_or_wall(action_type, action_value, player)
+
+    game_state.apply_move_or_wall = recording_apply
+    # Far above the value of the position: every quiet wall is futile
+    alpha = 100
+    value = bot_helper.negamax(game_state, 1, alpha, float('inf'), 'red', 'red', SearchLimits(), 'impossible')
+    assert value <= alpha
+
+    searched_walls = {move for action_type, move in searched if action_type == 'wall'}
+    assert searched_walls == blocking_walls
+    pawn_moves = game_state.get_valid_moves(red)
+    assert {move for action_type, move in searched if action_type != 'wall'} == set(pawn_moves.values())
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from engine.positions import get_position
+from engine.search import SearchMemory, get_root_moves, search_move
+from engine.search_limits import SearchLimits
+
+
+def test_stop_aborts_a_deep_search_at_once():
+    game_state = get_position('midgame')
+    player = game_state.red_player
+    limits = SearchLimits()
+    results = []
+    thread = threading.Thread(target=lambda: results.append(
+        search_move(game_state, player, 'impossible', 7, limits, memory=SearchMemory())))
+    thread.start()
+    time.sleep(0.3)
+
+    # The search checks the limits at every node, not only between root moves
+    stop_time = time.time()
+    limits.stop()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert time.time() - stop_time < 0.1
+    _, action_type, action_value, completed_depth = results[0]
+    assert completed_depth < 7
+    assert (action_type, action_value) in game_state.get_legal_moves(player)
+
+
+def play_line(game_state, color, moves):
+    """Play the moves from color on, alternating the players."""
+    for action_type, action_value in moves:
+        game_state.apply_move_or_wall(action_type, action_value, game_state.get_player_by_color(color))
+        color = game_state.get_opponent_color(color)
+
+
+def test_search_resumes_when_the_predicted_reply_is_played():
+    game_state = get_position('midgame').copy_for_search()
+    memory = SearchMemory()
+    search_move(game_state, game_state.red_player, 'hard', 4, SearchLimits(), memory=memory)
+    assert memory.completed_depth == 4 and len(memory.pv) >= 3
+    predicted_line = memory.pv
+
+    # Any other reply than the predicted one starts the search over from depth 1
+    other_state = game_state.copy_for_search()
+    play_line(other_state, 'red', predicted_line[:1])
+    blue_moves = other_state.get_legal_moves(other_state.blue_player)
+    other_reply = next(move for move in blue_moves if move != predicted_line[1])
+    play_line(other_state, 'blue', [other_reply])
+    assert memory.resume(other_state, get_root_moves(other_state, other_state.red_player, 'hard')) is None
+
+    play_line(game_state, 'red', predicted_line[:2])
+    depths = []
+    _, action_type, action_value, completed_depth = search_move(
+        game_state, game_state.red_player, 'hard', 5, SearchLimits(), memory=memory,
+        on_iteration=lambda *iteration: depths.append(iteration[3]))
+    # The last search had searched the position 2 plies shallower already
+    assert depths == [2, 3, 4, 5]
+    assert completed_depth == 5
+    assert (action_type, action_value) in game_state.get_legal_moves(game_state.red_player)
@@ -0,0 +1,90 @@
+import pytest
+
+from engine.transposition_table import (ENTRY_WORDS, EXACT, LOWER_BOUND, MOVE_TYPES, UPPER_BOUND,
+                                        SharedTranspositionTable, TranspositionTable)
+
+
+@pytest.fixture
+def shared_table():
+    table = SharedTranspositionTable(9, size=64)
+    yield table
+    table.close()
+
+
+def bucket_keys(table, count):
+    """Return count keys falling in the first bucket of the table."""
+    return [(index * (table.mask + 2)) | 1 << 40 for index in range(1, count + 1)]
+
+
+@pytest.mark.parametrize('grid_size', [5, 9])
+def test_every_move_survives_encoding(grid_size):
+    table = SharedTranspositionTable(grid_size, size=4)
+    try:
+        moves = [(type, (row, col)) for type in MOVE_TYPES if type != 'wall'
+                 for row in range(grid_size) for col in range(grid_size)]
+        moves += [('wall', wall) for wall in table.slots.walls]
+        for move in moves:
+            assert table.decode_move(table.encode_move(move)) == move
+        assert table.decode_move(table.encode_move(None)) is None
+    finally:
+        table.close()
+
+
+def test_stored_entry_is_probed_back(shared_table):
+    key = 0x123456789ABCDEF
+    shared_table.store(key, 5, LOWER_BOUND, -12.5, ('wall', shared_table.slots.walls[17]))
+    assert shared_table.probe(key) == (key, 5, LOWER_BOUND, -12.5, ('wall', shared_table.slots.walls[17]), 0)
+    assert shared_table.probe(key ^ 1 << 50) is None
+
+
+@pytest.mark.parametrize('word', range(ENTRY_WORDS))
+def test_torn_entry_is_missing(shared_table, word):
+    key = 0xFEDCBA987654321
+    shared_table.store(key, 3, EXACT, 4.0, ('up', (2, 3)))
+    base = (key & shared_table.mask) * ENTRY_WORDS
+    # Half of a concurrent write of another entry
+    shared_table.words[base + word] ^= 1 << 12
+    assert shared_table.probe(key) is None
+
+
+def test_table_is_shared_through_pickling(shared_table):
+    import pickle
+    other = pickle.loads(pickle.dumps(shared_table))
+    try:
+        other.store(42, 2, UPPER_BOUND, 1.0, ('skip', (0, 0)))
+        assert shared_table.probe(42)[1:5] == (2, UPPER_BOUND, 1.0, ('skip', (0, 0)))
+    finally:
+        other.close()
+
+
+@pytest.mark.parametrize('make_table', [lambda: TranspositionTable(64), lambda: SharedTranspositionTable(9, 64)])
+def test_entries_of_older_searches_are_replaced_first(make_table):
+    table = make_table()
+    try:
+        old_key, deep_key, new_key, last_key = bucket_keys(table, 4)
+        table.store(old_key, 1, EXACT, 0.0, None)
+        table.new_search()
+        table.store(deep_key, 9, EXACT, 0.0, None)
+        # The bucket is full: the shallow entry of the older search goes, not the deep entry of this one
+        table.store(new_key, 2, EXACT, 0.0, None)
+        assert table.probe(old_key) is None
+        assert table.probe(deep_key) is not None and table.probe(new_key) is not None
+
+        # Once a newer search has filled half of the bucket, the deep entry of the past search gives way
+        table.new_search()
+        table.store(old_key, 1, EXACT, 0.0, None)
+        table.store(last_key, 1, EXACT, 0.0, None)
+        assert table.probe(deep_key) is None
+        assert table.probe(old_key) is not None and table.probe(last_key) is not None
+    finally:
+        if isinstance(table, SharedTranspositionTable):
+            table.close()
+
+
+def test_shallower_entry_is_replaced_within_a_search(shared_table):
+    shallow_key, deep_key, new_key = bucket_keys(shared_table, 3)
+    shared_table.store(shallow_key, 2, EXACT, 0.0, None)
+    shared_table.store(deep_key, 6, EXACT, 0.0, None)
+    shared_table.store(new_key, 4, EXACT, 0.0, None)
+    assert shared_table.probe(shallow_key) is None
+    assert shared_table.probe(deep_key) is not None
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from helpers.board_helper import Board, get_wall_slots
+from helpers.wall_helpers import is_valid_wall
+
+
+def every_wall(grid_size):
+    """Every wall inside the grid off its border, as [(row, col), (row, col)] from the top or left end."""
+    walls = [[(row, col), (row, col + 2)] for row in range(1, grid_size) for col in range(grid_size - 1)]
+    walls += [[(row, col), (row + 2, col)] for row in range(grid_size - 1) for col in range(1, grid_size)]
+    return walls
+
+
+def middle(wall):
+    (row1, col1), (row2, col2) = wall
+    return (row1 + row2) // 2, (col1 + col2) // 2
+
+
+def walls_conflict(wall1, wall2):
+    """Check if two walls cross at their middle or overlap along the same line."""
+    horizontal1, horizontal2 = wall1[0][0] == wall1[1][0], wall2[0][0] == wall2[1][0]
+    (row1, col1), (row2, col2) = middle(wall1), middle(wall2)
+    if horizontal1 != horizontal2:
+        return (row1, col1) == (row2, col2)
+    if horizontal1:
+        return row1 == row2 and abs(col1 - col2) < 2
+    return col1 == col2 and abs(row1 - row2) < 2
+
+
+def wall_roads(wall):
+    """The two roads a wall blocks, as pairs of (row, col) cells."""
+    (row, col), _ = wall
+    if wall[0][0] == wall[1][0]:
+        return [((row - 1, col), (row, col)), ((row - 1, col + 1), (row, col + 1))]
+    return [((row, col - 1), (row, col)), ((row + 1, col - 1), (row + 1, col))]
+
+
+def every_road(grid_size):
+    return [((row, col), (row + drow, col + dcol)) for row in range(grid_size) for col in range(grid_size)
+            for drow, dcol in ((0, 1), (1, 0)) if row + drow < grid_size and col + dcol < grid_size]
+
+
+@pytest.mark.parametrize('grid_size', [5, 9])
+def test_slots_are_every_wall(grid_size):
+    slots = get_wall_slots(grid_size)
+    assert sorted(slots.walls) == sorted(every_wall(grid_size))
+    for slot, wall in enumerate(slots.walls):
+        assert slots.slot_of(wall) == slots.slot_of(wall[::-1]) == slot
+    assert slots.slot_of([(0, 0), (0, 2)]) is None
+
+
+@pytest.mark.parametrize('grid_size', [5, 9])
+def test_conflict_masks_match_wall_geometry(grid_size):
+    slots = get_wall_slots(grid_size)
+    for slot, wall in enumerate(slots.walls):
+        board = Board(grid_size, [wall])
+        for other_slot, other_wall in enumerate(slots.walls):
+            conflict = walls_conflict(wall, other_wall)
+            assert bool(slots.conflicts[slot] >> other_slot & 1) == conflict
+            assert is_valid_wall(*other_wall, board, []) == (not conflict)
+
+
+@pytest.mark.parametrize('grid_size', [5, 9])
+def test_walls_block_their_two_roads(grid_size):
+    board = Board(grid_size)
+    roads = every_road(grid_size)
+    for wall in get_wall_slots(grid_size).walls:
+        board.add_wall(wall)
+        blocked = wall_roads(wall)
+        for cell, neighbour in roads:
+            road_blocked = (cell, neighbour) in blocked
+            assert board.is_blocked(cell, neighbour) == board.is_blocked(neighbour, cell) == road_blocked
+        board.remove_wall(wall)
+        assert board.blocked == [0] * (grid_size * grid_size)
+        assert board.free_walls == board.slots.all_slots
+
+
+def wall_points(wall):
+    return {wall[0], middle(wall), wall[1]}
+
+
+def brute_slots_touching_group(board, wall):
+    """Slots sharing a corner with the walls connected to wall, all the walls on the border being connected."""
+    grid_size = board.grid_size
+    border = {(row, col) for row in range(grid_size + 1) for col in range(grid_size + 1)
+              if row in (0, grid_size) or col in (0, grid_size)}
+    remaining = [placed for placed in board.slots.walls if board.has_wall(placed)]
+    points = wall_points(wall)
+    grown = True
+    while grown:
+        grown = False
+        if points & border and not border <= points:
+            points |= border
+            grown = True
+        for placed in list(remaining):
+            if wall_points(placed) & points:
+                points |= wall_points(placed)
+                remaining.remove(placed)
+                grown = True
+    return {slot for slot, other in enumerate(board.slots.walls) if wall_points(other) & points}
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_slots_touching_group_match_brute_force(seed):
+    rng = random.Random(seed)
+    board = Board(9)
+    for _ in range(rng.randrange(2, 20)):
+        free_slots = [slot for slot in range(len(board.slots.walls)) if board.free_walls >> slot & 1]
+        wall = board.slots.walls[rng.choice(free_slots)]
+        board.add_wall(wall)
+        touching = board.slots_touching_group(wall)
+        assert {slot for slot in range(len(board.slots.walls)) if touching >> slot & 1} == \
+            brute_slots_touching_group(board, wall)
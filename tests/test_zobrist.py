@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from engine.game_state import GameState
+from helpers.zobrist_helper import compute_hash
+
+
+def full_hash(game_state, color):
+    """Hash of the position computed from scratch, color to move."""
+    return compute_hash(game_state.red_player, game_state.blue_player, game_state.placed_walls, color)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_incremental_hash_matches_hash_from_scratch(seed):
+    rng = random.Random(seed)
+    game_state = GameState.new_game(available_walls=5).copy_for_search()
+    color = 'blue'
+    assert game_state.hash == full_hash(game_state, color)
+
+    undos = []
+    for _ in range(30):
+        player = game_state.get_player_by_color(color)
+        action_type, action_value = rng.choice(game_state.get_legal_moves(player))
+        undos.append((game_state.apply_move_or_wall(action_type, action_value, player), color, game_state.hash))
+        color = game_state.get_opponent_color(color)
+        assert game_state.hash == full_hash(game_state, color)
+        if player.col == player.goal_col:
+            # The game is over
+            break
+
+    # Taking the moves back restores every hash on the way
+    while undos:
+        undo, color, hash_after = undos.pop()
+        assert game_state.hash == hash_after
+        game_state.undo_move_or_wall(undo)
+        assert game_state.hash == full_hash(game_state, color)
+
+
+def test_side_to_move_changes_the_hash():
+    game_state = GameState.new_game()
+    assert full_hash(game_state, 'red') != full_hash(game_state, 'blue')